@@ -1,55 +1,83 @@
 # Phuoc's Financial Dashboard
 # Created: July 22, 2022
-# Last Updated: July 25, 2022
-# Version: 1.0
+# Last Updated: October 18, 2026
+# Version: 1.10
 # Changes:
 # v1.0 - added multi-page support
+# v1.1 - read the workbook through the shared dashboard.data cache
+# v1.2 - load only the named ranges this page uses
+# v1.3 - shared currency/percent formatting with signed deltas
+# v1.4 - net worth chart comes from the cross-session figure cache
+# v1.5 - watch the workbook and pre-warm the caches in the background; sidebar shows data freshness
+# v1.6 - stage timings and chart payloads via dashboard.instrument (?debug=1 panel)
+# v1.7 - net worth chart covers the whole net-worth sheet, downsampled to the selected range
+# v1.8 - reads the workbook of the household profile picked in the sidebar
+# v1.9 - style.css and hide-style block built once per process; retirement date converted without xlrd
+# v1.10 - a net-worth sheet with a single month shows that month instead of a range slider
+
+import time
 
 import pandas as pd
-import plotly.express as px
 import streamlit as st
-import xlrd
+
+from dashboard.charts import series_chart
+from dashboard.data import cache_stats, data_version
+from dashboard.downsample import load_series
+from dashboard.figures import cached_figure
+from dashboard.formatting import currency, delta, percent
+from dashboard.instrument import finish_trace, plotly_chart, stage, start_trace
+from dashboard.profiles import current_profile
+from dashboard.schema import excel_date, load_ranges
+from dashboard.style import apply_style
+from dashboard.watcher import start_watcher, watcher_status
 
 # emojis: https://www.webfx.com/tools/emoji-cheat-sheet/
 st.set_page_config(page_title="Phuoc's Financial Dashboard",
 	page_icon=":bar_chart:",
 	layout="wide")
 
-with open('style.css') as f:
-    st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-
-data_df = pd.read_excel(io="Phuoc-Financial-Data.xlsx", sheet_name="data", skiprows=0)
-networth = "${:,.2f}".format(data_df.iloc[1,1])
-networth_change = data_df.iloc[2,1]*(-1)
-retirement_score = "{}%".format(data_df.iloc[15,1])
-retirement_date_serial = data_df.iloc[18,1]
-net_worth_chart_df = data_df.iloc[range(19, 43, 1),:]
-net_worth_chart_df.rename(columns = {list(net_worth_chart_df)[0]: 'Month'}, inplace = True)
-net_worth_chart_df.rename(columns = {list(net_worth_chart_df)[1]: 'Net Worth'}, inplace = True)
-
-# NET WORTH CHART
-fig_net_worth = px.area(
-    net_worth_chart_df["Net Worth"],
-    x=net_worth_chart_df.Month,
-    y="Net Worth",
-    title="",
-    color_discrete_sequence=["#0083B8"] * len(net_worth_chart_df),
-    template="plotly_white",
-)
-fig_net_worth.update_layout(
-    xaxis=dict(tickmode="linear"),
-    xaxis_title="Month",
-    plot_bgcolor="rgba(0,0,0,0)",
-    yaxis=(dict(showgrid=False)),
-)
-
-# Calling the xldate_as_datetime() function to
-# convert the specified excel serial date into
+apply_style()
+
+start_trace("Financial Dashboard")
+
+profile = current_profile()
+start_watcher(profile.path)
+with stage("load"):
+    data = load_ranges([
+        "current_month", "net_worth", "net_worth_change", "assets", "liabilities",
+        "retirement_score", "retirement_date",
+    ], profile.path)
+    net_worth_series = load_series("net-worth", "Date", "Net Worth", profile.path)
+with stage("transform"):
+    networth = currency(data["net_worth"])
+    networth_change = data["net_worth_change"]
+    retirement_score = percent(data["retirement_score"])
+    retirement_date_serial = data["retirement_date"]
+
+    # The sheet also projects future months; history ends at the current month
+    current_month = pd.Timestamp(data["current_month"]).to_pydatetime()
+    first_month = pd.Timestamp(net_worth_series.bounds[0]).to_pydatetime()
+    default_start = max(first_month, (pd.Period(current_month, "M") - 23).to_timestamp().to_pydatetime())
+
+# Convert the excel serial date into a
 # datetime.datetime object
-retirement_date = xlrd.xldate_as_datetime(retirement_date_serial, 0)
-retirement_date = retirement_date.strftime("%B %d, %Y")
+with stage("transform"):
+    retirement_date = excel_date(retirement_date_serial)
+    retirement_date = retirement_date.strftime("%B %d, %Y")
 
 # ---- SIDEBAR ----
+status = watcher_status(profile.path)
+if status and status["refreshed_at"]:
+    st.sidebar.caption(
+        f"Data loaded {time.strftime('%b %d %I:%M %p', time.localtime(status['refreshed_at']))} "
+        f"in {status['refresh_seconds']:.1f}s ({status['snapshot_age'] / 60:.0f} min ago)"
+        + (" - refreshing..." if status["pending"] else ""))
+    if status["error"]:
+        st.sidebar.caption(f"Last refresh failed: {status['error']}")
+cache = cache_stats(profile.path)
+if cache["hits"] + cache["misses"]:
+    st.sidebar.caption(f"Cache: {cache['bytes'] / 2**20:,.1f} MB in {cache['entries']} entries, "
+        f"{cache['hits'] / (cache['hits'] + cache['misses']):.0%} hits")
 # ---- SIDEBAR ----
 
 # ---- MAINPAGE ----
@@ -60,7 +88,7 @@ left_column, middle_column, right_column = st.columns(3)
 with left_column:
     st.subheader("Current Net Worth")
     #st.write("Left Subheader")
-    st.metric("", networth, "-${:,.2f}".format(networth_change))
+    st.metric("", networth, delta(networth_change))
 with middle_column:
     st.subheader("Retirement Progress")
     st.metric("", retirement_score)
@@ -70,16 +98,35 @@ with right_column:
 
 st.markdown("""---""")
 
-st.subheader("Net Worth - Past 24 Months")
-st.plotly_chart(fig_net_worth, use_container_width=True)
+# NET WORTH CHART
+if first_month < current_month:
+    net_worth_start, net_worth_end = st.slider("Net Worth Range", min_value=first_month, max_value=current_month,
+        value=(default_start, current_month), format="MMM YYYY", label_visibility="collapsed")
+else:
+    # a single month of history leaves no range to pick
+    net_worth_start = net_worth_end = current_month
+with stage("transform"):
+    net_worth_x, net_worth_y = net_worth_series.window(net_worth_start, net_worth_end)
+fig_net_worth = cached_figure("net_worth",
+    lambda: series_chart(net_worth_x, net_worth_y, "Month"),
+    data_version(profile.path), start=net_worth_start, end=net_worth_end)
+
+months = (net_worth_end.year - net_worth_start.year) * 12 + net_worth_end.month - net_worth_start.month + 1
+if months == 1:
+    st.subheader(f"Net Worth - {net_worth_end:%B %Y}")
+else:
+    st.subheader(f"Net Worth - Past {months} Months" if net_worth_end == current_month
+        else f"Net Worth - {net_worth_start:%B %Y} to {net_worth_end:%B %Y}")
+plotly_chart(st, fig_net_worth, use_container_width=True, key="net_worth")
+# NET WORTH CHART
 
 left_column, right_column = st.columns(2)
 with left_column:
     st.subheader("Assets")
-    st.metric("", "${:,.2f}".format(data_df.iloc[3,1]))
+    st.metric("", currency(data["assets"]))
 with right_column:
     st.subheader("Liabilities")
-    st.metric("", "${:,.2f}".format(-data_df.iloc[4,1]))
+    st.metric("", currency(-data["liabilities"]))
 
 
 #st.dataframe(data_df)
@@ -90,13 +137,4 @@ st.markdown("##")
 st.write("© Copyright 2022 Phuoc Le.  All rights reserved.")
 # ---- MAINPAGE ----
 
-# ---- HIDE STREAMLIT STYLE ----
-hide_st_style = """
-            <style>
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            header {visibility: hidden;}
-            </style>
-            """
-st.markdown(hide_st_style, unsafe_allow_html=True)
-# ---- HIDE STREAMLIT STYLE ----
\ No newline at end of file
+finish_trace()
\ No newline at end of file
@@ -0,0 +1 @@
+# Phuoc's Financial Dashboard - page benchmarks (python -m bench.run)
\ No newline at end of file
@@ -0,0 +1,163 @@
+# Phuoc's Financial Dashboard - Cold Start Benchmark
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.0
+# Changes:
+# v1.0 - import time and first paint of every page in a fresh interpreter
+#
+# Usage: python -m bench.coldstart [--repeat 5] [--workbook FILE] [--output FILE]
+#                                  [--baseline FILE] [--tolerance 0.25]
+#
+# What a restarted container or a new replica pays before its first page is
+# on screen. Every sample is a new process, and each metric is the median of
+# --repeat samples:
+#   imports      the page's own top-level import statements
+#   first_run    first run of the page through AppTest, with those imports done
+#   first_paint  imports + first_run
+#   second_run   the run after it (after a full collection), for comparison
+#   process      interpreter start to the end of the first run, seen from outside
+# A warm-up process writes the sheet snapshots first, so workbook ingest is
+# not counted here (bench.run measures it).
+
+import argparse
+import ast
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from bench.run import PAGES, ROOT, TIMEOUT, _ledger
+
+REPEAT = 5
+METRICS = ("imports", "first_run", "first_paint", "second_run", "process")
+# Regressions smaller than this (seconds) are noise
+MIN_DELTA = 0.03
+
+
+# ---- WORKER PROCESS ----
+def _imports(page):
+    with open(os.path.join(ROOT, page)) as f:
+        tree = ast.parse(f.read())
+    statements = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return compile(ast.Module(body=statements, type_ignores=[]), page, "exec")
+
+
+def worker(page):
+    code = _imports(page)
+    started = time.perf_counter()
+    exec(code, {"__name__": "__coldstart__"})
+    result = {"imports": time.perf_counter() - started}
+
+    from streamlit.testing.v1 import AppTest
+
+    started = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=TIMEOUT).run()
+    result["first_run"] = time.perf_counter() - started
+    if at.exception:
+        result = {"error": at.exception[0].message}
+    else:
+        result["first_paint"] = result["imports"] + result["first_run"]
+        # otherwise the full collection of everything the first run imported
+        # lands in whichever run crosses the threshold
+        gc.collect()
+        started = time.perf_counter()
+        at.run()
+        result["second_run"] = time.perf_counter() - started
+    print(json.dumps(result))
+    return 0
+# ---- WORKER PROCESS ----
+
+
+def _run_worker(page, workbook):
+    env = dict(os.environ, DASHBOARD_WATCH_SECONDS="0",
+        PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    if workbook:
+        env.update(DASHBOARD_WORKBOOK=os.path.abspath(workbook), DASHBOARD_LEDGER=_ledger(workbook))
+    started = time.perf_counter()
+    try:
+        done = subprocess.run([sys.executable, "-m", "bench.coldstart", "--worker", page], cwd=ROOT, env=env,
+            capture_output=True, text=True, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {TIMEOUT}s"}
+    elapsed = time.perf_counter() - started
+    lines = done.stdout.strip().splitlines()
+    if done.returncode != 0 or not lines:
+        return {"error": f"exit {done.returncode}: {(done.stderr.strip().splitlines() or [''])[-1]}"}
+    result = json.loads(lines[-1])
+    if "error" not in result:
+        # the worker's second run happened after the first paint
+        result["process"] = elapsed - result["second_run"]
+    return result
+
+
+def benchmark(repeat, workbook):
+    results = {}
+    for page in PAGES:
+        _run_worker(page, workbook)
+        samples = [_run_worker(page, workbook) for _ in range(repeat)]
+        errors = [sample["error"] for sample in samples if "error" in sample]
+        if errors:
+            results[page] = {"error": errors[0]}
+        else:
+            results[page] = {name: statistics.median(sample[name] for sample in samples) for name in METRICS}
+        print(f"{page} {results[page]}", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing every metric more than tolerance worse than baseline."""
+    regressions = []
+    for page, metrics in results.items():
+        before = baseline.get(page, {})
+        for name in METRICS:
+            if name not in metrics or name not in before:
+                continue
+            old, new = before[name], metrics[name]
+            if new > old * (1 + tolerance) and new - old > MIN_DELTA:
+                regressions.append(f"{page} {name}: {old:.3f} -> {new:.3f}")
+        if "error" in metrics and "error" not in before:
+            regressions.append(f"{page}: {metrics['error']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the cold start of every dashboard page.")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--workbook", default=None, help="defaults to DASHBOARD_WORKBOOK")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker:
+        return worker(args.worker)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": benchmark(args.repeat, args.workbook),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(report["results"], baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
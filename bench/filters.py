@@ -0,0 +1,163 @@
+# Phuoc's Financial Dashboard - Spending Filter Benchmark
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.0
+# Changes:
+# v1.0 - first-page latency of the transaction tables under the Spending sidebar filters
+#
+# Usage: python -m bench.filters [--sizes 1000000 5000000 ...] [--repeat 20] [--output FILE]
+#                                [--baseline FILE] [--tolerance 0.25] [--target-ms 10]
+#
+# What a session waits for after changing a Spending sidebar filter: the
+# first page of its transaction table, read out of a ledger of ROWS
+# synthetic transactions. Each filter is timed as the page runs it, the
+# match count from the spend cube and the page from the ledger's indexes,
+# on a fresh pinned view each time, so no count is remembered between
+# samples. Each metric (milliseconds) is the median of --repeat samples:
+#   first_page  count and page 1, newest first (the table as it opens)
+#   next_page   page 11, newest first
+#   sql_count   the same count run over the ledger instead, for comparison
+# Medians above --target-ms are reported as SLOW; the ledgers are built
+# once per size and kept in --workdir.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from bench.generate import LAYOUT, transactions
+from bench.run import ROOT
+from dashboard.cube import SpendCube
+from dashboard.ledger import Ledger
+
+SIZES = [1_000_000, 5_000_000]
+REPEAT = 20
+TARGET_MS = 10.0
+PAGE_SIZE = 25
+# Fixed, so a kept ledger matches the transactions generated again for its cube
+TODAY = "2026-10-01"
+METRICS = ("first_page", "next_page", "sql_count")
+# Regressions smaller than this (milliseconds) are noise
+MIN_DELTA = 1.0
+
+
+def _ledger(rows, workdir):
+    """The rows-transaction ledger (built if missing) and a spend cube of it."""
+    spend = transactions(rows, today=TODAY)
+    path = os.path.join(workdir, f"filters-{rows}-v{LAYOUT}.ledger.sqlite")
+    if not os.path.exists(path):
+        os.makedirs(workdir, exist_ok=True)
+        started = time.perf_counter()
+        Ledger(path).append(spend, "bench", str(rows))
+        print(f"{rows:,} rows: ledger built in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    ledger = Ledger(path)
+    return ledger, SpendCube.from_transactions(spend, (ledger.revision(), ledger.watermark()))
+
+
+def selections(cube):
+    """The sidebar selections timed: {name: filters}."""
+    by_count = cube.by(["Category"])["Count"].sort_values(ascending=False).index.tolist()
+    year = sorted(cube.values("Year"))[-2]  # the last full year
+    month = 3
+    return {
+        "year": {"Year": [year]},
+        "month": {"Month": [month]},
+        "category": {"Category": by_count[:1]},
+        "categories": {"Category": by_count[:5]},
+        "rare_categories": {"Category": by_count[-3:]},
+        "all_but_one_category": {"Category": by_count[:-1]},
+        "year_month": {"Year": [year], "Month": [month]},
+        "year_month_categories": {"Year": [year], "Month": [month], "Category": by_count[:5]},
+    }
+
+
+def _median_ms(run, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def benchmark(sizes, workdir, repeat):
+    results = {}
+    for rows in sizes:
+        ledger, cube = _ledger(rows, workdir)
+        results[str(rows)] = size = {}
+        for name, filters in selections(cube).items():
+            def page(offset):
+                ledger.pinned().page(offset=offset, size=PAGE_SIZE, matches=cube.count(**filters), **filters)
+            size[name] = {
+                "first_page": _median_ms(lambda: page(0), repeat),
+                "next_page": _median_ms(lambda: page(10 * PAGE_SIZE), repeat),
+                "sql_count": _median_ms(lambda: ledger.pinned().count(**filters), repeat),
+            }
+            print(f"{rows:,} rows: {name} {size[name]}", file=sys.stderr)
+    return results
+
+
+def slow(results, target_ms):
+    """Lines describing every page fetch slower than target_ms."""
+    return [f"{rows} rows {name} {metric}: {metrics[metric]:.1f}ms"
+        for rows, names in results.items() for name, metrics in names.items()
+        for metric in ("first_page", "next_page") if metrics[metric] > target_ms]
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing every metric more than tolerance worse than baseline."""
+    regressions = []
+    for rows, names in results.items():
+        for name, metrics in names.items():
+            before = baseline.get(rows, {}).get(name, {})
+            for metric in METRICS:
+                if metric not in before:
+                    continue
+                old, new = before[metric], metrics[metric]
+                if new > old * (1 + tolerance) and new - old > MIN_DELTA:
+                    regressions.append(f"{rows} rows {name} {metric}: {old:.1f}ms -> {new:.1f}ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Spending filters on large ledgers.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--workdir", default=os.path.join(ROOT, "bench", "workbooks"))
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--target-ms", type=float, default=TARGET_MS)
+    args = parser.parse_args(argv)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": benchmark(args.sizes, args.workdir, args.repeat),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    failures = slow(report["results"], args.target_ms)
+    for line in failures:
+        print(f"SLOW {line}", file=sys.stderr)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(report["results"], baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        failures += regressions
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
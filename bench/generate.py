@@ -0,0 +1,194 @@
+# Phuoc's Financial Dashboard - Synthetic Workbook Generator
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.4
+# Changes:
+# v1.0 - workbooks in the layout of Phuoc-Financial-Data.xlsx at any size
+# v1.1 - a performance sheet of monthly holding valuations and contributions
+# v1.2 - LAYOUT numbers the sheets written, so bench.run regenerates older workbooks
+# v1.3 - sheets carry the <dimension> Excel writes, so reading one sheet no longer scans them all
+# v1.4 - spend_data snapshots past Excel's limit are written as sole copies, which no parse replaces
+#
+# Usage: python -m bench.generate ROWS [--output FILE] [--seed N] [--holdings N]
+#
+# Every sheet except spend_data is copied from the template as values, so
+# the "data" sheet keeps its cell offsets. spend_data gets ROWS transactions
+# resampled from the template's (Account, Description, Category) rows, with
+# dates spread over the eight years up to today and jittered amounts.
+# Excel holds at most 1,048,575 rows per sheet; past that the workbook gets
+# an empty spend_data sheet and the transactions go to its Arrow snapshot,
+# which the dashboard reads instead of the sheet.
+# The performance sheet walks HOLDINGS positions (resampled from the template's
+# investments sheet) back YEARS of months from their current values.
+# openpyxl's write-only mode leaves out each sheet's <dimension> (its used
+# range), which Excel always writes; without it openpyxl sizes a workbook by
+# parsing every sheet, so a read of any small sheet would parse all of
+# spend_data. It is added after saving.
+
+import argparse
+import datetime
+import os
+import sys
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from dashboard import snapshot
+from dashboard.data import WORKBOOK, file_version
+
+EXCEL_MAX_ROWS = 1_048_575
+# Bumped whenever generate() writes different sheets, columns or snapshots
+LAYOUT = 4
+YEARS = 8
+COLUMNS = ["Date", "Month", "Year", "Month-Year", "Account", "Description", "Category", "Tags", "Amount"]
+PERFORMANCE_COLUMNS = ["Date", "Account", "Broker", "Symbol", "Asset Class", "Value", "Flow"]
+
+
+def transactions(rows, template=WORKBOOK, seed=0, today=None):
+    """rows synthetic spend_data transactions, sorted by date."""
+    rng = np.random.default_rng(seed)
+    sample = pd.read_excel(template, sheet_name="spend_data")
+    today = pd.Timestamp(today or datetime.date.today())
+    start = today - pd.DateOffset(years=YEARS)
+
+    picks = rng.integers(0, len(sample), size=rows)
+    days = np.sort(rng.integers(0, (today - start).days + 1, size=rows))
+    dates = start + pd.to_timedelta(days, unit="D")
+    amounts = sample["Amount"].to_numpy()[picks] * rng.lognormal(0.0, 0.3, size=rows)
+    return pd.DataFrame({
+        "Date": dates,
+        "Month": dates.month,
+        "Year": dates.year,
+        "Month-Year": dates.to_period("M").to_timestamp(),
+        "Account": sample["Account"].to_numpy()[picks],
+        "Description": sample["Description"].to_numpy()[picks],
+        "Category": sample["Category"].to_numpy()[picks],
+        "Tags": None,
+        "Amount": np.round(amounts, 2),
+    })
+
+
+def performance_history(holdings=None, template=WORKBOOK, seed=0, today=None):
+    """Monthly Value/Flow rows for holdings positions, ending at the template's values."""
+    rng = np.random.default_rng(seed)
+    sample = pd.read_excel(template, sheet_name="investments")
+    sample = sample[sample["Value"].fillna(0) > 0].reset_index(drop=True)
+    today = pd.Timestamp(today or datetime.date.today())
+    dates = pd.date_range(end=today.to_period("M").to_timestamp(), periods=YEARS * 12, freq="MS")
+
+    count = holdings or len(sample)
+    picks = np.arange(count) % len(sample)
+    symbols = sample["Symbol"].to_numpy(dtype=str)[picks]
+    if count > len(sample):
+        symbols = np.char.add(symbols, np.char.add("-", (np.arange(count) // len(sample)).astype(str)))
+    current = sample["Value"].to_numpy()[picks] * rng.lognormal(0.0, 0.3, size=count)
+
+    # Walk back from today's value: V[t-1] = (V[t] - F[t]) / (1 + r[t])
+    months = len(dates)
+    returns = rng.normal(0.006, 0.04, size=(count, months))
+    flows = np.where(rng.random((count, months)) < 0.25,
+        np.round(rng.uniform(0.0, 0.01, size=(count, months)) * current[:, None], 2), 0.0)
+    flows[:, 0] = 0.0
+    values = np.empty((count, months))
+    values[:, -1] = current
+    for month in range(months - 1, 0, -1):
+        values[:, month - 1] = np.maximum((values[:, month] - flows[:, month]) / (1 + returns[:, month]), 0.0)
+
+    return pd.DataFrame({
+        "Date": np.tile(dates.to_numpy(), count),
+        "Account": np.repeat(sample["Account"].to_numpy()[picks], months),
+        "Broker": np.repeat(sample["Broker"].to_numpy()[picks], months),
+        "Symbol": np.repeat(symbols, months),
+        "Asset Class": np.repeat(sample["Industry"].to_numpy()[picks], months),
+        "Value": np.round(values.ravel(), 2),
+        "Flow": flows.ravel(),
+    })
+
+
+def _cell(value):
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _add_dimensions(path, dimensions):
+    """Insert <dimension ref="A1:..."/> into each sheet of path, given (rows, columns) per sheet in order."""
+    from openpyxl.utils import get_column_letter
+
+    temp = f"{path}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(path) as source, zipfile.ZipFile(temp, "w", zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            name = os.path.basename(item.filename)
+            if not (item.filename.startswith("xl/worksheets/sheet") and name.endswith(".xml")):
+                target.writestr(item, source.read(item))
+                continue
+            rows, columns = dimensions[int(name[len("sheet"):-len(".xml")]) - 1]
+            ref = f"A1:{get_column_letter(max(columns, 1))}{max(rows, 1)}"
+            with source.open(item) as reader, target.open(item, "w", force_zip64=True) as writer:
+                head = reader.read(1 << 16)
+                writer.write(head.replace(b"</sheetPr>", f'</sheetPr><dimension ref="{ref}"/>'.encode(), 1))
+                while chunk := reader.read(1 << 20):
+                    writer.write(chunk)
+    os.replace(temp, path)
+
+
+def generate(rows, output, template=WORKBOOK, seed=0, holdings=None):
+    """Write a rows-transaction workbook to output; returns the output path."""
+    from openpyxl import Workbook, load_workbook
+
+    spend = transactions(rows, template, seed)
+    history = performance_history(holdings, template, seed)
+    in_sheet = len(spend) <= EXCEL_MAX_ROWS
+
+    source = load_workbook(template, read_only=True, data_only=True)
+    workbook = Workbook(write_only=True)
+    dimensions = []  # (rows, columns) of each sheet, in order
+    for name in source.sheetnames:
+        sheet = workbook.create_sheet(name)
+        if name != "spend_data":
+            rows = columns = 0
+            for values in source[name].iter_rows(values_only=True):
+                sheet.append(values)
+                rows, columns = rows + 1, max(columns, len(values))
+            dimensions.append((rows, columns))
+            continue
+        sheet.append(COLUMNS)
+        if in_sheet:
+            for values in spend.itertuples(index=False, name=None):
+                sheet.append([_cell(value) for value in values])
+        dimensions.append((1 + len(spend) if in_sheet else 1, len(COLUMNS)))
+    source.close()
+    sheet = workbook.create_sheet("performance")
+    sheet.append(PERFORMANCE_COLUMNS)
+    for values in history.itertuples(index=False, name=None):
+        sheet.append([_cell(value) for value in values])
+    dimensions.append((1 + len(history), len(PERFORMANCE_COLUMNS)))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    workbook.save(output)
+    _add_dimensions(output, dimensions)
+
+    if not in_sheet:
+        snapshot.write_sheet(output, "spend_data", file_version(output), spend, sole=True)
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic dashboard workbook.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--template", default=WORKBOOK)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--holdings", type=int, default=None)
+    args = parser.parse_args(argv)
+    output = args.output or os.path.join("bench", "workbooks", f"spend-{args.rows}-v{LAYOUT}.xlsx")
+    print(generate(args.rows, output, args.template, args.seed, args.holdings))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# Phuoc's Financial Dashboard - Headless Page Benchmarks
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.1
+# Changes:
+# v1.0 - cold/warm/filter latency and peak RSS of every page per workbook size
+# v1.1 - workbooks named by generator layout, so a bench never runs on an outdated one
+#
+# Usage: python -m bench.run [--sizes 1000 100000 ...] [--output FILE]
+#                            [--baseline bench/baseline.json] [--tolerance 0.25]
+#
+# Each page runs in its own process through Streamlit's AppTest:
+#   ingest  first load of the workbook (sheet snapshots, ledger sync), once per size
+#   cold    first run of the page in a fresh process
+#   warm    median of the next WARM_RUNS reruns
+#   filter  rerun after changing the page's main filter, where it has one
+#   rss_mb  peak resident memory of the page's process
+
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from bench.generate import EXCEL_MAX_ROWS, LAYOUT, generate
+from dashboard import snapshot
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Financial_Dashboard.py", "pages/2-Spending_Details.py", "pages/3-Investments.py", "pages/4-Retirement_Plan.py"]
+SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+WARM_RUNS = 5
+TIMEOUT = 3600
+METRICS = ("cold", "warm", "filter", "rss_mb")
+# Regressions smaller than these are noise
+MIN_DELTA = {"ingest": 0.05, "cold": 0.05, "warm": 0.02, "filter": 0.02, "rss_mb": 20}
+
+
+def _change_filter(at, page):
+    if page == "pages/2-Spending_Details.py":
+        years = at.multiselect[0]
+        years.set_value(years.value[-1:])
+    elif page == "pages/4-Retirement_Plan.py":
+        at.slider[0].set_value(at.slider[0].value + 1)
+    else:
+        return False
+    return True
+
+
+# ---- WORKER PROCESS ----
+def _peak_rss_mb():
+    # ru_maxrss survives exec on Linux, so it would include the parent's
+    # peak (e.g. generating the workbook); VmHWM starts over with this process
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _ingest():
+    from dashboard.data import load_sheet
+    from dashboard.cube import load_spend_cube
+
+    started = time.perf_counter()
+    load_sheet("data")
+    load_spend_cube()
+    return {"ingest": time.perf_counter() - started, "rss_mb": _peak_rss_mb()}
+
+
+def _page(page):
+    from streamlit.testing.v1 import AppTest
+
+    result = {}
+    started = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=TIMEOUT).run()
+    result["cold"] = time.perf_counter() - started
+    if at.exception:
+        return {"error": at.exception[0].message}
+
+    reruns = []
+    for _ in range(WARM_RUNS):
+        started = time.perf_counter()
+        at.run()
+        reruns.append(time.perf_counter() - started)
+    result["warm"] = statistics.median(reruns)
+
+    if _change_filter(at, page):
+        started = time.perf_counter()
+        at.run()
+        result["filter"] = time.perf_counter() - started
+    result["rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def worker(task):
+    result = _ingest() if task == "ingest" else _page(task)
+    print(json.dumps(result))
+    return 0
+# ---- WORKER PROCESS ----
+
+
+def _ledger(workbook):
+    return os.path.splitext(os.path.abspath(workbook))[0] + ".ledger.sqlite"
+
+
+def _run_worker(task, workbook):
+    env = dict(os.environ, DASHBOARD_WORKBOOK=os.path.abspath(workbook), DASHBOARD_LEDGER=_ledger(workbook),
+        DASHBOARD_WATCH_SECONDS="0",
+        PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    try:
+        done = subprocess.run([sys.executable, "-m", "bench.run", "--worker", task], cwd=ROOT, env=env,
+            capture_output=True, text=True, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {TIMEOUT}s"}
+    lines = done.stdout.strip().splitlines()
+    if done.returncode != 0 or not lines:
+        return {"error": f"exit {done.returncode}: {(done.stderr.strip().splitlines() or [''])[-1]}"}
+    return json.loads(lines[-1])
+
+
+def benchmark(sizes, workdir):
+    results = {}
+    for rows in sizes:
+        workbook = os.path.join(workdir, f"spend-{rows}-v{LAYOUT}.xlsx")
+        if not os.path.exists(workbook):
+            started = time.perf_counter()
+            generate(rows, workbook)
+            print(f"{rows:,} rows: generated in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        # Start ingest from the workbook alone; past Excel's limit the
+        # spend_data snapshot is the data and has to stay
+        stale = glob.glob(_ledger(workbook) + "*")
+        if rows <= EXCEL_MAX_ROWS:
+            stale += glob.glob(os.path.join(os.path.dirname(snapshot.snapshot_path(workbook, "data")), "*.arrow"))
+        for path in stale:
+            os.remove(path)
+        size = results[str(rows)] = {"ingest": _run_worker("ingest", workbook)}
+        for page in PAGES:
+            size[page] = _run_worker(page, workbook)
+            print(f"{rows:,} rows: {page} {size[page]}", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing every metric more than tolerance worse than baseline."""
+    regressions = []
+    for rows, pages in results.items():
+        for page, metrics in pages.items():
+            before = baseline.get(rows, {}).get(page, {})
+            for name in ("ingest",) + METRICS:
+                if name not in metrics or name not in before:
+                    continue
+                old, new = before[name], metrics[name]
+                if new > old * (1 + tolerance) and new - old > MIN_DELTA[name]:
+                    regressions.append(f"{rows} rows {page} {name}: {old:.3f} -> {new:.3f}")
+            if "error" in metrics and "error" not in before:
+                regressions.append(f"{rows} rows {page}: {metrics['error']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard pages on synthetic workbooks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--workdir", default=os.path.join(ROOT, "bench", "workbooks"))
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker:
+        return worker(args.worker)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": benchmark(args.sizes, args.workdir),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(report["results"], baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
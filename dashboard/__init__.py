@@ -0,0 +1 @@
+# Phuoc's Financial Dashboard - shared helpers used by the main page and pages/
@@ -0,0 +1,264 @@
+# Phuoc's Financial Dashboard - Budget Tracking and Forecast
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.3
+# Changes:
+# v1.0 - running month x category spend fed from the ledger, month-end and year-end
+#        forecasts with confidence bands, per-category burn rates
+# v1.1 - tracker held in the dashboard.data cache, so it counts against its memory limits
+# v1.2 - tracker built from the spend cube's cells instead of a second read of the whole ledger
+# v1.3 - a tracker per ledger state, moved on by adding only the rows appended since the last one
+#
+# Monthly budgets come from the optional "spend_budget" sheet (Category,
+# Monthly Budget), the overall budget being their sum; without it one
+# DASHBOARD_MONTHLY_BUDGET covers all spending. (The "budget" sheet is the
+# retirement budget worksheet, not this.)
+#
+# The tracker holds spend in a dense (month x category) array, so adding a
+# transaction is one array update and any month, year or category total is
+# a slice of at most twelve rows. The first tracker of a ledger revision is
+# built from the spend cube's cells (one row per year, month, category and
+# account), which are already summed from the ledger; after that each
+# appended transaction is added to a copy of the last tracker.
+#
+# The forecast treats each category's spend over the rest of the year as
+# drawn from its last DASHBOARD_FORECAST_MONTHS complete months: expected
+# spend is the trailing mean per month times the months left (the rest of
+# this one counting as its remaining fraction), with variance scaling the
+# same way. Categories are taken as independent, so the overall band adds
+# their variances. Every category is forecast at once from that
+# (window x categories) slice.
+
+import calendar
+import copy
+import os
+import threading
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from dashboard.data import cached, load_sheet, recall, remember
+from dashboard.cube import HELD, load_spend_cube
+from dashboard.ledger import UNCATEGORIZED, load_ledger
+
+SHEET = "spend_budget"
+BUDGET_COLUMNS = ["Category", "Monthly Budget"]
+MONTHLY_BUDGET = float(os.environ.get("DASHBOARD_MONTHLY_BUDGET", "7850"))
+WINDOW = int(os.environ.get("DASHBOARD_FORECAST_MONTHS", "12"))
+CONFIDENCE = float(os.environ.get("DASHBOARD_FORECAST_CONFIDENCE", "0.8"))
+FORECAST_COLUMNS = ["Spent", "Budget", "Burn Rate", "Month-End", "Month-End Low", "Month-End High",
+    "YTD", "Year-End", "Year-End Low", "Year-End High"]
+
+# total: overall monthly budget; categories: Category -> monthly budget (may be empty)
+Budgets = namedtuple("Budgets", ["total", "categories"])
+# categories: FORECAST_COLUMNS per category; total: the same for all spending
+Forecast = namedtuple("Forecast", ["categories", "total"])
+
+
+def _month_index(year, month):
+    return year * 12 + month - 1
+
+
+class BudgetTracker:
+    """Spend per month and category, updated one transaction (or one batch) at a time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._columns = {}  # category -> column of _totals
+        self._totals = np.zeros((0, 0))
+        self._start = 0  # month index of row 0
+        self._first = None  # earliest and latest month seen
+        self._last = None
+        self.count = 0
+
+    @property
+    def categories(self):
+        return list(self._columns)
+
+    @property
+    def nbytes(self):
+        return self._totals.nbytes
+
+    def copy(self):
+        """An independent tracker with the same spend."""
+        with self._lock:
+            other = copy.copy(self)
+            other._lock = threading.Lock()
+            other._columns = dict(self._columns)
+            other._totals = self._totals.copy()
+        return other
+
+    def _reserve(self, low, high, columns):
+        # Grow to cover months [low, high] and columns categories, doubling on
+        # the short side so appends in date order cost O(1) amortized
+        rows, width = self._totals.shape
+        start, end = self._start, self._start + rows
+        if rows and start <= low and high < end and columns <= width:
+            return
+        if not rows:
+            new_start, new_end = low, high + 1
+        else:
+            new_start = start if low >= start else min(low, start - rows)
+            new_end = end if high < end else max(high + 1, end + rows)
+        new_width = width if columns <= width else max(columns, 2 * width, 8)
+        grown = np.zeros((new_end - new_start, new_width))
+        if rows:
+            grown[start - new_start:start - new_start + rows, :width] = self._totals
+        self._totals, self._start = grown, new_start
+
+    def _seen(self, low, high):
+        self._first = low if self._first is None else min(self._first, low)
+        self._last = high if self._last is None else max(self._last, high)
+
+    def add(self, year, month, category, amount):
+        """Count one transaction."""
+        index = _month_index(int(year), int(month))
+        with self._lock:
+            column = self._columns.setdefault(category or UNCATEGORIZED, len(self._columns))
+            self._reserve(index, index, len(self._columns))
+            self._totals[index - self._start, column] += amount
+            self._seen(index, index)
+            self.count += 1
+
+    def extend(self, transactions):
+        """Count every row of a frame with Year, Month, Category and Amount.
+
+        With a Count column each row stands for that many transactions (as a
+        spend cube cell does).
+        """
+        transactions = transactions.dropna(subset=["Year", "Month"])
+        if not len(transactions):
+            return
+        months = (transactions["Year"].to_numpy(dtype=np.int64) * 12
+            + transactions["Month"].to_numpy(dtype=np.int64) - 1)
+        codes, names = pd.factorize(transactions["Category"].fillna(UNCATEGORIZED).astype(str))
+        amounts = pd.to_numeric(transactions["Amount"], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+        with self._lock:
+            columns = np.array([self._columns.setdefault(name, len(self._columns)) for name in names],
+                dtype=np.int64)
+            low, high = int(months.min()), int(months.max())
+            self._reserve(low, high, len(self._columns))
+            np.add.at(self._totals, (months - self._start, columns[codes]), amounts)
+            self._seen(low, high)
+            self.count += int(transactions["Count"].sum()) if "Count" in transactions else len(transactions)
+
+    def _rows(self, low, high):
+        # (months x categories) spend for month indexes [low, high), zeros outside what is held
+        rows = np.zeros((max(high - low, 0), len(self._columns)))
+        start, end = max(low, self._start), min(high, self._start + len(self._totals))
+        if start < end:
+            rows[start - low:end - low] = self._totals[start - self._start:end - self._start, :len(self._columns)]
+        return rows
+
+    def spent(self, year, month=None, category=None):
+        """Spend in year, or in one month of it, optionally for one category."""
+        low = _month_index(year, month or 1)
+        high = low + 1 if month else low + 12
+        with self._lock:
+            rows = self._rows(low, high)
+            if category is None:
+                return float(rows.sum())
+            column = self._columns.get(category)
+            return 0.0 if column is None else float(rows[:, column].sum())
+
+    def forecast(self, today, budgets=None, window=WINDOW, confidence=CONFIDENCE):
+        """Forecast of this month's and this year's spend as of today, per category and overall."""
+        budgets = budgets or Budgets(MONTHLY_BUDGET, pd.Series(dtype=float))
+        current = _month_index(today.year, today.month)
+        days = calendar.monthrange(today.year, today.month)[1]
+        elapsed = today.day / days
+        remaining = 1 - elapsed
+        months_left = 12 - today.month
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+        with self._lock:
+            names = list(self._columns)
+            month = self._rows(current, current + 1)[0]
+            ytd = self._rows(_month_index(today.year, 1), current + 1).sum(axis=0)
+            first = current if self._first is None else self._first
+            history = self._rows(max(current - window, first), current)
+
+        # trailing monthly mean and spread; with no history, this month's pace
+        if len(history):
+            mean = history.mean(axis=0)
+            std = history.std(axis=0, ddof=1) if len(history) > 1 else np.zeros(len(names))
+        else:
+            mean, std = month / elapsed, np.zeros(len(names))
+
+        budget = budgets.categories.reindex(names).to_numpy(dtype=float)
+        frame = pd.DataFrame(index=pd.Index(names, name="Category"))
+        frame["Spent"] = month
+        frame["Budget"] = budget
+        frame["Month-End"] = month + mean * remaining
+        frame["YTD"] = ytd
+        frame["Year-End"] = ytd + mean * (remaining + months_left)
+        month_variance = std ** 2 * remaining
+        year_variance = std ** 2 * (remaining + months_left)
+
+        total = pd.Series({"Spent": month.sum(), "Budget": budgets.total, "Month-End": frame["Month-End"].sum(),
+            "YTD": ytd.sum(), "Year-End": frame["Year-End"].sum()})
+        for result, month_spread, year_spread in ((frame, np.sqrt(month_variance), np.sqrt(year_variance)),
+                (total, np.sqrt(month_variance.sum()), np.sqrt(year_variance.sum()))):
+            # spend already made is a floor
+            result["Month-End Low"] = np.maximum(result["Month-End"] - z * month_spread, result["Spent"])
+            result["Month-End High"] = result["Month-End"] + z * month_spread
+            result["Year-End Low"] = np.maximum(result["Year-End"] - z * year_spread, result["YTD"])
+            result["Year-End High"] = result["Year-End"] + z * year_spread
+            # share of the budget used per share of the month gone; above 1 runs over before month end
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result["Burn Rate"] = result["Spent"] / result["Budget"] / elapsed
+
+        active = (frame["Spent"] != 0) | (frame["YTD"] != 0) | (mean != 0) | frame["Budget"].notna()
+        frame = frame.loc[active, FORECAST_COLUMNS].sort_values("Month-End", ascending=False)
+        return Forecast(frame, total[FORECAST_COLUMNS])
+
+
+# ---- TRACKER CACHE ----
+# {(revision, watermark): tracker} per workbook, for the last HELD ledger
+# states, kept like the spend cubes: a newer state of the same revision adds
+# the rows past the newest held tracker's watermark to a copy of it, and a
+# new revision starts over from the spend cube.
+_trackers_lock = threading.Lock()
+
+
+def load_budget_tracker(path=None):
+    ledger = load_ledger(path)
+    state = revision, watermark = ledger.revision(), ledger.watermark()
+    with _trackers_lock:
+        trackers = recall(path, ("budget_tracker",), {})
+        tracker = trackers.get(state)
+        if tracker is not None:
+            return tracker
+        base = [held for held in trackers if held[0] == revision and held[1] < watermark]
+        if base:
+            tracker = trackers[max(base)].copy()
+            transactions, _ = ledger.rows_after(max(base)[1])
+            for year, month, category, amount in zip(transactions["Year"], transactions["Month"],
+                    transactions["Category"], transactions["Amount"]):
+                tracker.add(year, month, category, amount)
+        else:
+            cube = load_spend_cube(path)
+            tracker = BudgetTracker()
+            tracker.extend(cube.cells if cube.state == state else ledger.rows_after(0)[0])
+        trackers = dict(sorted({**trackers, state: tracker}.items())[-HELD:])
+        remember(path, ("budget_tracker",), trackers)
+        return tracker
+# ---- TRACKER CACHE ----
+
+
+def load_budgets(path=None):
+    """Monthly budgets from the spend_budget sheet, or DASHBOARD_MONTHLY_BUDGET for everything."""
+    def build(path, version):
+        try:
+            df = load_sheet(SHEET, path)
+        except ValueError:
+            return Budgets(MONTHLY_BUDGET, pd.Series(dtype=float))
+        missing = set(BUDGET_COLUMNS) - set(df.columns)
+        if missing:
+            raise ValueError(f"{SHEET} sheet is missing columns: {', '.join(sorted(missing))}")
+        amounts = pd.to_numeric(df["Monthly Budget"], errors="coerce")
+        categories = amounts.groupby(df["Category"].astype(str).str.strip()).sum()
+        return Budgets(float(categories.sum()), categories)
+    return cached(path, (SHEET,), build)
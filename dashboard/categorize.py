@@ -0,0 +1,288 @@
+# Phuoc's Financial Dashboard - Transaction Categorization Rules
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.2
+# Changes:
+# v1.0 - keyword, merchant alias and regex rules matched in one automaton pass per unique value
+# v1.1 - dropped the unused os import
+# v1.2 - regexes with leading flags or backreferences no longer break (or slip past) the combined screen
+#
+# Usage: python -m dashboard.categorize [--workbook FILE] [--ledger FILE] [--rules FILE] [--all]
+#
+# Rules come from the optional "category_rules" sheet (or a CSV/xlsx file
+# with the same columns), one per row, earlier rows winning:
+#   Category  category to assign
+#   Pattern   what to look for
+#   Kind      keyword: case-insensitive substring (the default)
+#             alias:   merchant name, ignoring case, spaces and punctuation,
+#                      so "amazon.com" matches "AMAZON COM*2K4"
+#             regex:   case-insensitive regular expression
+#   Field     Description (the default) or Account
+#
+# Literal rules are compiled into one Aho-Corasick automaton, expanded to a
+# full transition table, and all unique values step through it together
+# with numpy, one character position per step. Regex rules are screened by
+# one combined pattern before any single rule is tried; a rule that cannot
+# share it (backreferences number groups across the whole pattern) is always
+# tried on its own. Results are
+# memoized per unique description and account, so millions of rows cost
+# what their distinct merchants cost.
+
+import argparse
+import hashlib
+import re
+import sys
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from dashboard.data import WORKBOOK, cached, load_sheet
+
+SHEET = "category_rules"
+RULE_COLUMNS = ["Category", "Pattern", "Kind", "Field"]
+KINDS = ("keyword", "alias", "regex")
+FIELDS = ("Description", "Account")
+NO_MATCH = np.iinfo(np.int32).max
+CHUNK_VALUES = 1 << 14
+
+
+def _squash(text):
+    return re.sub(r"[^0-9a-z]+", "", text.lower())
+
+
+def _screenable(pattern):
+    """pattern as one alternative of the combined screen, or None if it cannot be one.
+
+    Leading global flags, as in (?i)^amzn, become a scoped group; numbered
+    backreferences and group conditions would point at other rules' groups.
+    """
+    flags = re.match(r"\(\?([aiLmsux]+)\)", pattern)
+    if flags:
+        pattern = f"(?{flags.group(1)}:{pattern[flags.end():]})"
+    try:
+        compiled = re.compile(f"(?:{pattern})", re.IGNORECASE)
+    except re.error:
+        return None
+    if compiled.groups and re.search(r"\\\d|\(\?\(", pattern):
+        return None
+    return pattern
+
+
+# ---- AUTOMATON ----
+class Automaton:
+    """Aho-Corasick automaton over (pattern, rule) pairs as a dense transition table.
+
+    best() returns, for each text, the lowest rule whose pattern occurs in it.
+    """
+
+    def __init__(self, patterns):
+        chars = sorted({char for pattern, _ in patterns for char in pattern})
+        self._alphabet = np.array([ord(char) for char in chars], dtype=np.uint32)
+        column = {char: code for code, char in enumerate(chars, 1)}  # 0: any other character
+        goto, output = [{}], [NO_MATCH]
+        for pattern, rule in patterns:
+            state = 0
+            for char in pattern:
+                following = goto[state].get(column[char])
+                if following is None:
+                    following = len(goto)
+                    goto[state][column[char]] = following
+                    goto.append({})
+                    output.append(NO_MATCH)
+                state = following
+            output[state] = min(output[state], rule)
+
+        # Breadth first, so a state's failure state is complete before it
+        table = np.zeros((len(goto), len(chars) + 1), dtype=np.int32)
+        fail = np.zeros(len(goto), dtype=np.int32)
+        queue = deque(goto[0].values())
+        for code, following in goto[0].items():
+            table[0, code] = following
+        while queue:
+            state = queue.popleft()
+            output[state] = min(output[state], output[fail[state]])
+            table[state] = table[fail[state]]
+            for code, following in goto[state].items():
+                fail[following] = table[fail[state], code]
+                table[state, code] = following
+                queue.append(following)
+        self._table = table
+        self._output = np.array(output, dtype=np.int32)
+
+    def _columns(self, texts):
+        width = max(1, max(map(len, texts)))
+        codes = np.array(texts, dtype=f"<U{width}").view(np.uint32).reshape(len(texts), width)
+        if not len(self._alphabet):
+            return np.zeros(codes.shape, dtype=np.int32)
+        index = np.minimum(np.searchsorted(self._alphabet, codes), len(self._alphabet) - 1)
+        return np.where(self._alphabet[index] == codes, index + 1, 0).astype(np.int32)
+
+    def best(self, texts):
+        best = np.full(len(texts), NO_MATCH, dtype=np.int32)
+        if len(self._table) == 1:
+            return best
+        # Similar lengths together, so little of each chunk is padding
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        for start in range(0, len(order), CHUNK_VALUES):
+            chunk = order[start:start + CHUNK_VALUES]
+            columns = self._columns([texts[i] for i in chunk])
+            state = np.zeros(len(chunk), dtype=np.int32)
+            found = np.full(len(chunk), NO_MATCH, dtype=np.int32)
+            for position in range(columns.shape[1]):
+                state = self._table[state, columns[:, position]]
+                np.minimum(found, self._output[state], out=found)
+            best[chunk] = found
+        return best
+# ---- AUTOMATON ----
+
+
+class _Matcher:
+    """Every rule of one field: keyword and alias automata plus the regexes."""
+
+    def __init__(self, rules):
+        literal = lambda kind, key: [(key(pattern), rule) for rule, pattern in
+            rules.loc[rules["Kind"] == kind, "Pattern"].items() if key(pattern)]
+        self._keywords = Automaton(literal("keyword", str.lower))
+        self._aliases = Automaton(literal("alias", _squash))
+        regexes = rules.loc[rules["Kind"] == "regex", "Pattern"]
+        screened = {rule: _screenable(pattern) for rule, pattern in regexes.items()}
+        # (rule, regex, whether the screen covers it)
+        self._regexes = [(rule, re.compile(pattern, re.IGNORECASE), screened[rule] is not None)
+            for rule, pattern in regexes.items()]
+        alternatives = [f"(?:{pattern})" for pattern in screened.values() if pattern is not None]
+        try:
+            self._screen = re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+        except re.error:  # e.g. two rules naming a group alike
+            self._screen = None
+            self._regexes = [(rule, regex, False) for rule, regex, _ in self._regexes]
+
+    def best(self, values):
+        best = self._keywords.best([value.lower() for value in values])
+        np.minimum(best, self._aliases.best([_squash(value) for value in values]), out=best)
+        if self._regexes:
+            first = self._regexes[0][0]
+            for i, value in enumerate(values):
+                if best[i] <= first:
+                    continue
+                screened_out = self._screen is not None and not self._screen.search(value)
+                for rule, regex, screened in self._regexes:
+                    if rule >= best[i]:
+                        break
+                    if screened and screened_out:
+                        continue
+                    if regex.search(value):
+                        best[i] = rule
+                        break
+        return best
+
+
+class Categorizer:
+    """Category of each transaction from the first rule matching its description or account.
+
+    Matches are memoized per distinct value, so an instance keeps getting
+    cheaper as it sees the same merchants again.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.digest = hashlib.sha256(rules.to_csv(index=False).encode()).hexdigest()
+        self._categories = np.array(rules["Category"].tolist() + [None], dtype=object)
+        self._matchers = {field: _Matcher(rules[rules["Field"] == field]) for field in FIELDS
+            if (rules["Field"] == field).any()}
+        self._memo = {field: {} for field in self._matchers}
+
+    def __len__(self):
+        return len(self.rules)
+
+    def _best(self, field, values):
+        """Lowest matching rule of each of values (NO_MATCH appended for missing values)."""
+        memo = self._memo[field]
+        unseen = [value for value in values if value not in memo]
+        if unseen:
+            memo.update(zip(unseen, self._matchers[field].best(unseen).tolist()))
+        return np.array([memo[value] for value in values] + [NO_MATCH], dtype=np.int32)
+
+    def categorize(self, descriptions, accounts=None):
+        """Series of categories, None where no rule matches."""
+        best = np.full(len(descriptions), NO_MATCH, dtype=np.int32)
+        for field, values in (("Description", descriptions), ("Account", accounts)):
+            if values is None or field not in self._matchers:
+                continue
+            codes, uniques = pd.factorize(values)
+            uniques = [str(value) for value in uniques]
+            np.minimum(best, self._best(field, uniques)[codes], out=best)
+        rules = np.where(best == NO_MATCH, len(self.rules), best)
+        return pd.Series(self._categories[rules], index=getattr(descriptions, "index", None), dtype=object)
+
+
+# ---- RULES ----
+def rules_from_frame(df):
+    """Validated rules (RULE_COLUMNS, numbered in priority order) from a rules sheet or file."""
+    missing = [name for name in ("Category", "Pattern") if name not in df]
+    if missing:
+        raise ValueError(f"{SHEET} is missing columns: {', '.join(missing)}")
+    rules = pd.DataFrame({
+        "Category": df["Category"],
+        "Pattern": df["Pattern"],
+        "Kind": df["Kind"] if "Kind" in df else "keyword",
+        "Field": df["Field"] if "Field" in df else "Description",
+    })
+    rules = rules[rules["Category"].notna() & rules["Pattern"].notna()]
+    for name in RULE_COLUMNS:
+        rules[name] = rules[name].astype(str).str.strip()
+    rules["Kind"] = rules["Kind"].str.lower().replace({"": "keyword", "nan": "keyword"})
+    rules["Field"] = rules["Field"].str.title().replace({"": "Description", "Nan": "Description"})
+    rules = rules[rules["Pattern"] != ""].reset_index(drop=True)
+    for name, allowed in (("Kind", KINDS), ("Field", FIELDS)):
+        bad = sorted(set(rules[name]) - set(allowed))
+        if bad:
+            raise ValueError(f"{SHEET}: unknown {name} {', '.join(bad)} (expected {', '.join(allowed)})")
+    for rule, pattern in rules.loc[rules["Kind"] == "regex", "Pattern"].items():
+        try:
+            re.compile(pattern)
+        except re.error as error:
+            raise ValueError(f"{SHEET} rule {rule + 1}: bad regex {pattern!r}: {error}") from None
+    return rules
+
+
+def read_rules(source):
+    """Rules from a CSV or xlsx file."""
+    if source.lower().endswith(".csv"):
+        return rules_from_frame(pd.read_csv(source))
+    sheets = pd.ExcelFile(source).sheet_names
+    return rules_from_frame(pd.read_excel(source, sheet_name=SHEET if SHEET in sheets else 0))
+
+
+def load_categorizer(path=None):
+    """Categorizer for the workbook's category_rules sheet (no rules when it has none)."""
+    def build(path, version):
+        try:
+            df = load_sheet(SHEET, path)
+        except ValueError:
+            df = pd.DataFrame(columns=RULE_COLUMNS)
+        return Categorizer(rules_from_frame(df))
+    return cached(path, ("categorizer",), build)
+# ---- RULES ----
+
+
+def main(argv=None):
+    from dashboard.ledger import Ledger, ledger_path
+
+    parser = argparse.ArgumentParser(description="Re-categorize ledger transactions from the category rules.")
+    parser.add_argument("--workbook", default=WORKBOOK)
+    parser.add_argument("--ledger", default=None)
+    parser.add_argument("--rules", default=None, help="CSV/xlsx rules file instead of the workbook's sheet")
+    parser.add_argument("--all", action="store_true", help="also overwrite categories entered by hand")
+    args = parser.parse_args(argv)
+    categorizer = Categorizer(read_rules(args.rules)) if args.rules else load_categorizer(args.workbook)
+    ledger = Ledger(args.ledger or ledger_path(args.workbook))
+    started = time.perf_counter()
+    changed = ledger.recategorize(categorizer, everything=args.all)
+    print(f"{len(categorizer):,} rules: {changed:,} transactions re-categorized in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# Phuoc's Financial Dashboard - Chart Builders
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.4
+# Changes:
+# v1.0 - the area, bar, treemap, pie and table figures shared by the pages
+# v1.1 - percentile band chart for simulations
+# v1.2 - line/area chart over (downsampled) x, y arrays
+# v1.3 - treemap straight from precomputed id/label/parent/value nodes
+# v1.4 - plotly.express is imported by the builders that use it, not at page import
+#
+# plotly.express pulls in its whole trace/colour machinery on import; pages
+# that only draw graph_objects figures (or nothing yet) never pay for it.
+
+import plotly.graph_objects as go
+
+BLUE = "#0083B8"
+NO_MARGIN = dict(l=0,r=0,t=0,b=0)
+
+
+def area_chart(df, x, y, x_title):
+    import plotly.express as px
+
+    fig = px.area(
+        df,
+        x=x,
+        y=y,
+        title="",
+        color_discrete_sequence=[BLUE] * len(df),
+        template="plotly_white",
+    )
+    fig.update_layout(
+        xaxis=dict(tickmode="linear"),
+        xaxis_title=x_title,
+        plot_bgcolor="rgba(0,0,0,0)",
+        yaxis=(dict(showgrid=False)),
+    )
+    return fig
+
+
+def bar_chart(df, y="Amount"):
+    import plotly.express as px
+
+    fig = px.bar(
+        df,
+        x=df.index,
+        y=y,
+        title="",
+        color_discrete_sequence=[BLUE] * len(df),
+        template="plotly_white",
+    )
+    fig.update_layout(
+        xaxis=dict(tickmode="linear"),
+        plot_bgcolor="rgba(0,0,0,0)",
+        yaxis=(dict(showgrid=False)),
+    )
+    fig.update_layout(margin=NO_MARGIN)
+    return fig
+
+
+def series_chart(x, y, x_title):
+    """Area chart of arrays x, y, e.g. a window from dashboard.downsample."""
+    fig = go.Figure(go.Scatter(x=x, y=y, mode="lines", fill="tozeroy", line=dict(color=BLUE)))
+    fig.update_layout(
+        template="plotly_white",
+        xaxis_title=x_title,
+        plot_bgcolor="rgba(0,0,0,0)",
+        yaxis=(dict(showgrid=False)),
+    )
+    return fig
+
+
+def band_chart(x, bands, x_title):
+    """Median line over shaded outer and inner percentile bands, bands = {percentile: values}."""
+    low, inner_low, median, inner_high, high = (bands[p] for p in sorted(bands))
+    fig = go.Figure()
+    for upper, lower, opacity, name in ((high, low, 0.15, "Outer Band"), (inner_high, inner_low, 0.3, "Inner Band")):
+        fig.add_trace(go.Scatter(x=x, y=lower, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=x, y=upper, mode="lines", line=dict(width=0), fill="tonexty",
+            fillcolor=f"rgba(0,131,184,{opacity})", name=name, hoverinfo="skip"))
+    fig.add_trace(go.Scatter(x=x, y=median, mode="lines", line=dict(color=BLUE), name="Median"))
+    fig.update_layout(
+        template="plotly_white",
+        xaxis_title=x_title,
+        plot_bgcolor="rgba(0,0,0,0)",
+        yaxis=(dict(showgrid=False)),
+        margin=NO_MARGIN,
+    )
+    return fig
+
+
+def treemap(df, path, values, title="", textinfo="label+text+value+percent root", margin=NO_MARGIN):
+    import plotly.express as px
+
+    fig = px.treemap(df, path=path, values=values, title=title)
+    fig.data[0].textinfo = textinfo
+    fig.update_layout(margin=margin)
+    return fig
+
+
+def nodes_treemap(nodes, textinfo="label+text+value+percent root", margin=NO_MARGIN):
+    """Treemap of nodes already summed per level, e.g. a dashboard.holdings view."""
+    fig = go.Figure(go.Treemap(
+        ids=nodes["id"],
+        labels=nodes["label"],
+        parents=nodes["parent"],
+        values=nodes["value"],
+        branchvalues="total",
+        textinfo=textinfo,
+    ))
+    fig.update_layout(margin=margin)
+    return fig
+
+
+def pie_chart(df, names, values, title):
+    import plotly.express as px
+
+    fig = px.pie(df,
+        title = title,
+        names = names,
+        values = values,
+    )
+    fig.update_layout(margin=dict(l=0,r=0,t=25,b=0))
+    return fig
+
+
+def info_table(labels, values):
+    fig = go.Figure(data=go.Table(
+        cells = dict(values=[labels, values],
+            font=dict(color="#eeeeee", size=18),
+            height=30,
+            line_color="#222222",
+            fill_color = "#444444",
+            align = "left")
+            ))
+    fig.layout['template']['data']['table'][0]['header']['fill']['color']='rgba(0,0,0,0)'
+    fig.layout['template']['data']['table'][0]['header']['line']['color']='rgba(0,0,0,0)'
+    fig.update_layout(margin=NO_MARGIN)
+    return fig
@@ -0,0 +1,123 @@
+# Phuoc's Financial Dashboard - Spend Aggregate Cube
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.6
+# Changes:
+# v1.0 - Year x Month x Category x Account totals built once per data version
+# v1.1 - fed from the transaction ledger, folding in rows past its id watermark
+# v1.2 - rebuilt from scratch when the ledger's revision changes (rows re-categorized)
+# v1.3 - held in the dashboard.data cache, so it counts against its memory limits
+# v1.4 - a cube per pinned ledger state, so sessions on the published version keep theirs
+# v1.5 - append() adds the new rows' cells without regrouping the old ones; cubes know their ledger state
+# v1.6 - count() of the transactions matching the Spending filters
+
+import threading
+
+import pandas as pd
+
+from dashboard.data import recall, remember
+from dashboard.ledger import load_ledger
+
+DIMENSIONS = ["Year", "Month", "Category", "Account"]
+
+
+class SpendCube:
+    """Amount and transaction count summed over DIMENSIONS.
+
+    A cube is never modified in place; append() returns a new cube, so one
+    instance can be shared by every session. Appended cells are added
+    after the ones before them, so a key may have more than one cell until
+    the cells outgrow twice their last regrouping; every query sums them.
+    state is the (revision, watermark) of the ledger it was summed from.
+    """
+
+    def __init__(self, cells, state=None, grouped=None):
+        self.cells = cells
+        self.state = state
+        self._grouped = len(cells) if grouped is None else grouped  # cells at the last regrouping
+
+    @classmethod
+    def from_transactions(cls, transactions, state=None):
+        return cls(cls._aggregate(transactions), state)
+
+    @staticmethod
+    def _aggregate(transactions):
+        cells = transactions.groupby(DIMENSIONS, sort=False, dropna=False, observed=True).agg(
+            Amount=("Amount", "sum"),
+            Count=("Amount", "size"),
+        )
+        return cells.reset_index()
+
+    def append(self, transactions, state=None):
+        if len(transactions) == 0:
+            return SpendCube(self.cells, state, self._grouped)
+        cells = pd.concat([self.cells, self._aggregate(transactions)], ignore_index=True)
+        if len(cells) <= 2 * self._grouped:
+            return SpendCube(cells, state, self._grouped)
+        cells = cells.groupby(DIMENSIONS, sort=False, dropna=False, observed=True)[["Amount", "Count"]].sum()
+        return SpendCube(cells.reset_index(), state)
+
+    @property
+    def nbytes(self):
+        return int(self.cells.memory_usage(index=True, deep=True).sum())
+
+    # ---- QUERIES ----
+    def _select(self, filters):
+        cells = self.cells
+        mask = None
+        for dim, allowed in filters.items():
+            if allowed is None:
+                continue
+            dim_mask = cells[dim].isin(list(allowed))
+            mask = dim_mask if mask is None else mask & dim_mask
+        return cells if mask is None else cells[mask]
+
+    def values(self, dim):
+        return pd.unique(self.cells[dim])
+
+    def total(self, **filters):
+        return float(self._select(filters)["Amount"].sum())
+
+    def count(self, **filters):
+        """Transactions matching filters, as Ledger.count() would give them without a search."""
+        return int(self._select(filters)["Count"].sum())
+
+    def by(self, dims, **filters):
+        """Amount and Count grouped by dims, e.g. cube.by(["Month"], Year=[2022])."""
+        cells = self._select(filters)
+        return cells.groupby(dims, observed=True)[["Amount", "Count"]].sum()
+    # ---- QUERIES ----
+
+
+# ---- CUBE CACHE ----
+# {(revision, watermark): cube} per workbook, for the last HELD ledger states.
+# Between revisions the ledger is append-only, so rows with an id past the
+# watermark are exactly what a cube has not seen yet, and a newer state is
+# folded from the newest held cube of its revision; a new revision means
+# rows changed and the cube starts over. Two are held so that while the
+# watcher builds the next version, sessions still on the published one keep
+# its cube. The cubes live in the dashboard.data cache: evicted, they are
+# built again from the whole ledger.
+HELD = 2
+_cubes_lock = threading.Lock()
+
+
+def load_spend_cube(path=None):
+    ledger = load_ledger(path)
+    revision, watermark = ledger.revision(), ledger.watermark()
+    with _cubes_lock:
+        cubes = recall(path, ("spend_cube",), {})
+        cube = cubes.get((revision, watermark))
+        if cube is not None:
+            return cube
+        base = [state for state in cubes if state[0] == revision and state[1] < watermark]
+        if base:
+            transactions, _ = ledger.rows_after(max(base)[1])
+            cube = cubes[max(base)].append(transactions, (revision, watermark))
+        else:
+            transactions, _ = ledger.rows_after(0)
+            cube = SpendCube.from_transactions(transactions, (revision, watermark))
+        cubes = dict(sorted({**cubes, (revision, watermark): cube}.items())[-HELD:])
+        remember(path, ("spend_cube",), cubes)
+        return cube
+# ---- CUBE CACHE ----
@@ -0,0 +1,301 @@
+# Phuoc's Financial Dashboard - Shared Workbook Cache
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.9
+# Changes:
+# v1.0 - process-wide sheet cache shared by every page and session
+# v1.1 - read sheets from the Arrow snapshot, compiling it on first load
+# v1.2 - generic cached() entry point for results derived from the workbook
+# v1.3 - versions can be pinned and published, so a new version is built off the
+#        request path and swapped in at once (see dashboard.watcher)
+# v1.4 - snapshot reads and Excel parses are timed as load stages
+# v1.5 - per-workbook (profile) memory budget and cache metrics
+# v1.6 - uncached read_sheet() for loaders that keep only a derived form of a sheet
+# v1.7 - cached Series are sized too (Series.memory_usage is a plain number)
+# v1.8 - remember()/recall() hold state loaders update themselves under the same LRU and limits
+# v1.9 - a load lock is dropped however its call ends, so failed builds and hits leave none behind
+
+import contextlib
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from dashboard import snapshot
+from dashboard.instrument import stage
+
+WORKBOOK = os.environ.get("DASHBOARD_WORKBOOK", "Phuoc-Financial-Data.xlsx")
+MAX_CACHE_MB = float(os.environ.get("DASHBOARD_CACHE_MB", "512"))
+# Most any one workbook may hold, so a large profile cannot push every other
+# profile out of the cache; 0 leaves only the process-wide limit.
+MAX_PROFILE_CACHE_MB = float(os.environ.get("DASHBOARD_PROFILE_CACHE_MB", "0"))
+
+_lock = threading.RLock()
+_load_locks = {}
+_entries = OrderedDict()  # (path, *key, version) -> entry
+_latest = {}  # (path, *key) -> version last built
+_fingerprints = {}
+_published = {}  # path -> version every session reads
+_local = threading.local()
+_stats = {"hits": 0, "misses": 0, "reloads": 0, "evictions": 0}
+_path_stats = {}  # path -> counters like _stats
+_max_bytes = int(MAX_CACHE_MB * 1024 * 1024)
+_max_profile_bytes = int(MAX_PROFILE_CACHE_MB * 1024 * 1024)
+
+
+# ---- FINGERPRINTS ----
+def _stat(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_version(path=None):
+    """Content hash of the workbook file; only re-hashed when its mtime/size changes."""
+    path = os.path.abspath(path or WORKBOOK)
+    stat = _stat(path)
+    with _lock:
+        known = _fingerprints.get(path)
+        if known is not None and known[0] == stat:
+            return known[1]
+    digest = _hash_file(path)
+    with _lock:
+        _fingerprints[path] = (stat, digest)
+    return digest
+
+
+def data_version(path=None):
+    """The workbook version sessions should read.
+
+    That is the version being built on this thread, else the last published
+    version, else the file's current content hash.
+    """
+    path = os.path.abspath(path or WORKBOOK)
+    pending = getattr(_local, "pending", None)
+    if pending is not None and pending[0] == path:
+        return pending[1]
+    with _lock:
+        published = _published.get(path)
+    if published is not None:
+        return published
+    return file_version(path)
+
+
+@contextlib.contextmanager
+def pending_version(path, version):
+    """Build cached results for version on this thread before it is published."""
+    _local.pending = (os.path.abspath(path), version)
+    try:
+        yield
+    finally:
+        _local.pending = None
+
+
+def publish(path, version):
+    """Switch every session to version and drop results cached for older ones."""
+    path = os.path.abspath(path)
+    with _lock:
+        _published[path] = version
+        for key in [key for key in _entries if key[0] == path and key[-1] != version]:
+            del _entries[key]
+# ---- FINGERPRINTS ----
+
+
+# ---- SHEET CACHE ----
+def _sizeof(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, dict):
+        return sum(_sizeof(item) for item in value.values()) + sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_sizeof(item) for item in value) + sys.getsizeof(value)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+def _count(path, name):
+    _stats[name] += 1
+    counters = _path_stats.setdefault(path, dict.fromkeys(_stats, 0))
+    counters[name] += 1
+
+
+def _evict(keep):
+    if keep is not None and _max_profile_bytes:
+        path = keep[0]
+        used = sum(entry["bytes"] for key, entry in _entries.items() if key[0] == path)
+        for key in [key for key in _entries if key[0] == path]:
+            if used <= _max_profile_bytes:
+                break
+            if key == keep:
+                continue
+            used -= _entries.pop(key)["bytes"]
+            _count(path, "evictions")
+
+    total = sum(entry["bytes"] for entry in _entries.values())
+    for key in list(_entries):
+        if total <= _max_bytes:
+            break
+        if key == keep:
+            continue
+        total -= _entries.pop(key)["bytes"]
+        _count(key[0], "evictions")
+
+
+def cached(path, key, build):
+    """Return build(path, version), rebuilt only when the workbook version changes.
+
+    Results are shared between sessions, so callers must copy before mutating them.
+    """
+    path = os.path.abspath(path or WORKBOOK)
+    version = data_version(path)
+    key = (path,) + tuple(key)
+    versioned = key + (version,)
+    with _lock:
+        load_lock = _load_locks.setdefault(versioned, threading.Lock())
+
+    try:
+        with load_lock:
+            with _lock:
+                entry = _entries.get(versioned)
+                if entry is not None:
+                    _entries.move_to_end(versioned)
+                    _count(path, "hits")
+                    return entry["value"]
+                _count(path, "misses")
+                if _latest.get(key, version) != version:
+                    _count(path, "reloads")
+
+            value = build(path, version)
+
+            with _lock:
+                _entries[versioned] = {"value": value, "bytes": _sizeof(value), "build": build}
+                _entries.move_to_end(versioned)
+                _latest[key] = version
+                _evict(keep=versioned)
+            return value
+    finally:
+        # callers already waiting hold the lock itself; later ones find the entry
+        with _lock:
+            if _load_locks.get(versioned) is load_lock:
+                del _load_locks[versioned]
+
+
+def rebuild(path, version):
+    """Build every result cached for path again, for version (see pending_version)."""
+    path = os.path.abspath(path)
+    with _lock:
+        builds = {key[1:-1]: entry["build"] for key, entry in _entries.items()
+            if key[0] == path and entry["build"] is not None}
+    with pending_version(path, version):
+        for key, build in builds.items():
+            cached(path, key, build)
+    return len(builds)
+
+
+def remember(path, key, value):
+    """Hold value for path under key, sized and evicted with the cached() results.
+
+    For state a loader carries forward itself rather than building once per
+    workbook version (e.g. a cube folded forward past the ledger watermark):
+    there is one value per key, replaced on each remember(), and recall()
+    returns it until it is evicted.
+    """
+    path = os.path.abspath(path or WORKBOOK)
+    held = (path,) + tuple(key) + (None,)
+    with _lock:
+        _entries[held] = {"value": value, "bytes": _sizeof(value), "build": None}
+        _entries.move_to_end(held)
+        _evict(keep=held)
+
+
+def recall(path, key, default=None):
+    """The value last remembered for path under key, or default once evicted."""
+    path = os.path.abspath(path or WORKBOOK)
+    held = (path,) + tuple(key) + (None,)
+    with _lock:
+        entry = _entries.get(held)
+        if entry is None:
+            _count(path, "misses")
+            return default
+        _entries.move_to_end(held)
+        _count(path, "hits")
+        return entry["value"]
+
+
+def read_sheet(sheet_name, path, version, categories=()):
+    """Read a sheet for version from its snapshot, else the workbook, without caching it.
+
+    Columns labelled in categories are categoricals when read from a snapshot.
+    """
+    with stage("load.snapshot"):
+        df = snapshot.read_sheet(path, sheet_name, version, categories)
+    if df is None:
+        with stage("load.read_excel"):
+            df = pd.read_excel(io=path, sheet_name=sheet_name, skiprows=0)
+        try:
+            snapshot.write_sheet(path, sheet_name, version, df)
+        except OSError:
+            pass
+    return df
+
+
+def _read_sheet(sheet_name):
+    def build(path, version):
+        return read_sheet(sheet_name, path, version)
+    return build
+
+
+def load_sheet(sheet_name, path=None):
+    """Return a sheet of the workbook, parsing it at most once per workbook version."""
+    return cached(path, ("sheet", sheet_name), _read_sheet(sheet_name))
+
+
+def set_max_bytes(max_bytes, profile_bytes=None):
+    global _max_bytes, _max_profile_bytes
+    with _lock:
+        _max_bytes = int(max_bytes)
+        if profile_bytes is not None:
+            _max_profile_bytes = int(profile_bytes)
+        _evict(keep=None)
+
+
+def clear_cache():
+    with _lock:
+        _entries.clear()
+        _latest.clear()
+        _fingerprints.clear()
+        _published.clear()
+        _path_stats.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+def cache_stats(path=None):
+    """Cache counters and size, for the whole process or for one workbook's entries."""
+    with _lock:
+        if path is None:
+            stats = dict(_stats)
+            entries = list(_entries.values())
+        else:
+            path = os.path.abspath(path)
+            stats = dict(_path_stats.get(path, dict.fromkeys(_stats, 0)))
+            entries = [entry for key, entry in _entries.items() if key[0] == path]
+        stats["entries"] = len(entries)
+        stats["bytes"] = sum(entry["bytes"] for entry in entries)
+        stats["max_bytes"] = _max_bytes if path is None else (_max_profile_bytes or _max_bytes)
+    return stats
+# ---- SHEET CACHE ----
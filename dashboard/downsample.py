@@ -0,0 +1,114 @@
+# Phuoc's Financial Dashboard - Time Series Downsampling
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.0
+# Changes:
+# v1.0 - LTTB and min/max bucketing over a multi-resolution pyramid
+#
+# A chart never needs more points than it has pixels across. A Pyramid keeps
+# the full series plus coarser min/max levels (each FACTOR times smaller), so
+# drawing any date range only touches a level with a few thousand points in
+# it, which LTTB then reduces to the point budget. Zooming into a range picks
+# a finer level, down to the raw points.
+
+import numpy as np
+
+from dashboard.data import cached, load_sheet
+
+POINTS = 1200
+FACTOR = 4
+
+
+def minmax(x, y, buckets):
+    """Keep the lowest and highest point of each of buckets equal runs (and both ends), in order."""
+    n = len(x)
+    if buckets <= 0 or n <= 2 * buckets:
+        return x, y
+    size = n // buckets
+    whole = size * buckets
+    blocks = y[:whole].reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    keep = np.concatenate([[0, n - 1], offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1)])
+    if whole < n:
+        tail = y[whole:]
+        keep = np.concatenate([keep, [whole + tail.argmin(), whole + tail.argmax()]])
+    keep = np.unique(keep)
+    return x[keep], y[keep]
+
+
+def lttb(x, y, points):
+    """Largest-Triangle-Three-Buckets: points samples that keep the series' visual shape."""
+    n = len(x)
+    if points >= n or points < 3:
+        return x, y
+    xf = x.astype(float)
+    edges = np.linspace(1, n - 1, points - 1).astype(int)
+    keep = np.empty(points, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(points - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        following = slice(hi, edges[bucket + 2] if bucket + 2 < len(edges) else n)
+        # Triangle with the previous pick and the next bucket's average point
+        nx, ny = xf[following].mean(), y[following].mean()
+        px, py = xf[previous], y[previous]
+        area = np.abs((px - nx) * (y[lo:hi] - py) - (px - xf[lo:hi]) * (ny - py))
+        previous = lo + int(area.argmax())
+        keep[bucket + 1] = previous
+    return x[keep], y[keep]
+
+
+class Pyramid:
+    """A series at full resolution plus min/max levels each FACTOR times coarser."""
+
+    def __init__(self, x, y, floor=POINTS):
+        x, y = np.asarray(x), np.asarray(y, dtype=float)
+        self.datetime = np.issubdtype(x.dtype, np.datetime64)
+        if self.datetime:
+            x = x.astype("datetime64[ns]").view("int64")
+        valid = ~np.isnan(y)
+        order = np.argsort(x[valid], kind="stable")
+        self.levels = [(x[valid][order], y[valid][order])]
+        while len(self.levels[-1][0]) > floor * FACTOR:
+            lx, ly = self.levels[-1]
+            self.levels.append(minmax(lx, ly, len(lx) // (2 * FACTOR)))
+
+    def _x(self, value):
+        if value is None or not self.datetime:
+            return value
+        return np.datetime64(value, "ns").view("int64")
+
+    @property
+    def bounds(self):
+        x = self.levels[0][0]
+        if not len(x):
+            return None, None
+        first, last = (x[0], x[-1])
+        if self.datetime:
+            first, last = (np.int64(v).view("datetime64[ns]") for v in (first, last))
+        return first, last
+
+    def window(self, start=None, end=None, points=POINTS):
+        """At most points samples of the series between start and end (inclusive)."""
+        lo, hi = self._x(start), self._x(end)
+        for x, y in self.levels:
+            i = 0 if lo is None else np.searchsorted(x, lo, "left")
+            j = len(x) if hi is None else np.searchsorted(x, hi, "right")
+            if j - i <= points * FACTOR:
+                break
+        x, y = lttb(x[i:j], y[i:j], points)
+        if self.datetime:
+            x = x.view("datetime64[ns]")
+        return x, y
+
+    @property
+    def nbytes(self):
+        return sum(x.nbytes + y.nbytes for x, y in self.levels)
+
+
+def load_series(sheet_name, x, y, path=None):
+    """Pyramid of sheet column y against column x, built once per workbook version."""
+    def build(path, version):
+        df = load_sheet(sheet_name, path)
+        return Pyramid(df[x].to_numpy(), df[y].to_numpy(dtype=float, na_value=np.nan))
+    return cached(path, ("series", sheet_name, x, y), build)
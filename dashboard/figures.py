@@ -0,0 +1,108 @@
+# Phuoc's Financial Dashboard - Figure Cache
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.3
+# Changes:
+# v1.0 - cross-session LRU of built Plotly figures keyed by data version
+# v1.1 - cache misses are timed as the figure stage
+# v1.2 - figures sized from their arrays instead of an extra JSON encode per miss
+# v1.3 - sized through the public to_plotly_json(); the cache saves building figures, not encoding them
+#
+# What is cached is the built Figure. st.plotly_chart only takes a figure
+# (or dict) and always encodes it to JSON itself, so each render still pays
+# that encode; a hit saves the data transforms and figure construction.
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from dashboard.instrument import stage
+
+MAX_FIGURE_MB = float(os.environ.get("DASHBOARD_FIGURE_CACHE_MB", "64"))
+
+_lock = threading.Lock()
+_figures = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_max_bytes = int(MAX_FIGURE_MB * 1024 * 1024)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset, np.ndarray)):
+        items = [_freeze(item) for item in value]
+        return tuple(sorted(items, key=repr)) if isinstance(value, (set, frozenset)) else tuple(items)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _held_bytes(value):
+    # memory under a figure's trace or layout properties, arrays by their nbytes
+    if isinstance(value, dict):
+        return sum(_held_bytes(item) for item in value.values()) + sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_held_bytes(item) for item in value) + sys.getsizeof(value)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+def _spec_bytes(fig):
+    # the figure's property tree, arrays counted by nbytes rather than encoded
+    return _held_bytes(fig.to_plotly_json())
+
+
+def cached_figure(name, build, version, **params):
+    """Return build(), reusing the figure for the same name, data version and params.
+
+    Figures are shared by every session and must not be modified after they
+    are built.
+    """
+    key = (name, version, _freeze(params))
+    with _lock:
+        entry = _figures.get(key)
+        if entry is not None:
+            _figures.move_to_end(key)
+            _stats["hits"] += 1
+            return entry["figure"]
+        _stats["misses"] += 1
+
+    with stage("figure"):
+        fig = build()
+    size = _spec_bytes(fig)
+
+    with _lock:
+        _figures[key] = {"figure": fig, "bytes": size}
+        _figures.move_to_end(key)
+        total = sum(entry["bytes"] for entry in _figures.values())
+        for old in list(_figures):
+            if total <= _max_bytes or old == key:
+                break
+            total -= _figures.pop(old)["bytes"]
+            _stats["evictions"] += 1
+    return fig
+
+
+def set_max_bytes(max_bytes):
+    global _max_bytes
+    with _lock:
+        _max_bytes = int(max_bytes)
+
+
+def clear_figures():
+    with _lock:
+        _figures.clear()
+
+
+def figure_stats():
+    with _lock:
+        stats = dict(_stats)
+        stats["entries"] = len(_figures)
+        stats["bytes"] = sum(entry["bytes"] for entry in _figures.values())
+        stats["max_bytes"] = _max_bytes
+    return stats
@@ -0,0 +1,156 @@
+# Phuoc's Financial Dashboard - Display Formatting
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.3
+# Changes:
+# v1.0 - shared currency/percent formatting, vectorized for whole columns
+# v1.1 - removed display_column(); tables format the visible page only
+# v1.2 - columns round like str.format (exact halves to even), not half up
+# v1.3 - display_column() restored: a sheet column formatted once per data version
+#
+# Negative amounts are written "-$1,234.56" everywhere so st.metric deltas
+# pick the right arrow and colour from the leading sign.
+
+import numpy as np
+
+from dashboard.data import cached, load_sheet
+
+CHUNK_ROWS = 1 << 16
+
+
+# ---- SCALARS ----
+def currency(value):
+    # float(): round() on a numpy scalar rounds the scaled value, not the exact one
+    sign = "-" if round(float(value), 2) < 0 else ""
+    return f"{sign}${abs(value):,.2f}"
+
+
+def delta(value):
+    """Signed currency for st.metric's delta argument."""
+    return currency(value)
+
+
+def percent(value, digits=None):
+    if digits is not None:
+        value = round(value, digits)
+    return f"{value}%"
+# ---- SCALARS ----
+
+
+# ---- COLUMNS ----
+def _format_chunk(values, decimals, prefix, suffix, grouping):
+    # Rows with the same digit count and sign share one layout, so each group
+    # is written as a matrix of code points (one row per character position)
+    # and viewed as a numpy unicode array; no Python string is built per row.
+    n = len(values)
+    # str.format rounds the exact binary value, so exact halves go to even
+    # (0.125 -> "0.12") and 2.675, really 2.67499..., goes down. np.round does
+    # the same except where scaling moved a value onto or across a half;
+    # those few rows are rounded by str.format itself.
+    magnitudes = np.abs(values) * 10 ** decimals
+    scaled = np.round(magnitudes).astype(np.int64)
+    near = np.flatnonzero(np.abs(magnitudes - np.floor(magnitudes) - 0.5) < 1e-6)
+    if len(near):
+        scaled[near] = [int(f"{abs(value):.{decimals}f}".replace(".", "")) for value in values[near]]
+    whole, fraction = np.divmod(scaled, 10 ** decimals)
+    negative = (values < 0) & (scaled > 0)
+
+    digits = np.ones(n, dtype=np.int64)
+    power = 10
+    while power <= whole.max(initial=0):
+        digits += whole >= power
+        power *= 10
+    layout = digits * 2 + negative
+
+    width = 1
+    blocks = []
+    for key in np.unique(layout):
+        rows = np.flatnonzero(layout == key)
+        count, sign = divmod(int(key), 2)
+        head = ("-" if sign else "") + prefix
+        body = count + ((count - 1) // 3 if grouping else 0)
+        tail = (decimals + 1 if decimals else 0) + len(suffix)
+        chars = np.empty((len(head) + body + tail, len(rows)), dtype=np.uint32)
+
+        for position, char in enumerate(head):
+            chars[position] = ord(char)
+        number = whole[rows]
+        position = len(head) + body - 1
+        for place in range(count):
+            if grouping and place and place % 3 == 0:
+                chars[position] = ord(",")
+                position -= 1
+            number, digit = np.divmod(number, 10)
+            chars[position] = digit + 48
+            position -= 1
+
+        position = len(head) + body
+        if decimals:
+            chars[position] = ord(".")
+            number = fraction[rows]
+            for place in range(decimals, 0, -1):
+                number, digit = np.divmod(number, 10)
+                chars[position + place] = digit + 48
+            position += decimals + 1
+        for offset, char in enumerate(suffix):
+            chars[position + offset] = ord(char)
+
+        width = max(width, len(chars))
+        blocks.append((rows, chars))
+
+    formatted = np.zeros((n, width), dtype=np.uint32)
+    for rows, chars in blocks:
+        formatted[rows, :len(chars)] = chars.T
+    return formatted.view(f"<U{width}").ravel()
+
+
+def _format_column(values, decimals, prefix="", suffix="", grouping=True):
+    values = np.asarray(values, dtype=float).ravel()
+    # NaN/inf format as "" and amounts beyond int64 cents fall back to str.format.
+    regular = np.abs(values) < 1e15
+    clean = np.where(regular, values, 0.0)
+    chunks = [
+        _format_chunk(clean[start:start + CHUNK_ROWS], decimals, prefix, suffix, grouping)
+        for start in range(0, len(values), CHUNK_ROWS)
+    ]
+    if not chunks:
+        return np.array([], dtype="<U1")
+    width = max(chunk.dtype.itemsize // 4 for chunk in chunks)
+    formatted = np.concatenate([chunk.astype(f"<U{width}", copy=False) for chunk in chunks])
+    formatted[~np.isfinite(values)] = ""
+
+    large = np.flatnonzero(~regular & np.isfinite(values))
+    if len(large):
+        spec = f"{',' if grouping else ''}.{decimals}f"
+        text = [f"{'-' if value < 0 else ''}{prefix}{abs(value):{spec}}{suffix}" for value in values[large]]
+        formatted = formatted.astype(f"<U{max(width, max(map(len, text)))}")
+        formatted[large] = text
+    return formatted
+
+
+def currency_column(values):
+    """Numbers -> "$1,234.56" / "-$1,234.56" strings; NaN becomes ""."""
+    return _format_column(values, 2, prefix="$")
+
+
+def percent_column(values, digits=2):
+    """Percent values (88.1, not 0.881) -> "88.10%" strings."""
+    return _format_column(values, digits, suffix="%", grouping=False)
+# ---- COLUMNS ----
+
+
+_FORMATS = {"currency": currency_column, "percent": percent_column}
+
+
+def display_column(sheet_name, column, kind="currency", path=None):
+    """A whole sheet column formatted for display, cached per workbook version.
+
+    The numeric column in the sheet is left untouched; callers index the
+    returned (read-only) array by row position.
+    """
+    def build(path, version):
+        values = load_sheet(sheet_name, path)[column].to_numpy(dtype=float, na_value=np.nan)
+        formatted = _FORMATS[kind](values)
+        formatted.setflags(write=False)
+        return formatted
+    return cached(path, ("display", sheet_name, column, kind), build)
@@ -0,0 +1,127 @@
+# Phuoc's Financial Dashboard - Holdings Hierarchy
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.2
+# Changes:
+# v1.0 - asset class > sector > account > holding tree with top-N collapsing
+# v1.1 - holdings revalued at live quotes (see dashboard.pricing)
+# v1.2 - revalued tree held in the dashboard.data cache, so it counts against its memory limits
+#
+# The tree is summed once per workbook version. A view only ever draws one
+# node, its children and their children, with everything past the top N of
+# each level folded into a single "Other" tile, so the treemap stays the same
+# size however many positions there are. Deeper levels are drawn by viewing
+# a child node.
+#
+# Given quotes, each holding with a quoted Symbol and a Quantity is worth
+# Quantity x price instead of its Value in the sheet. That tree is kept once
+# per workbook and rebuilt only when the workbook or the quotes move on.
+
+import os
+
+import pandas as pd
+
+from dashboard.data import cached, data_version, load_sheet, recall, remember
+
+COLUMNS = {"Asset Class": "Industry", "Sector": "Sector", "Account": "Account", "Holding": "Symbol"}
+LEVELS = tuple(COLUMNS)
+TOP_N = int(os.environ.get("DASHBOARD_TREEMAP_TOP_N", "10"))
+ROOT = "Portfolio"
+
+
+class Hierarchy:
+    """Summed values of every node of the holdings tree, children largest first."""
+
+    def __init__(self, df):
+        frame = pd.DataFrame({level: df[column].fillna("Unknown").astype(str).str.strip()
+            for level, column in COLUMNS.items()})
+        frame["Value"] = pd.to_numeric(df["Value"], errors="coerce").fillna(0.0)
+        frame = frame[frame["Value"] != 0]
+        self.total = float(frame["Value"].sum())
+        # one sum per node for each depth, index-sorted so a node's children are one slice
+        self._sums = [frame.groupby(list(LEVELS[:depth + 1]))["Value"].sum() for depth in range(len(LEVELS))]
+
+    def children(self, path=()):
+        """Values of the children of path, largest first (empty for a holding)."""
+        path = tuple(path)
+        if len(path) >= len(LEVELS):
+            return pd.Series(dtype=float)
+        sums = self._sums[len(path)]
+        if path:
+            try:
+                sums = sums.loc[path]
+            except KeyError:
+                return pd.Series(dtype=float)
+        return sums.sort_values(ascending=False, kind="stable")
+
+    def value(self, path=()):
+        if not path:
+            return self.total
+        return float(self.children(path[:-1]).get(path[-1], 0.0))
+
+    def view(self, path=(), top_n=TOP_N, depth=2):
+        """Treemap nodes (id, label, parent, value) for path and depth levels below it."""
+        path = tuple(path)
+        root = "/".join((ROOT,) + path)
+        nodes = [(root, path[-1] if path else ROOT, "", self.value(path))]
+
+        def add(node, parent, remaining):
+            children = self.children(node)
+            # folding a single child into "Other" would hide it for nothing
+            limit = top_n if len(children) > top_n + 1 else len(children)
+            shown = children.iloc[:limit]
+            for label, value in shown.items():
+                child = f"{parent}/{label}"
+                nodes.append((child, label, parent, float(value)))
+                if remaining > 1:
+                    add(node + (label,), child, remaining - 1)
+            rest = children.iloc[limit:]
+            if len(rest):
+                label = f"Other ({len(rest)})"
+                nodes.append((f"{parent}/{label}", label, parent, float(rest.sum())))
+
+        add(path, root, depth)
+        return pd.DataFrame(nodes, columns=["id", "label", "parent", "value"])
+
+    @property
+    def nbytes(self):
+        return int(sum(sums.memory_usage(index=True, deep=True) for sums in self._sums))
+
+
+def revalue(df, prices):
+    """Copy of df with Value = Quantity x price for every holding whose Symbol has a price."""
+    price = df["Symbol"].astype(str).str.strip().map(prices)
+    quantity = pd.to_numeric(df["Quantity"], errors="coerce")
+    frame = df.copy()
+    frame["Value"] = (quantity * price).where(price.notna() & quantity.notna(),
+        pd.to_numeric(df["Value"], errors="coerce"))
+    return frame
+
+
+def holding_symbols(path=None):
+    """Distinct symbols of the investments sheet, the ones to ask quotes for."""
+    def build(path, version):
+        symbols = load_sheet("investments", path)["Symbol"].dropna().astype(str).str.strip()
+        return tuple(sorted(set(symbols) - {""}))
+    return cached(path, ("holding_symbols",), build)
+
+
+def load_hierarchy(path=None, quotes=None):
+    """Hierarchy of the investments sheet, built once per workbook version.
+
+    With quotes (a dashboard.pricing.Quotes) holdings are valued at the quoted
+    prices, rebuilt when the workbook version or the quotes' generation changes.
+    """
+    def build(path, version):
+        return Hierarchy(load_sheet("investments", path))
+    if quotes is None or not quotes.prices:
+        return cached(path, ("holdings",), build)
+
+    # (version, quote generation, Hierarchy), one per workbook
+    version = data_version(path)
+    entry = recall(path, ("revalued",))
+    if entry is not None and entry[:2] == (version, quotes.generation):
+        return entry[2]
+    hierarchy = Hierarchy(revalue(load_sheet("investments", path), quotes.prices))
+    remember(path, ("revalued",), (version, quotes.generation, hierarchy))
+    return hierarchy
@@ -0,0 +1,158 @@
+# Phuoc's Financial Dashboard - Stage Timing Instrumentation
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.2
+# Changes:
+# v1.0 - per-run stage timings and chart payload sizes, debug panel, JSON lines
+# v1.1 - fragment() traces reruns of a single page section on their own
+# v1.2 - fragment(run_every=...) for sections that refresh on a timer
+#
+# Pages call start_trace() first and finish_trace() last, and wrap their
+# sections in stage("load" / "transform" / "figure" / "render"). Shared code
+# can add finer stages (e.g. "load.read_excel") the same way. Tracing is on
+# for every run when DASHBOARD_TRACE=1, or for one session with ?debug=1 in
+# the URL, which also shows the results in the sidebar. Each traced run is
+# logged to the "dashboard.trace" logger and, when DASHBOARD_TRACE_FILE is
+# set, appended to that file, as one JSON object per line.
+#
+# With tracing off, stage() costs one context variable lookup.
+
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("DASHBOARD_TRACE", "") not in ("", "0")
+TRACE_FILE = os.environ.get("DASHBOARD_TRACE_FILE", "")
+
+_log = logging.getLogger("dashboard.trace")
+_current = contextvars.ContextVar("dashboard_trace", default=None)
+_file_lock = threading.Lock()
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class Trace:
+    def __init__(self, page, panel):
+        self.page = page
+        self.panel = panel
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.charts = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def record(self):
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "page": self.page,
+            "total": time.perf_counter() - self.started,
+            "stages": self.stages,
+            "charts": self.charts,
+        }
+
+
+def start_trace(page):
+    """Start timing this run of page if tracing is enabled for it."""
+    import streamlit as st
+
+    debug = st.query_params.get("debug") == "1"
+    trace = Trace(page, panel=debug) if ENABLED or debug else None
+    _current.set(trace)
+    return trace
+
+
+def stage(name):
+    """Context manager timing name within the current run (a no-op when not tracing)."""
+    trace = _current.get()
+    return _NULL_STAGE if trace is None else trace.stage(name)
+
+
+def plotly_chart(container, fig, **kwargs):
+    """container.plotly_chart(fig, ...) timed as "render", recording the figure's payload size."""
+    trace = _current.get()
+    if trace is None:
+        return container.plotly_chart(fig, **kwargs)
+    import plotly.io
+
+    started = time.perf_counter()
+    payload = len(plotly.io.to_json(fig, validate=False))
+    serialize = time.perf_counter() - started
+    with trace.stage("render"):
+        element = container.plotly_chart(fig, **kwargs)
+    trace.charts.append({"key": kwargs.get("key"), "bytes": payload, "serialize": serialize,
+        "render": time.perf_counter() - started - serialize})
+    return element
+
+
+def fragment(name, run_every=None):
+    """st.fragment decorator; reruns of just the fragment are traced as a run of name.
+
+    During a full page run the fragment's stages count towards the page's
+    trace. Fragment reruns are logged but get no debug panel, since a
+    fragment cannot write to the sidebar. run_every (seconds) reruns the
+    fragment on a timer as well.
+    """
+    import streamlit as st
+
+    def decorate(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            if _current.get() is not None:
+                return func(*args, **kwargs)
+            trace = start_trace(name)
+            if trace is not None:
+                trace.panel = False
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finish_trace()
+        return st.fragment(run, run_every=run_every)
+    return decorate
+
+
+def _export(record):
+    line = json.dumps(record)
+    _log.info(line)
+    if TRACE_FILE:
+        with _file_lock, open(TRACE_FILE, "a") as f:
+            f.write(line + "\n")
+
+
+def _show(record):
+    import streamlit as st
+
+    with st.sidebar.expander("Debug: page timings", expanded=True):
+        st.caption(f"{record['page']}: {record['total'] * 1000:,.0f} ms")
+        st.table({
+            "Stage": list(record["stages"]),
+            "ms": [round(seconds * 1000, 1) for seconds in record["stages"].values()],
+        })
+        if record["charts"]:
+            st.table({
+                "Chart": [chart["key"] for chart in record["charts"]],
+                "KB": [round(chart["bytes"] / 1024, 1) for chart in record["charts"]],
+                "ms": [round((chart["serialize"] + chart["render"]) * 1000, 1) for chart in record["charts"]],
+            })
+
+
+def finish_trace():
+    """Export the current run's trace and show the debug panel if it was asked for."""
+    trace = _current.get()
+    if trace is None:
+        return None
+    _current.set(None)
+    record = trace.record()
+    _export(record)
+    if trace.panel:
+        _show(record)
+    return record
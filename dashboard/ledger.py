@@ -0,0 +1,565 @@
+# Phuoc's Financial Dashboard - Transaction Ledger Store
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.9
+# Changes:
+# v1.0 - append-only SQLite ledger with deduplicating statement import
+# v1.1 - DASHBOARD_LEDGER only relocates the default workbook's ledger, so profiles keep their own
+# v1.2 - imports the workbook from the typed transactions frame instead of the raw sheet
+# v1.3 - statements from directories and globs, parsed in a process pool; unchanged files are skipped by hash
+# v1.4 - category rules fill in uncategorized rows; rule-assigned categories follow rule changes
+# v1.5 - rows are tagged with their source, and each import replaces that source's rows, so edits
+#        and deletions in the workbook (or a re-exported statement) reach the ledger
+# v1.6 - load_ledger() returns the ledger pinned at its workbook version's watermark and revision,
+#        so rows the watcher imports for the next version stay hidden until it is published
+# v1.7 - every source that imports a row claims it, and a row is deleted only when no source still has it
+# v1.8 - indexes that give the Spending filters' rows in date order, planner statistics kept after
+#        each import, and match counts remembered per pinned view (or taken from the spend cube)
+# v1.9 - a pinned view reads inside its own open read transaction, so the next version's deletes
+#        and re-categorizations stay out of it too, not only its appends
+#
+# Usage: python -m dashboard.ledger [--workbook FILE] [--ledger FILE] [--workers N] STATEMENT|DIR|GLOB ...
+#
+# Transactions are deduplicated on (Date, Account, Description, Amount) plus
+# the row's occurrence number among identical rows of the same statement:
+# two identical coffees on one statement are both kept, while re-importing
+# the statement (or an overlapping one) adds nothing.
+#
+# Every source (workbook or statement file) that imports a row claims it,
+# and importing a source again brings its rows in line with the new import:
+# its claims on rows it no longer has are dropped, and a row is deleted once
+# no source claims it; edited categories and tags are taken over, and new
+# rows are added. A row two sources share (a statement also typed into the
+# workbook) survives either one dropping it. Only the adds keep the ledger
+# append-only; anything else bumps revision(), so derived totals start over.
+# Rows from ledgers written before sources were recorded are claimed by the
+# sources that import them again.
+#
+# Sessions read the ledger through a view pinned when their workbook
+# version's import finished (Ledger.pinned): the watcher imports the next
+# version into the same file before publishing it, and sessions still on the
+# current version must not see any of it yet. A pinned view keeps a read
+# transaction open on its own connection, which in WAL mode is a snapshot
+# of the file as it was, for as long as the view lives; the WAL is only
+# checkpointed past it once the view is dropped.
+#
+# Exports (one per year and institution, say) can be listed in
+# DASHBOARD_STATEMENTS as ";"-separated files, directories or globs; they
+# are imported into the default workbook's ledger with the workbook.
+
+import argparse
+import contextlib
+import copy
+import glob
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import sys
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from dashboard.categorize import load_categorizer
+from dashboard.data import WORKBOOK, cached, data_version
+from dashboard.transactions import load_transactions, typed_transactions
+
+LEDGER = os.environ.get("DASHBOARD_LEDGER", "")
+STATEMENTS = os.environ.get("DASHBOARD_STATEMENTS", "")
+SHEET = "spend_data"
+STATEMENT_TYPES = (".csv", ".xlsx")
+# Institution exports often leave these out
+UNCATEGORIZED = "Uncategorized"
+
+# frame column -> ledger column
+COLUMNS = {
+    "Date": "date",
+    "Month": "month",
+    "Year": "year",
+    "Month-Year": "month_year",
+    "Account": "account",
+    "Description": "description",
+    "Category": "category",
+    "Tags": "tags",
+    "Amount": "amount",
+}
+KEY = ("date", "account", "description", "amount")
+# Sorting on these needs no "IS NULL" term first, so an index can give the order
+NOT_NULL = ("date", "month", "year", "amount")
+MAX_COUNTS = 256
+# rows ANALYZE samples per index; enough for the planner to pick between them
+ANALYSIS_LIMIT = 1000
+_NAMES = {name.lower(): name for name in COLUMNS}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    month_year TEXT,
+    account TEXT,
+    description TEXT,
+    category TEXT,
+    tags TEXT,
+    amount REAL NOT NULL,
+    occurrence INTEGER NOT NULL,
+    auto_category INTEGER NOT NULL DEFAULT 0,
+    source TEXT,
+    UNIQUE (date, account, description, amount, occurrence)
+);
+CREATE TABLE IF NOT EXISTS claims (
+    row INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    PRIMARY KEY (row, source)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS claims_source ON claims (source, row);
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS transactions_date_desc ON transactions (date DESC);
+CREATE INDEX IF NOT EXISTS transactions_category_date ON transactions (category, date DESC);
+CREATE INDEX IF NOT EXISTS transactions_month_date ON transactions (month, date DESC);
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    added INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value
+);
+"""
+
+# a stored row (t) and an incoming one (i) with the same dedup key
+_SAME_KEY = " AND ".join(f"i.{column} IS t.{column}" for column in KEY + ("occurrence",))
+
+_write_lock = threading.Lock()
+
+
+def ledger_path(workbook=None):
+    workbook = os.path.abspath(workbook or WORKBOOK)
+    if LEDGER and workbook == os.path.abspath(WORKBOOK):
+        return LEDGER
+    stem, _ = os.path.splitext(workbook)
+    return stem + ".ledger.sqlite"
+
+
+def _normalize(transactions):
+    """Statement rows as ledger columns, with the occurrence of each dedup key."""
+    dates = pd.to_datetime(transactions["Date"])
+    rows = pd.DataFrame({
+        "date": dates.dt.strftime("%Y-%m-%d"),
+        "month": transactions["Month"] if "Month" in transactions else dates.dt.month,
+        "year": transactions["Year"] if "Year" in transactions else dates.dt.year,
+        "month_year": (pd.to_datetime(transactions["Month-Year"]) if "Month-Year" in transactions
+            else dates.dt.to_period("M").dt.to_timestamp()).dt.strftime("%Y-%m-%d"),
+        "account": transactions["Account"],
+        "description": transactions["Description"],
+        "category": transactions["Category"],
+        "tags": transactions["Tags"] if "Tags" in transactions else None,
+        # cents / 100 is the same double as the sheet's two-decimal amount, so keys still match
+        "amount": transactions["Cents"] / 100 if "Cents" in transactions else transactions["Amount"].astype(float),
+    })
+    rows["occurrence"] = rows.groupby(list(KEY), sort=False, dropna=False, observed=True).cumcount()
+    return rows.astype(object).where(rows.notna(), None)
+
+
+# ---- STATEMENT FILES ----
+def statement_paths(patterns):
+    """Absolute paths of the statements named by patterns: files, directories (searched recursively) or globs."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = glob.glob(os.path.join(pattern, "**", "*"), recursive=True)
+        else:
+            found = glob.glob(pattern, recursive=True) or [pattern]
+        paths += [os.path.abspath(path) for path in found
+            if path.lower().endswith(STATEMENT_TYPES) and not os.path.basename(path).startswith("~$")]
+    return sorted(set(paths))
+
+
+def _digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_statement(statement, sheet_name=SHEET):
+    """A statement's rows as typed transactions; run in the import pool.
+
+    Column names match case-insensitively. A statement without an Account
+    column is one account, named after the file.
+    """
+    if statement.lower().endswith(".csv"):
+        transactions = pd.read_csv(statement)
+    else:
+        sheets = pd.ExcelFile(statement).sheet_names
+        transactions = pd.read_excel(statement, sheet_name=sheet_name if sheet_name in sheets else 0)
+    transactions = transactions.rename(columns=lambda name: _NAMES.get(str(name).strip().lower(), name))
+    if "Account" not in transactions:
+        transactions["Account"] = os.path.splitext(os.path.basename(statement))[0]
+    if "Category" not in transactions:
+        transactions["Category"] = UNCATEGORIZED
+    return typed_transactions(transactions)
+# ---- STATEMENT FILES ----
+
+
+class Ledger:
+    """Transaction store in one SQLite file, kept in line with its sources.
+
+    Connections are opened per call, so one instance is safe to share
+    between sessions; writes are serialized and readers never block them.
+    A pinned view reads through one connection of its own, one query at a
+    time.
+    """
+
+    through = None  # watermark() of a pinned view
+    _revision = None  # revision() of a pinned view
+    _counts = None  # count() results of a pinned view, by query
+    _snapshot = None  # (connection, lock) of a pinned view, its read transaction open
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            connection.executescript(_SCHEMA)
+            # replaced by transactions_category_date, which also gives the newest rows first
+            connection.execute("DROP INDEX IF EXISTS transactions_category")
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(transactions)")}
+            if "auto_category" not in columns:  # ledgers from before category rules
+                connection.execute("ALTER TABLE transactions ADD COLUMN auto_category INTEGER NOT NULL DEFAULT 0")
+            if "source" not in columns:  # ledgers from before sources were recorded
+                connection.execute("ALTER TABLE transactions ADD COLUMN source TEXT")
+            connection.execute("CREATE INDEX IF NOT EXISTS transactions_source ON transactions (source)")
+            if "transactions" in tables and "claims" not in tables:  # ledgers from before claims
+                connection.execute("INSERT INTO claims SELECT id, source FROM transactions WHERE source IS NOT NULL")
+            if "sqlite_stat1" not in tables:
+                self._analyze(connection)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @contextlib.contextmanager
+    def _read(self):
+        # a pinned view reads its snapshot; anything else a fresh connection
+        if self._snapshot is None:
+            with self._connect() as connection:
+                yield connection
+            return
+        connection, lock = self._snapshot
+        with lock:
+            yield connection
+
+    # ---- INGEST ----
+    def append(self, transactions, source=None, digest=None):
+        """Import a source's rows; returns how many rows were added.
+
+        With a source, it claims every row of transactions and gives up its
+        claim on rows from the last import that are not in transactions;
+        rows no source claims any more are deleted and changed categories
+        and tags are taken over, in the same transaction as the adds; that
+        bumps revision().
+        A category a rule assigned is kept while the source still leaves
+        the row uncategorized. A source whose digest was already imported
+        is skipped without reading its rows. Without a source rows are
+        only added.
+        """
+        with _write_lock, self._connect() as connection:
+            if source is not None and digest is not None:
+                known = connection.execute("SELECT digest FROM sources WHERE name = ?", (source,)).fetchone()
+                if known is not None and known[0] == digest:
+                    return 0
+            rows = _normalize(transactions)
+            rows["source"] = source
+            columns = ", ".join(rows.columns)
+            connection.execute(f"CREATE TEMP TABLE incoming ({columns})")
+            connection.execute(f"CREATE INDEX incoming_key ON incoming ({', '.join(KEY)}, occurrence)")
+            connection.executemany(f"INSERT INTO incoming VALUES ({', '.join('?' * len(rows.columns))})",
+                rows.itertuples(index=False, name=None))
+
+            changed = 0
+            if source is not None:
+                connection.execute("CREATE TEMP TABLE dropped (row INTEGER PRIMARY KEY)")
+                connection.execute("INSERT INTO dropped SELECT c.row FROM claims c JOIN transactions t ON t.id = c.row "
+                    f"WHERE c.source = ? AND NOT EXISTS (SELECT 1 FROM incoming i WHERE {_SAME_KEY})", [source])
+                connection.execute("DELETE FROM claims WHERE source = ? AND row IN dropped", [source])
+                before = connection.total_changes
+                connection.execute("DELETE FROM transactions WHERE id IN dropped "
+                    "AND NOT EXISTS (SELECT 1 FROM claims c WHERE c.row = transactions.id)")
+                # an uncategorized row keeps the category a rule gave it
+                keep_rule = "t.auto_category = 1 AND (i.category IS NULL OR i.category IN ('', ?))"
+                connection.execute(
+                    f"UPDATE transactions AS t SET tags = i.tags, "
+                    f"category = CASE WHEN {keep_rule} THEN t.category ELSE i.category END, "
+                    f"auto_category = CASE WHEN {keep_rule} THEN 1 ELSE 0 END "
+                    f"FROM incoming i WHERE {_SAME_KEY} "
+                    "AND t.id IN (SELECT row FROM claims WHERE source = ?) "
+                    f"AND (t.tags IS NOT i.tags OR NOT ({keep_rule}) "
+                    "AND (t.category IS NOT i.category OR t.auto_category = 1))",
+                    [UNCATEGORIZED, UNCATEGORIZED, source, UNCATEGORIZED])
+                changed = connection.total_changes - before
+                connection.execute("DROP TABLE dropped")
+
+            before = connection.total_changes
+            connection.execute(f"INSERT OR IGNORE INTO transactions ({columns}) SELECT {columns} FROM incoming")
+            added = connection.total_changes - before
+            if source is not None:
+                connection.execute(f"INSERT OR IGNORE INTO claims SELECT t.id, ? FROM incoming i "
+                    f"JOIN transactions t ON {_SAME_KEY}", [source])
+            connection.execute("DROP TABLE incoming")
+            if changed:
+                # rows changed in place: re-run the rules over everything next time
+                connection.execute("DELETE FROM meta WHERE name = 'categorized_through'")
+                connection.execute("INSERT INTO meta VALUES ('revision', 1) "
+                    "ON CONFLICT (name) DO UPDATE SET value = value + 1")
+            if source is not None:
+                connection.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                    (source, digest or "", len(rows), added))
+            if added or changed:
+                self._analyze(connection)
+            return added
+
+    @staticmethod
+    def _analyze(connection):
+        # Without statistics the planner can walk the date index for a filter
+        # that matches a handful of rows; a sampled ANALYZE takes milliseconds
+        connection.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        connection.execute("ANALYZE")
+
+    def digests(self):
+        """Source name -> digest of its last import."""
+        with self._connect() as connection:
+            return dict(connection.execute("SELECT name, digest FROM sources"))
+
+    def import_file(self, statement, sheet_name=SHEET):
+        """Import a CSV or xlsx statement with the spend_data columns.
+
+        Rows are validated as typed transactions first, so amounts are
+        rounded to the cent like the workbook's.
+        """
+        return self.import_files([statement], sheet_name, workers=1).get(os.path.abspath(statement), 0)
+
+    def import_files(self, patterns, sheet_name=SHEET, workers=None):
+        """Import every statement named by patterns; returns {path: rows added}.
+
+        Files whose hash matches their last import are skipped unread. The
+        rest are parsed in a pool of up to workers processes (default: one
+        per core) and appended in path order as their results come back.
+        """
+        known = self.digests()
+        changed = {}
+        added = {}
+        for path in statement_paths(patterns):
+            digest = _digest(path)
+            if known.get(path) == digest:
+                added[path] = 0
+            else:
+                changed[path] = digest
+        workers = min(workers or os.cpu_count() or 1, len(changed))
+        # spawn, not fork: the server process has threads (watcher, sessions)
+        pool = (ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) if workers > 1
+            else contextlib.nullcontext())
+        with pool:
+            parsed = (pool.map if workers > 1 else map)(_read_statement, changed, [sheet_name] * len(changed))
+            for (path, digest), transactions in zip(changed.items(), parsed):
+                added[path] = self.append(transactions, path, digest)
+        return added
+
+    def recategorize(self, categorizer, everything=False):
+        """Apply categorizer's rules to the stored rows; returns how many rows changed.
+
+        Uncategorized rows and rows a rule categorized before are
+        (re)assigned; a rule-assigned row no rule matches any more goes back
+        to Uncategorized. Categories entered by hand are kept unless
+        everything. With the same rules as the last run, only rows added
+        since are read. Any change bumps revision().
+        """
+        with _write_lock, self._connect() as connection:
+            meta = dict(connection.execute("SELECT name, value FROM meta"))
+            through = connection.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0]
+            after = meta.get("categorized_through", 0) if meta.get("rules") == categorizer.digest and not everything else 0
+            where = "t.id > ?" + ("" if everything else " AND (t.auto_category = 1 OR t.category IS NULL OR t.category IN ('', ?))")
+            params = [after] + ([] if everything else [UNCATEGORIZED])
+
+            # Rules only see account and description, so categorize each
+            # distinct pair once and join the result back in SQL
+            pairs = pd.read_sql_query(
+                f"SELECT account, description FROM transactions t WHERE {where} GROUP BY account, description",
+                connection, params=params)
+            pairs["category"] = categorizer.categorize(pairs["description"], pairs["account"])
+            connection.execute("CREATE TEMP TABLE assigned (account, description, category, "
+                "PRIMARY KEY (account, description))")
+            connection.executemany("INSERT INTO assigned VALUES (?, ?, ?)", pairs.itertuples(index=False, name=None))
+            join = f"FROM assigned a WHERE a.account IS t.account AND a.description IS t.description AND {where}"
+            before = connection.total_changes
+            connection.execute(
+                f"UPDATE transactions AS t SET category = a.category, auto_category = 1 {join} "
+                "AND a.category IS NOT NULL AND (t.category IS NOT a.category OR t.auto_category = 0)", params)
+            # rule-assigned rows no rule matches any more are uncategorized again
+            connection.execute(
+                f"UPDATE transactions AS t SET category = ?, auto_category = 0 {join} "
+                "AND a.category IS NULL AND t.auto_category = 1", [UNCATEGORIZED] + params)
+            changed = connection.total_changes - before
+            connection.execute("DROP TABLE assigned")
+
+            meta.update(rules=categorizer.digest, categorized_through=through)
+            if changed:
+                meta["revision"] = meta.get("revision", 0) + 1
+                self._analyze(connection)
+            connection.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", meta.items())
+            return changed
+    # ---- INGEST ----
+
+    # ---- QUERIES ----
+    def pinned(self):
+        """The ledger as it stands now, for the sessions of one workbook version.
+
+        Rows appended, deleted or changed afterwards are not seen by the
+        view's queries, and its revision() keeps its current value.
+        Imports through the view still write to the file.
+        """
+        connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        connection.execute("BEGIN")
+        view = copy.copy(self)
+        view._snapshot = (connection, threading.Lock())
+        view._counts = {}
+        view.through = view._revision = None
+        # the first read fixes the snapshot
+        view.through, view._revision = view.watermark(), view.revision()
+        weakref.finalize(view, connection.close)
+        return view
+
+    @staticmethod
+    def _where(filters, search=None, search_columns=()):
+        """SQL condition and parameters for {frame column: allowed values} filters."""
+        clauses, params = [], []
+        for name, allowed in filters.items():
+            if allowed is None:
+                continue
+            allowed = list(allowed)
+            column = COLUMNS[name]
+            if name == "Year" and allowed and sorted(allowed) == list(range(min(allowed), max(allowed) + 1)):
+                # A run of years is a date range the date index can seek
+                clauses.append("date >= ? AND date < ?")
+                params += [f"{min(allowed):04d}-01-01", f"{max(allowed) + 1:04d}-01-01"]
+                continue
+            clauses.append(f"{column} IN ({', '.join('?' * len(allowed))})" if allowed else "0")
+            params += [int(v) if name in ("Year", "Month") else v for v in allowed]
+        if search:
+            pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            clauses.append("(" + " OR ".join(f"{COLUMNS[name]} LIKE ? ESCAPE '\\'" for name in search_columns) + ")")
+            params += [pattern] * len(search_columns)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _frame(self, sql, params):
+        with self._read() as connection:
+            frame = pd.read_sql_query(sql, connection, params=params, index_col="id")
+        frame = frame.rename(columns={column: name for name, column in COLUMNS.items()})
+        for name in ("Date", "Month-Year"):
+            if name in frame:
+                frame[name] = pd.to_datetime(frame[name])
+        return frame
+
+    def count(self, search=None, search_columns=(), **filters):
+        """Transactions matching filters and search; a pinned view counts each query once."""
+        where, params = self._where(filters, search, search_columns)
+        key = (where, tuple(params))
+        if self._counts is not None and key in self._counts:
+            return self._counts[key]
+        with self._read() as connection:
+            count = connection.execute(f"SELECT COUNT(*) FROM transactions{where}", params).fetchone()[0]
+        if self._counts is not None:
+            if len(self._counts) >= MAX_COUNTS:
+                self._counts.clear()
+            self._counts[key] = count
+        return count
+
+    def page(self, sort_by="Date", ascending=False, search=None, search_columns=(), offset=0, size=25,
+             matches=None, **filters):
+        """One sorted page of the matching transactions, plus the match count.
+
+        matches, when the caller already knows it, is returned as the count.
+        """
+        where, params = self._where(filters, search, search_columns)
+        column = COLUMNS[sort_by]
+        direction = "ASC" if ascending else "DESC"
+        nulls_last = "" if column in NOT_NULL else f"{column} IS NULL, "
+        rows = self._frame(
+            f"SELECT id, {', '.join(COLUMNS.values())} FROM transactions{where} "
+            f"ORDER BY {nulls_last}{column} {direction}, id LIMIT ? OFFSET ?",
+            params + [size, offset])
+        return rows, self.count(search, search_columns, **filters) if matches is None else matches
+
+    def rows_after(self, watermark=0):
+        """Transactions appended after id watermark, and the new watermark."""
+        rows = self._frame(f"SELECT id, {', '.join(COLUMNS.values())} FROM transactions WHERE id > ? ORDER BY id",
+            [watermark])
+        return rows, int(rows.index.max()) if len(rows) else watermark
+
+    def watermark(self):
+        if self.through is not None:
+            return self.through
+        with self._read() as connection:
+            return connection.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0]
+
+    def revision(self):
+        """Bumped whenever stored rows change other than by appending."""
+        if self._revision is not None:
+            return self._revision
+        with self._read() as connection:
+            row = connection.execute("SELECT value FROM meta WHERE name = 'revision'").fetchone()
+        return row[0] if row else 0
+    # ---- QUERIES ----
+
+
+def load_ledger(path=None):
+    """The workbook's ledger, with its spend_data sheet imported.
+
+    The sheet is re-imported when the workbook changes, replacing the rows
+    it imported before (see Ledger.append). Rows without a category then
+    get one from the workbook's category rules. The ledger comes back
+    pinned as that import left it, so a later version's import is not read.
+    """
+    def build(path, version):
+        ledger = Ledger(ledger_path(path))
+        ledger.append(load_transactions(path), os.path.abspath(path), version)
+        if STATEMENTS and path == os.path.abspath(WORKBOOK):
+            ledger.import_files(STATEMENTS.split(";"))
+        categorizer = load_categorizer(path)
+        if len(categorizer):
+            ledger.recategorize(categorizer)
+        return ledger.pinned()
+    return cached(path, ("ledger",), build)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import CSV/xlsx statements into the transaction ledger.")
+    parser.add_argument("--workbook", default=WORKBOOK)
+    parser.add_argument("--ledger", default=None)
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: one per core)")
+    parser.add_argument("statements", nargs="*", help="statement files, directories or globs")
+    args = parser.parse_args(argv)
+    ledger = Ledger(args.ledger or ledger_path(args.workbook))
+    added = ledger.append(load_transactions(args.workbook), os.path.abspath(args.workbook), data_version(args.workbook))
+    print(f"{args.workbook}: {added:,} new transactions")
+    for statement, count in ledger.import_files(args.statements, workers=args.workers).items():
+        print(f"{statement}: {count:,} new transactions")
+    categorizer = load_categorizer(args.workbook)
+    if len(categorizer):
+        print(f"{ledger.recategorize(categorizer):,} transactions categorized by rule")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
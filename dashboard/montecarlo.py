@@ -0,0 +1,140 @@
+# Phuoc's Financial Dashboard - Monte Carlo Retirement Simulation
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.0
+# Changes:
+# v1.0 - NumPy-batched market paths over the retirement horizon
+#
+# Each path follows the workbook's plan one year at a time: contribute until
+# the balance reaches the retirement fund needed, then withdraw the
+# (inflating) annual spend, adding Social Security from its start year.
+
+import datetime
+import functools
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Long-run (mean, volatility) of annual returns per asset class. Means are
+# rescaled so the portfolio's expected return equals the workbook's
+# Investment Growth Rate; the allocation only decides the volatility.
+ASSET_CLASSES = {
+    "Cash": (0.02, 0.01),
+    "Large Cap Growth": (0.09, 0.18),
+    "US Stocks": (0.08, 0.16),
+    "Non-US Stocks": (0.075, 0.18),
+    "Long Term US Treasuries": (0.035, 0.12),
+    "REIT": (0.07, 0.20),
+    "Gold": (0.04, 0.16),
+    "Crypto": (0.10, 0.70),
+}
+DEFAULT_ASSET_CLASS = (0.06, 0.15)
+CORRELATION = 0.3
+
+PERCENTILES = (5, 25, 50, 75, 95)
+CHUNK_PATHS = 25_000
+
+Assumptions = namedtuple("Assumptions", [
+    "start_date", "start_balance", "annual_contribution", "annual_spend", "fund_needed",
+    "growth_rate", "inflation", "social_security_amount", "social_security_year",
+    "allocation", "horizon_years",
+])
+SimulationResult = namedtuple("SimulationResult", [
+    "years", "bands", "success_probability", "retire_probability", "retirement_dates", "paths",
+])
+
+
+def portfolio_volatility(allocation):
+    """Annual volatility of the allocation, given as ((asset class, weight), ...)."""
+    weights = np.array([weight for _, weight in allocation], dtype=float)
+    weights = weights / weights.sum()
+    vols = np.array([ASSET_CLASSES.get(name, DEFAULT_ASSET_CLASS)[1] for name, _ in allocation])
+    correlation = np.full((len(vols), len(vols)), CORRELATION)
+    np.fill_diagonal(correlation, 1.0)
+    covariance = correlation * np.outer(vols, vols)
+    return float(np.sqrt(weights @ covariance @ weights))
+
+
+# ---- SIMULATION ----
+def _simulate_chunk(assumptions, paths, seed):
+    rng = np.random.default_rng(seed)
+    years = assumptions.horizon_years
+    volatility = portfolio_volatility(assumptions.allocation)
+    # Lognormal annual growth with E[1 + R] = 1 + growth rate
+    log_mean = np.log1p(assumptions.growth_rate) - volatility ** 2 / 2
+    growth = np.exp(rng.normal(log_mean, volatility, size=(years, paths)))
+
+    start_year = assumptions.start_date.year
+    inflation = (1 + assumptions.inflation) ** np.arange(years)
+    spend = assumptions.annual_spend * inflation
+    social_security = np.where(
+        start_year + np.arange(years) >= assumptions.social_security_year,
+        assumptions.social_security_amount * inflation, 0.0)
+
+    balance = np.full(paths, float(assumptions.start_balance))
+    retired = balance >= assumptions.fund_needed
+    retire_at = np.where(retired, 0.0, np.nan)
+    depleted = np.zeros(paths, dtype=bool)
+    yearly = np.empty((years + 1, paths), dtype=np.float32)
+    yearly[0] = balance
+
+    for year in range(years):
+        working = ~retired
+        saved = balance * growth[year] + assumptions.annual_contribution
+        spent = (balance - spend[year]) * growth[year] + social_security[year]
+        previous = balance
+        balance = np.where(working, saved, spent)
+
+        # Interpolate the month the target was crossed within this year
+        crossed = working & (balance >= assumptions.fund_needed)
+        if crossed.any():
+            ratio = np.log(assumptions.fund_needed / np.maximum(previous[crossed], 1.0))
+            span = np.log(np.maximum(balance[crossed], 1.0) / np.maximum(previous[crossed], 1.0))
+            retire_at[crossed] = year + np.clip(ratio / np.where(span > 0, span, 1.0), 0.0, 1.0)
+            retired |= crossed
+
+        depleted |= balance <= 0
+        balance = np.maximum(balance, 0.0)
+        yearly[year + 1] = balance
+    return yearly, retire_at, depleted
+
+
+def simulate(assumptions, paths=100_000, seed=None, chunk_paths=CHUNK_PATHS, workers=1):
+    """Simulate paths market paths, chunk_paths at a time, on up to workers processes."""
+    chunks = [min(chunk_paths, paths - start) for start in range(0, paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            results = list(pool.map(_simulate_chunk, [assumptions] * len(chunks), chunks, seeds))
+    else:
+        results = [_simulate_chunk(assumptions, size, chunk_seed) for size, chunk_seed in zip(chunks, seeds)]
+
+    yearly = np.concatenate([result[0] for result in results], axis=1)
+    retire_at = np.concatenate([result[1] for result in results])
+    depleted = np.concatenate([result[2] for result in results])
+
+    start_year = assumptions.start_date.year
+    bands = dict(zip(PERCENTILES, np.percentile(yearly, PERCENTILES, axis=1)))
+    reached = retire_at[~np.isnan(retire_at)]
+    retirement_dates = {}
+    if len(reached):
+        for percentile, offset in zip((10, 50, 90), np.percentile(reached, (10, 50, 90))):
+            retirement_dates[percentile] = assumptions.start_date + datetime.timedelta(days=float(offset) * 365.25)
+    return SimulationResult(
+        years=np.arange(start_year, start_year + assumptions.horizon_years + 1),
+        bands=bands,
+        success_probability=float(1 - depleted.mean()),
+        retire_probability=float(len(reached) / paths),
+        retirement_dates=retirement_dates,
+        paths=paths,
+    )
+# ---- SIMULATION ----
+
+
+@functools.lru_cache(maxsize=32)
+def cached_simulation(assumptions, paths=100_000, seed=0):
+    """simulate() memoized per process, so sessions share identical scenarios."""
+    workers = int(os.environ.get("DASHBOARD_SIMULATION_WORKERS", "1"))
+    return simulate(assumptions, paths=paths, seed=seed, workers=workers)
@@ -0,0 +1,162 @@
+# Phuoc's Financial Dashboard - Portfolio Performance
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.1
+# Changes:
+# v1.0 - time-weighted and money-weighted (XIRR) returns for every group at once
+# v1.1 - whole-number Value/Flow columns are read as floats
+#
+# Returns are computed from the optional "performance" sheet: one row per
+# position per valuation date with its market Value and the external cash
+# Flow into it on that date (contributions positive, withdrawals negative,
+# already included in Value). Dividends that stay in the position are not
+# flows. A grouping is summed into one (groups x dates) matrix of values and
+# one of flows, and both returns are evaluated on the whole matrix, so a
+# breakdown of hundreds of holdings costs a handful of numpy passes.
+
+import numpy as np
+import pandas as pd
+
+from dashboard.data import cached, load_sheet
+
+SHEET = "performance"
+HISTORY_COLUMNS = ["Date", "Account", "Broker", "Symbol", "Asset Class", "Value", "Flow"]
+GROUPS = {"Account": "Account", "Broker": "Broker", "Holding": "Symbol", "Asset Class": "Asset Class"}
+DAYS_PER_YEAR = 365.0
+MIN_RATE = -0.999999
+MAX_RATE = 1e3
+
+
+# ---- RETURNS ----
+def twr(values, flows):
+    """Time-weighted return of each row of (groups x dates) values and flows.
+
+    Flows are taken at the end of the period they land in, so each period
+    returns (V[t] - F[t]) / V[t-1] - 1; periods starting from nothing add 0.
+    """
+    previous, current, flow = values[:, :-1], values[:, 1:], flows[:, 1:]
+    held = previous > 0
+    growth = np.ones_like(current)
+    np.divide(current - flow, previous, out=growth, where=held)
+    return growth.prod(axis=1) - 1
+
+
+def _npv(amounts, times, rate):
+    discount = (1 + rate[:, None]) ** -times
+    npv = (amounts * discount).sum(axis=1)
+    slope = -(amounts * times * discount).sum(axis=1) / (1 + rate)
+    return npv, slope
+
+
+def xirr(amounts, times, guess=0.1, tol=1e-9, max_iter=50):
+    """Annual rate zeroing the NPV of each row of amounts paid at times (in years).
+
+    Newton's method runs on every row at once, dropping rows as they
+    converge; rows it cannot solve fall back to bisection. Rows without both
+    a payment and a receipt have no rate and come back NaN.
+    """
+    amounts = np.atleast_2d(np.asarray(amounts, dtype=float))
+    times = np.asarray(times, dtype=float)
+    rates = np.full(len(amounts), np.nan)
+    solvable = (amounts > 0).any(axis=1) & (amounts < 0).any(axis=1)
+
+    active = np.flatnonzero(solvable)
+    rate = np.full(len(active), guess)
+    for _ in range(max_iter):
+        if not len(active):
+            break
+        npv, slope = _npv(amounts[active], times, rate)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = npv / slope
+        finite = np.isfinite(step)
+        rate = np.where(finite, np.clip(rate - np.where(finite, step, 0), MIN_RATE, MAX_RATE), np.nan)
+        done = finite & (np.abs(step) <= tol * np.maximum(1, np.abs(rate)))
+        rates[active[done]] = rate[done]
+        keep = finite & ~done
+        active, rate = active[keep], rate[keep]
+
+    unsolved = np.flatnonzero(solvable & np.isnan(rates))
+    if len(unsolved):
+        rates[unsolved] = _bisect(amounts[unsolved], times, tol)
+    return rates
+
+
+def _bisect(amounts, times, tol, max_iter=200):
+    low, high = np.full(len(amounts), MIN_RATE), np.full(len(amounts), MAX_RATE)
+    npv_low = _npv(amounts, times, low)[0]
+    npv_high = _npv(amounts, times, high)[0]
+    bracketed = np.sign(npv_low) != np.sign(npv_high)
+    for _ in range(max_iter):
+        middle = (low + high) / 2
+        npv_middle = _npv(amounts, times, middle)[0]
+        lower = np.sign(npv_middle) == np.sign(npv_low)
+        low, npv_low = np.where(lower, middle, low), np.where(lower, npv_middle, npv_low)
+        high = np.where(lower, high, middle)
+        if np.all(high - low <= tol * np.maximum(1, np.abs(low))):
+            break
+    return np.where(bracketed, (low + high) / 2, np.nan)
+# ---- RETURNS ----
+
+
+# ---- BREAKDOWN ----
+def _matrices(history, column, start, end):
+    frame = history
+    if start is not None:
+        frame = frame[frame["Date"] >= pd.Timestamp(start)]
+    if end is not None:
+        frame = frame[frame["Date"] <= pd.Timestamp(end)]
+    sums = frame.groupby([column, "Date"], sort=True, observed=True)[["Value", "Flow"]].sum()
+    values = sums["Value"].unstack("Date", fill_value=0.0)
+    flows = sums["Flow"].unstack("Date", fill_value=0.0).reindex_like(values)
+    # twr() and performance() write float results into these in place
+    return values.index, values.columns, values.to_numpy(dtype=float), flows.to_numpy(dtype=float)
+
+
+def performance(history, by="Account", start=None, end=None):
+    """Start/end value, flows, gain, TWR and XIRR of every group of history between start and end.
+
+    The first valuation in the range is the starting balance, so flows on
+    that date are already part of it and are not counted again.
+    """
+    column = GROUPS.get(by, by)
+    groups, dates, values, flows = _matrices(history, column, start, end)
+    result = pd.DataFrame(index=pd.Index(groups, name=by),
+        columns=["Start Value", "Flows", "End Value", "Gain", "TWR", "XIRR"], dtype=float)
+    if len(dates) < 2:
+        return result
+
+    flows[:, 0] = 0.0
+    result["Start Value"] = values[:, 0]
+    result["Flows"] = flows.sum(axis=1)
+    result["End Value"] = values[:, -1]
+    result["Gain"] = result["End Value"] - result["Start Value"] - result["Flows"]
+    result["TWR"] = twr(values, flows)
+
+    # Investor's view: pay in the start value and each flow, take out the end value
+    amounts = -flows
+    amounts[:, 0] -= values[:, 0]
+    amounts[:, -1] += values[:, -1]
+    times = (dates - dates[0]).days.to_numpy() / DAYS_PER_YEAR
+    result["XIRR"] = xirr(amounts, times)
+    return result
+
+
+def load_history(path=None):
+    """The performance sheet with HISTORY_COLUMNS, or None when the workbook has none."""
+    def build(path, version):
+        try:
+            df = load_sheet(SHEET, path)
+        except ValueError:
+            return None
+        missing = set(HISTORY_COLUMNS) - set(df.columns)
+        if missing:
+            raise ValueError(f"{SHEET} sheet is missing columns: {', '.join(sorted(missing))}")
+        history = df[HISTORY_COLUMNS].copy()
+        history["Date"] = pd.to_datetime(history["Date"])
+        for name in ("Value", "Flow"):
+            history[name] = pd.to_numeric(history[name], errors="coerce").fillna(0.0).astype(float)
+        for name in ("Account", "Broker", "Symbol", "Asset Class"):
+            history[name] = history[name].fillna("Unknown").astype(str).astype("category")
+        return history
+    return cached(path, ("performance",), build)
+# ---- BREAKDOWN ----
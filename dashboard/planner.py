@@ -0,0 +1,170 @@
+# Phuoc's Financial Dashboard - What-If Retirement Planner
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.2
+# Changes:
+# v1.0 - closed-form replica of the retirement formulas on the "data" sheet
+# v1.1 - birth year read from the workbook's monthly-forecast ages, not fixed at 1975
+# v1.2 - an unreachable target (no growth or contribution) has no retirement date instead of raising
+#
+# With the workbook's own inputs every function reproduces the sheet:
+#   Retirement Score        ROUND(((SWR * investments - taxes) / 12) / budget * 100, 1)
+#   Retirement Fund Needed  budget * 1.35 * 12 / SWR
+#   Months Needed to Retire NPER(growth, -contribution, -investments, fund needed) * 12
+#   Retirement Date         current month + months * 30.4167 days
+#   Projection              FV(growth, start - now, -contribution, -investments) in the
+#                           first year, then (previous - spend) * (1 + growth - inflation),
+#                           plus Social Security from its start year
+# Each stage is cached on just its own inputs, so moving one slider only
+# recomputes the stages downstream of it.
+
+import datetime
+import functools
+import math
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from dashboard.data import cached, read_sheet
+
+# Used when the workbook has no monthly-forecast sheet to date ages from
+BIRTH_YEAR = int(os.environ.get("DASHBOARD_BIRTH_YEAR", "1975"))
+AGE_SHEET = "monthly-forecast"
+SPEND_FACTOR = 1.35  # gross-up of the monthly budget for taxes, as on the sheet
+DAYS_PER_MONTH = 30.4167
+
+# Fixed facts from the workbook
+Baseline = namedtuple("Baseline", [
+    "current_month", "total_investments", "retirement_taxes", "retirement_budget",
+    "social_security_amount", "horizon_years", "birth_year",
+])
+# What the sliders move
+Plan = namedtuple("Plan", [
+    "growth_rate", "inflation", "withdrawal_rate", "monthly_contribution",
+    "retirement_age", "social_security_age",
+])
+Projection = namedtuple("Projection", [
+    "score", "fund_needed", "months_to_retire", "retirement_date", "annual_spend", "years", "balances",
+])
+
+
+def _geometric(rate, periods):
+    """sum(rate ** i for i in range(periods)), elementwise."""
+    periods = np.asarray(periods, dtype=float)
+    if rate == 1:
+        return periods
+    return (rate ** periods - 1) / (rate - 1)
+
+
+# ---- STAGES ----
+@functools.lru_cache(maxsize=256)
+def retirement_score(investments, taxes, budget, withdrawal_rate):
+    return round((withdrawal_rate * investments - taxes) / 12 / budget * 100, 1)
+
+
+@functools.lru_cache(maxsize=256)
+def fund_needed(budget, withdrawal_rate):
+    return budget * SPEND_FACTOR * 12 / withdrawal_rate
+
+
+@functools.lru_cache(maxsize=1024)
+def months_to_retire(growth_rate, contribution, investments, target):
+    """Excel's NPER(growth_rate, -contribution, -investments, target) in months.
+
+    inf when the target is never reached, where NPER would return #NUM! or
+    #DIV/0!.
+    """
+    if growth_rate == 0:
+        if contribution <= 0:
+            return 0.0 if investments >= target else math.inf
+        return (target - investments) / contribution * 12
+    start = investments * growth_rate + contribution
+    end = target * growth_rate + contribution
+    if start <= 0 or end <= 0:
+        return 0.0 if investments >= target else math.inf
+    years = np.log(end / start)
+    return float(years / np.log1p(growth_rate) * 12)
+
+
+@functools.lru_cache(maxsize=1024)
+def future_value(growth_rate, years, contribution, investments):
+    """Excel's FV(growth_rate, years, -contribution, -investments)."""
+    return float(investments * (1 + growth_rate) ** years + contribution * _geometric(1 + growth_rate, years))
+
+
+@functools.lru_cache(maxsize=1024)
+def drawdown(start_balance, spend, real_growth, social_security, social_security_index, years):
+    """Balances of B[n] = (B[n-1] - spend) * (1 + real_growth) + SS[n], solved in closed form.
+
+    SS[n] is social_security from index social_security_index on (it is
+    already included in start_balance when that index is 0).
+    """
+    rate = 1 + real_growth
+    n = np.arange(years)
+    balances = start_balance * rate ** n - spend * rate * _geometric(rate, n)
+    since = n - max(social_security_index, 1) + 1
+    balances += np.where(since > 0, social_security * _geometric(rate, np.maximum(since, 0)), 0.0)
+    balances.setflags(write=False)
+    return balances
+
+
+def months_after(start, months):
+    """start plus months of DAYS_PER_MONTH days, or None past what a date can hold."""
+    if not math.isfinite(months):
+        return None
+    try:
+        return start + datetime.timedelta(days=months * DAYS_PER_MONTH)
+    except OverflowError:
+        return None
+# ---- STAGES ----
+
+
+def project(baseline, plan):
+    """Recompute the sheet's retirement metrics and 45-year curve for plan."""
+    contribution = plan.monthly_contribution * 12
+    needed = fund_needed(baseline.retirement_budget, plan.withdrawal_rate)
+    months = months_to_retire(plan.growth_rate, contribution, baseline.total_investments, needed)
+    retirement_date = months_after(baseline.current_month, months)
+
+    start_year = baseline.birth_year + plan.retirement_age
+    social_security_year = baseline.birth_year + plan.social_security_age
+    social_security_index = social_security_year - start_year
+    start_balance = future_value(plan.growth_rate, start_year - baseline.current_month.year,
+        contribution, baseline.total_investments)
+    if social_security_index <= 0:
+        start_balance += baseline.social_security_amount
+
+    annual_spend = baseline.retirement_budget * SPEND_FACTOR * 12
+    balances = drawdown(start_balance, annual_spend, plan.growth_rate - plan.inflation,
+        baseline.social_security_amount, social_security_index, baseline.horizon_years)
+    return Projection(
+        score=retirement_score(baseline.total_investments, baseline.retirement_taxes,
+            baseline.retirement_budget, plan.withdrawal_rate),
+        fund_needed=needed,
+        months_to_retire=months,
+        retirement_date=retirement_date,
+        annual_spend=annual_spend,
+        years=np.arange(start_year, start_year + baseline.horizon_years),
+        balances=balances,
+    )
+
+
+def load_birth_year(path=None):
+    """Birth year from the Age and Month columns of the monthly-forecast sheet, else BIRTH_YEAR.
+
+    A month's age is its year less the birth year, or one less before that
+    year's birthday, so the smallest year - age over the sheet is the birth year.
+    """
+    def build(path, version):
+        try:
+            df = read_sheet(AGE_SHEET, path, version)
+        except ValueError:
+            return BIRTH_YEAR
+        if not {"Age", "Month"} <= set(df.columns):
+            return BIRTH_YEAR
+        years = pd.to_datetime(df["Month"], errors="coerce").dt.year - pd.to_numeric(df["Age"], errors="coerce")
+        years = years.dropna()
+        return int(years.min()) if len(years) else BIRTH_YEAR
+    return cached(path, ("birth_year",), build)
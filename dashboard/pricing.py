@@ -0,0 +1,430 @@
+# Phuoc's Financial Dashboard - Live Holding Prices
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.0
+# Changes:
+# v1.0 - quotes refreshed in batches on a background event loop, served stale-while-revalidate
+#
+# Usage: python -m dashboard.pricing export [--workbook FILE] [--output quotes.csv]
+#        python -m dashboard.pricing serve [--quotes quotes.csv] [--port 8765] [--drift 0.002] [--delay 0.2]
+#        python -m dashboard.pricing fetch [--source SOURCE] [SYMBOL ...]
+#
+# DASHBOARD_QUOTES names the quote source; without it nothing is priced and
+# the workbook's values are shown as they are:
+#   http://host:port/path  GET path?symbols=A,B,C answering a JSON object of
+#                          symbol -> price (unknown symbols left out)
+#   anything else          a CSV (Symbol,Price) or JSON quotes file, re-read
+#                          when it changes
+# "export" writes a quotes file from the workbook's own values and "serve"
+# answers the HTTP protocol from such a file, so the whole path can be run
+# offline.
+#
+# One QuoteService per process holds the quotes for every session. get()
+# only ever reads that cache: symbols missing or older than
+# DASHBOARD_QUOTE_TTL are handed to the service's event loop thread and the
+# caller gets what is cached now. The loop gathers symbols for
+# BATCH_WINDOW seconds, so every session asking in the same moment shares
+# one request; a symbol already waiting or in flight is not asked for again;
+# batches are split at DASHBOARD_QUOTE_BATCH symbols and sent over at most
+# DASHBOARD_QUOTE_CONNECTIONS keep-alive connections. Every change of price
+# bumps the service's generation, which callers fold into their cache keys.
+# Pages look for newer quotes every DASHBOARD_QUOTE_REFRESH seconds.
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from collections import namedtuple
+
+from dashboard.data import WORKBOOK, load_sheet
+
+QUOTES = os.environ.get("DASHBOARD_QUOTES", "")
+QUOTE_TTL = float(os.environ.get("DASHBOARD_QUOTE_TTL", "300"))
+BATCH_SIZE = int(os.environ.get("DASHBOARD_QUOTE_BATCH", "50"))
+CONNECTIONS = int(os.environ.get("DASHBOARD_QUOTE_CONNECTIONS", "4"))
+TIMEOUT = float(os.environ.get("DASHBOARD_QUOTE_TIMEOUT", "10"))
+REFRESH_SECONDS = float(os.environ.get("DASHBOARD_QUOTE_REFRESH", "15"))
+BATCH_WINDOW = 0.02
+ERROR_BACKOFF = 30.0
+PORT = 8765
+
+Quote = namedtuple("Quote", ["price", "fetched_at"])
+# prices: symbol -> price for the symbols quoted so far; as_of: when the
+# oldest of them was fetched; symbols: how many were asked for
+Quotes = namedtuple("Quotes", ["prices", "as_of", "generation", "symbols"])
+
+_log = logging.getLogger(__name__)
+
+
+# ---- PROVIDERS ----
+def _read_quotes(path):
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as file:
+            return {str(symbol).strip(): float(price) for symbol, price in json.load(file).items()
+                if price is not None}
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        return {row["Symbol"].strip(): float(row["Price"]) for row in csv.DictReader(file)
+            if row.get("Symbol") and row.get("Price")}
+
+
+class FileQuotes:
+    """Prices from a CSV (Symbol,Price) or JSON (symbol -> price) file, re-read when it changes."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._stat = None
+        self._prices = {}
+
+    def _load(self):
+        st = os.stat(self.path)
+        stat = (st.st_mtime_ns, st.st_size)
+        if stat != self._stat:
+            self._prices, self._stat = _read_quotes(self.path), stat
+        return self._prices
+
+    async def fetch(self, symbols):
+        prices = await asyncio.to_thread(self._load)
+        return {symbol: prices[symbol] for symbol in symbols if symbol in prices}
+
+
+class HttpQuotes:
+    """Prices from GET url?symbols=A,B,C over a small pool of keep-alive HTTP/1.1 connections."""
+
+    def __init__(self, url, connections=CONNECTIONS):
+        parts = urllib.parse.urlsplit(url)
+        self.url = url
+        self.host = parts.hostname
+        self.secure = parts.scheme == "https"
+        self.port = parts.port or (443 if self.secure else 80)
+        self.path = parts.path or "/"
+        self._query = urllib.parse.parse_qsl(parts.query)
+        self._slots = asyncio.Semaphore(max(1, connections))
+        self._idle = []
+
+    async def _connect(self):
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.secure or None)
+        return reader, writer, False
+
+    async def _response(self, reader):
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        if "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            body = b""
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if not size:
+                    await reader.readline()
+                    break
+                body += await reader.readexactly(size)
+                await reader.readline()
+        else:
+            body = await reader.read()
+            headers["connection"] = "close"
+        return status, headers, body
+
+    async def fetch(self, symbols):
+        query = urllib.parse.urlencode(self._query + [("symbols", ",".join(symbols))])
+        request = (f"GET {self.path}?{query} HTTP/1.1\r\nHost: {self.host}\r\n"
+            "Accept: application/json\r\nConnection: keep-alive\r\n\r\n").encode("ascii")
+        async with self._slots:
+            while True:
+                reader, writer, reused = await self._connect()
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, headers, body = await self._response(reader)
+                    break
+                except (ConnectionError, asyncio.IncompleteReadError, IndexError, ValueError):
+                    writer.close()
+                    # the server may have dropped an idle connection; retry once on a new one
+                    if not reused:
+                        raise
+                except BaseException:
+                    writer.close()
+                    raise
+            if headers.get("connection") == "close":
+                writer.close()
+            else:
+                self._idle.append((reader, writer))
+        if status != 200:
+            raise OSError(f"{self.url} answered {status}")
+        return {str(symbol): float(price) for symbol, price in json.loads(body).items() if price is not None}
+
+
+def quote_provider(source):
+    """Provider for a DASHBOARD_QUOTES value: an http(s) URL or a quotes file."""
+    if source.startswith(("http://", "https://")):
+        return HttpQuotes(source)
+    return FileQuotes(source)
+# ---- PROVIDERS ----
+
+
+# ---- SERVICE ----
+class QuoteService:
+    """Process-wide quote cache, refreshed by provider on its own event loop thread."""
+
+    def __init__(self, provider, ttl=QUOTE_TTL, batch_size=BATCH_SIZE, timeout=TIMEOUT):
+        self.provider = provider
+        self.ttl = ttl
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._quotes = {}  # symbol -> Quote
+        self._retry_at = {}  # symbol -> time it may be asked for again
+        self._wanted = set()  # symbols handed to the loop and not answered yet
+        self._stats = {"gets": 0, "coalesced": 0, "batches": 0, "fetched": 0, "errors": 0, "fetch_seconds": 0.0}
+        # owned by the loop thread
+        self._pending = set()
+        self._waiting = {}  # symbol -> future done when its batch is answered
+        self._flush_handle = None
+        self._tasks = set()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="quote-service", daemon=True)
+        self._thread.start()
+
+    def get(self, symbols):
+        """Quotes cached for symbols, without waiting; missing and stale ones are refreshed in the background."""
+        now = time.time()
+        prices, as_of, due = {}, None, []
+        with self._lock:
+            self._stats["gets"] += 1
+            for symbol in symbols:
+                quote = self._quotes.get(symbol)
+                if quote is not None:
+                    prices[symbol] = quote.price
+                    as_of = quote.fetched_at if as_of is None else min(as_of, quote.fetched_at)
+                    if now - quote.fetched_at < self.ttl:
+                        continue
+                if symbol in self._wanted:
+                    self._stats["coalesced"] += 1
+                elif self._retry_at.get(symbol, 0) <= now:
+                    due.append(symbol)
+            self._wanted.update(due)
+            generation = self.generation
+        if due:
+            self._loop.call_soon_threadsafe(self._enqueue, due)
+        return Quotes(prices, as_of, generation, len(symbols))
+
+    def refresh(self, symbols, timeout=None):
+        """Fetch symbols now, whatever their age, and wait for the answer."""
+        symbols = list(symbols)
+        with self._lock:
+            self._wanted.update(symbols)
+        future = asyncio.run_coroutine_threadsafe(self._refresh(symbols), self._loop)
+        future.result(timeout)
+        return self.get(symbols)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, quotes=len(self._quotes), generation=self.generation)
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _refresh(self, symbols):
+        self._enqueue(symbols)
+        await asyncio.gather(*(self._waiting[symbol] for symbol in symbols if symbol in self._waiting))
+
+    def _enqueue(self, symbols):
+        for symbol in symbols:
+            if symbol not in self._waiting:
+                self._waiting[symbol] = self._loop.create_future()
+                self._pending.add(symbol)
+        if self._pending and self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(BATCH_WINDOW, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        symbols = sorted(self._pending)
+        self._pending.clear()
+        for start in range(0, len(symbols), self.batch_size):
+            task = self._loop.create_task(self._fetch(symbols[start:start + self.batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch):
+        started = time.perf_counter()
+        try:
+            prices = await asyncio.wait_for(self.provider.fetch(batch), self.timeout)
+        except Exception as error:
+            _log.warning("quotes for %d symbols failed: %s", len(batch), error)
+            prices = None
+        now = time.time()
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["fetch_seconds"] += time.perf_counter() - started
+            changed = False
+            for symbol in batch:
+                self._wanted.discard(symbol)
+                if prices is None:
+                    self._stats["errors"] += 1
+                    self._retry_at[symbol] = now + ERROR_BACKOFF
+                elif symbol in prices:
+                    self._stats["fetched"] += 1
+                    previous = self._quotes.get(symbol)
+                    changed = changed or previous is None or previous.price != prices[symbol]
+                    self._quotes[symbol] = Quote(prices[symbol], now)
+                else:
+                    # not a symbol the provider knows (cash, private funds): ask again after a TTL
+                    self._retry_at[symbol] = now + self.ttl
+            if changed:
+                self.generation += 1
+        for symbol in batch:
+            waiter = self._waiting.pop(symbol, None)
+            if waiter is not None and not waiter.done():
+                waiter.set_result(None)
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def quote_service(source=None):
+    """The process-wide QuoteService for source (default DASHBOARD_QUOTES), or None when there is none."""
+    source = QUOTES if source is None else source
+    if not source:
+        return None
+    with _services_lock:
+        service = _services.get(source)
+        if service is None:
+            service = _services[source] = QuoteService(quote_provider(source))
+        return service
+
+
+def live_quotes(symbols, source=None):
+    """Cached quotes for symbols (see QuoteService.get), or None when no quote source is configured."""
+    service = quote_service(source)
+    return None if service is None else service.get(symbols)
+# ---- SERVICE ----
+
+
+# ---- STAND-IN SOURCE ----
+def workbook_prices(path=None):
+    """Symbol -> Value / Quantity of the workbook's investments sheet, for an offline quotes file."""
+    df = load_sheet("investments", path)
+    prices = {}
+    for symbol, quantity, value in zip(df["Symbol"], df["Quantity"], df["Value"]):
+        try:
+            price = float(value) / float(quantity)
+        except (TypeError, ValueError, ZeroDivisionError):
+            continue
+        if isinstance(symbol, str) and symbol.strip() and price == price:
+            prices.setdefault(symbol.strip(), round(price, 4))
+    return prices
+
+
+def serve(prices, host="127.0.0.1", port=PORT, drift=0.0, delay=0.0):
+    """Answer the HTTP quote protocol from prices until interrupted.
+
+    Each request moves every price by a random step of up to drift (a
+    fraction), so revaluation can be watched, and waits delay seconds
+    first, to stand in for a remote service.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+            symbols = [symbol for item in query.get("symbols", []) for symbol in item.split(",") if symbol]
+            if delay:
+                time.sleep(delay)
+            with lock:
+                if drift:
+                    for symbol in prices:
+                        prices[symbol] = round(prices[symbol] * (1 + random.uniform(-drift, drift)), 4)
+                body = json.dumps({symbol: prices[symbol] for symbol in symbols if symbol in prices}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            _log.info(format, *args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+# ---- STAND-IN SOURCE ----
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quote sources for revaluing holdings.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="write a quotes file from the workbook's holdings")
+    export.add_argument("--workbook", default=WORKBOOK)
+    export.add_argument("--output", default="quotes.csv")
+    stand_in = commands.add_parser("serve", help="answer the HTTP quote protocol from a quotes file")
+    stand_in.add_argument("--quotes", default=None, help="CSV/JSON quotes file (default: the workbook's prices)")
+    stand_in.add_argument("--workbook", default=WORKBOOK)
+    stand_in.add_argument("--host", default="127.0.0.1")
+    stand_in.add_argument("--port", type=int, default=PORT)
+    stand_in.add_argument("--drift", type=float, default=0.0, help="largest random price move per request")
+    stand_in.add_argument("--delay", type=float, default=0.0, help="seconds to wait before answering")
+    fetch = commands.add_parser("fetch", help="fetch quotes through the quote service and print them")
+    fetch.add_argument("--source", default=QUOTES or None, help="quote source (default: DASHBOARD_QUOTES)")
+    fetch.add_argument("--workbook", default=WORKBOOK)
+    fetch.add_argument("symbols", nargs="*", help="symbols to price (default: the workbook's holdings)")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        prices = workbook_prices(args.workbook)
+        with open(args.output, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Symbol", "Price"])
+            writer.writerows(sorted(prices.items()))
+        print(f"{args.output}: {len(prices):,} prices")
+    elif args.command == "serve":
+        prices = _read_quotes(args.quotes) if args.quotes else workbook_prices(args.workbook)
+        print(f"serving {len(prices):,} prices on http://{args.host}:{args.port}/quotes")
+        serve(prices, args.host, args.port, args.drift, args.delay)
+    else:
+        if not args.source:
+            parser.error("fetch needs --source or DASHBOARD_QUOTES")
+        symbols = args.symbols or sorted(workbook_prices(args.workbook))
+        service = quote_service(args.source)
+        started = time.perf_counter()
+        quotes = service.refresh(symbols, timeout=TIMEOUT * (1 + len(symbols) // service.batch_size))
+        elapsed = time.perf_counter() - started
+        for symbol in symbols:
+            price = quotes.prices.get(symbol)
+            print(f"{symbol:<12} {'-' if price is None else f'{price:,.4f}'}")
+        stats = service.stats()
+        print(f"{len(quotes.prices):,} of {len(symbols):,} symbols priced in {elapsed:.2f}s "
+            f"({stats['batches']} batches, {stats['errors']} failed)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
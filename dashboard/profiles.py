@@ -0,0 +1,67 @@
+# Phuoc's Financial Dashboard - Household Profiles
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.0
+# Changes:
+# v1.0 - one workbook per profile, picked per session, served from the shared cache
+#
+# Profiles come from DASHBOARD_PROFILES ("Name=path.xlsx;Other=other.xlsx"),
+# else from every .xlsx file in DASHBOARD_PROFILE_DIR (named after the file),
+# else the single DASHBOARD_WORKBOOK. Pages pass profile.path to every loader:
+# the caches in dashboard.data are keyed by workbook path, so sessions on the
+# same profile share one parsed copy and profiles never see each other's data.
+
+import os
+from collections import namedtuple
+
+from dashboard import data
+
+PROFILES = os.environ.get("DASHBOARD_PROFILES", "")
+PROFILE_DIR = os.environ.get("DASHBOARD_PROFILE_DIR", "")
+
+Profile = namedtuple("Profile", ["name", "path"])
+
+
+def _name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def available_profiles():
+    """Profile name -> Profile, in configured order."""
+    profiles = {}
+    if PROFILES:
+        for item in PROFILES.split(";"):
+            if not item.strip():
+                continue
+            name, separator, path = item.partition("=")
+            if not separator:
+                name, path = _name(item.strip()), item
+            profiles[name.strip()] = path.strip()
+    elif PROFILE_DIR:
+        for file_name in sorted(os.listdir(PROFILE_DIR)):
+            if file_name.endswith(".xlsx") and not file_name.startswith("~$"):
+                profiles[_name(file_name)] = os.path.join(PROFILE_DIR, file_name)
+    if not profiles:
+        profiles[_name(data.WORKBOOK)] = data.WORKBOOK
+    return {name: Profile(name, os.path.abspath(path)) for name, path in profiles.items()}
+
+
+def current_profile():
+    """The profile this session is viewing: ?profile=NAME, else its last choice, else the first.
+
+    With more than one profile the sidebar gets a picker; the choice is kept
+    in the session so it carries across pages.
+    """
+    import streamlit as st
+
+    profiles = available_profiles()
+    names = list(profiles)
+    chosen = st.query_params.get("profile") or st.session_state.get("profile")
+    if chosen not in profiles:
+        chosen = names[0]
+    if len(names) > 1:
+        chosen = st.sidebar.selectbox("Profile", names, index=names.index(chosen))
+        st.query_params["profile"] = chosen
+    st.session_state["profile"] = chosen
+    return profiles[chosen]
+
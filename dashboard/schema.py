@@ -0,0 +1,230 @@
+# Phuoc's Financial Dashboard - Named Ranges on the "data" Sheet
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.3
+# Changes:
+# v1.0 - declarative metric -> cell/range schema with selective loading
+# v1.1 - Current Month cell (row 1, the header row of a snapshot frame)
+# v1.2 - range reads are timed as load stages
+# v1.3 - excel_date() converts serial date cells without xlrd
+
+import datetime
+import re
+from collections import namedtuple
+
+import pandas as pd
+
+from dashboard import snapshot
+from dashboard.data import cached
+from dashboard.instrument import stage
+
+SHEET = "data"
+# Excel counts days from 1900-01-00 and believes 1900 was a leap year
+EXCEL_EPOCH = datetime.datetime(1899, 12, 31)
+EXCEL_LEAP_BUG = 60
+
+# ref:     A1 reference of the value (B3) or block (A21:B44)
+# anchor:  (cell, label) expected in column A; if the label has moved, the
+#          ref moves with it, so inserting a row does not shift every metric
+# columns: column names of a block
+Cell = namedtuple("Cell", ["ref", "anchor"])
+Range = namedtuple("Range", ["ref", "anchor", "columns"])
+
+SUMMARY = ("A3", "Net Worth:")
+BROKERS = ("A45", "Current Budget:")
+PORTFOLIO = ("A70", "YTD Earnings:")
+RETIREMENT = ("A111", "Social Security Amount:")
+
+DATA_SCHEMA = {
+    "current_month": Cell("B1", ("A1", "Current Month:")),
+
+    # NET WORTH
+    "net_worth": Cell("B3", ("A3", "Net Worth:")),
+    "net_worth_change": Cell("B4", ("A4", "Net Worth Change:")),
+    "assets": Cell("B5", ("A5", "Assets:")),
+    "liabilities": Cell("B6", ("A6", "Liabilities:")),
+    "total_investments": Cell("B7", ("A7", "Total Investments:")),
+    "net_worth_history": Range("A21:B44", ("A20", "Retirement Date:"), ["Month", "Net Worth"]),
+
+    # RETIREMENT
+    "safe_withdrawal_rate": Cell("B8", ("A8", "Safe Withdrawal Rate:")),
+    "investment_growth_rate": Cell("B9", ("A9", "Investment Growth Rate:")),
+    "retirement_federal_taxes": Cell("B12", ("A12", "Retirement Federal Taxes:")),
+    "retirement_state_taxes": Cell("B13", ("A13", "Retirement State Taxes:")),
+    "retirement_budget": Cell("B16", ("A16", "Retirement Budget:")),
+    "retirement_score": Cell("B17", ("A17", "Retirement Score:")),
+    "retirement_fund_needed": Cell("B18", ("A18", "Retirement Fund Needed:")),
+    "months_needed_to_retire": Cell("B19", ("A19", "Months Needed to Retire:")),
+    "retirement_date": Cell("B20", ("A20", "Retirement Date:")),
+    "retirement_start": Cell("B106", ("A106", "Retirement Start Year:")),
+    "annual_contribution": Cell("B107", ("A107", "Estimated Annual Contribution:")),
+    "annual_spend": Cell("B108", ("A108", "Estimated Annual Spend:")),
+    "inflation": Cell("B109", ("A109", "Inflation:")),
+    "social_security_year": Cell("B110", ("A110", "Social Security Year:")),
+    "social_security_amount": Cell("B111", ("A111", "Social Security Amount:")),
+    "retirement_value": Cell("B112", RETIREMENT),
+    "retirement_projection": Range("A112:B156", RETIREMENT, ["Year", "Amount"]),
+    "retirement_budget_categories": Range("A157:B165", RETIREMENT, ["Category", "Amount"]),
+    "retirement_allocation": Range("A166:B170", RETIREMENT, ["Asset Class", "Percentage"]),
+
+    # INVESTMENTS
+    "brokers": Range("A46:B49", BROKERS, ["Broker", "Amount"]),
+    "accounts": Range("A50:B55", BROKERS, ["Account", "Amount"]),
+    "asset_allocation": Range("A56:B62", BROKERS, ["Asset", "Amount"]),
+    "year_start_balance": Cell("B66", ("A66", "Year Start Balance:")),
+    "ytd_contributions": Cell("B67", ("A67", "YTD Contributions:")),
+    "ytd_dividends": Cell("B68", ("A68", "YTD Dividends:")),
+    "ytd_performance": Cell("B69", ("A69", "YTD Performance:")),
+    "ytd_earnings": Cell("B70", ("A70", "YTD Earnings:")),
+    "sector_allocation": Range("A71:B80", PORTFOLIO, ["Sector", "Amount"]),
+    "holdings": Range("A81:B105", PORTFOLIO, ["Investment", "Amount"]),
+}
+
+
+# ---- A1 REFERENCES ----
+def _split(cell):
+    letters, row = re.fullmatch(r"([A-Z]+)(\d+)", cell).groups()
+    col = 0
+    for letter in letters:
+        col = col * 26 + ord(letter) - ord("A") + 1
+    return int(row), col
+
+
+def _bounds(ref):
+    first, _, last = ref.partition(":")
+    (row1, col1), (row2, col2) = _split(first), _split(last or first)
+    return row1, col1, row2, col2
+# ---- A1 REFERENCES ----
+
+
+# ---- GRID READERS ----
+# Both readers return {excel row: tuple of values starting at column A}.
+def _snapshot_rows(df):
+    def read(row_lo, row_hi, max_col):
+        lo, hi = max(row_lo - 2, 0), min(row_hi - 1, len(df))
+        block = df.iloc[lo:hi, :max_col]
+        rows = {
+            position + 2: tuple(None if pd.isna(v) else v for v in values)
+            for position, values in zip(range(lo, hi), block.itertuples(index=False))
+        }
+        if row_lo <= 1:
+            # Row 1 became the frame's column labels
+            rows[1] = tuple(None if str(v).startswith("Unnamed:") else v for v in df.columns[:max_col])
+        return rows
+    return read
+
+
+def _workbook_rows(path):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    worksheet = workbook[SHEET]
+
+    def read(row_lo, row_hi, max_col):
+        rows = worksheet.iter_rows(min_row=row_lo, max_row=row_hi, max_col=max_col, values_only=True)
+        return dict(zip(range(row_lo, row_hi + 1), rows))
+    return read, workbook
+# ---- GRID READERS ----
+
+
+def _find_label(read, label, max_row):
+    for row, values in read(1, max_row, 1).items():
+        if values and values[0] == label:
+            return row
+    return None
+
+
+def _resolve(read, specs):
+    # Read every requested row in one streaming pass, then re-anchor any
+    # entry whose label is no longer where the schema expects it.
+    rows = {}
+    for spec in specs.values():
+        row1, _, row2, _ = _bounds(spec.ref)
+        anchor_row = _split(spec.anchor[0])[0]
+        rows.update({row: None for row in (row1, row2, anchor_row)})
+    lo, hi = min(rows), max(rows)
+    max_col = max(_bounds(spec.ref)[3] for spec in specs.values())
+    grid = read(lo, hi, max_col)
+
+    shifts = {}
+    for spec in specs.values():
+        cell, label = spec.anchor
+        if cell in shifts:
+            continue
+        anchor_row = _split(cell)[0]
+        found = grid.get(anchor_row) or ()
+        if found and found[0] == label:
+            shifts[cell] = 0
+            continue
+        moved = _find_label(read, label, hi + 1000)
+        if moved is None:
+            raise KeyError(f"label {label!r} not found in column A of the {SHEET!r} sheet")
+        shifts[cell] = moved - anchor_row
+
+    if any(shifts.values()):
+        lo = min(lo, lo + min(shifts.values()))
+        hi = hi + max(shifts.values())
+        grid = read(max(lo, 1), hi, max_col)
+    return grid, shifts
+
+
+def _extract(grid, spec, shift):
+    row1, col1, row2, col2 = _bounds(spec.ref)
+    block = []
+    for row in range(row1 + shift, row2 + shift + 1):
+        values = tuple(grid.get(row) or ())
+        values += (None,) * (col2 - len(values))
+        block.append(values[col1 - 1:col2])
+    if isinstance(spec, Cell):
+        return block[0][0]
+    return pd.DataFrame(block, columns=spec.columns)
+
+
+def _load(names):
+    def build(path, version):
+        specs = {name: DATA_SCHEMA[name] for name in names}
+        with stage("load.snapshot"):
+            df = snapshot.read_sheet(path, SHEET, version)
+        workbook = None
+        if df is not None:
+            read = _snapshot_rows(df)
+        else:
+            read, workbook = _workbook_rows(path)
+        try:
+            with stage("load.ranges" if workbook is None else "load.openpyxl"):
+                grid, shifts = _resolve(read, specs)
+        finally:
+            if workbook is not None:
+                workbook.close()
+        return {name: _extract(grid, spec, shifts[spec.anchor[0]]) for name, spec in specs.items()}
+    return build
+
+
+def load_ranges(names, path=None):
+    """Load only the named cells and blocks of the "data" sheet.
+
+    Cells come back as scalars and blocks as DataFrames with the schema's
+    column names; the result is shared between sessions.
+    """
+    names = tuple(sorted(set(names)))
+    unknown = [name for name in names if name not in DATA_SCHEMA]
+    if unknown:
+        raise KeyError(f"unknown data ranges: {', '.join(unknown)}")
+    return cached(path, ("ranges",) + names, _load(names))
+
+
+
+def excel_date(serial):
+    """datetime of an Excel (1900 date system) serial date cell, to the millisecond.
+
+    Cells already read as dates pass through unchanged.
+    """
+    if isinstance(serial, datetime.datetime):
+        return serial
+    serial = float(serial)
+    days = int(serial)
+    if serial >= EXCEL_LEAP_BUG:
+        # serial 60 is the 29th of February 1900 that never was
+        days -= 1
+    milliseconds = int(round((serial - int(serial)) * 86_400_000))
+    return EXCEL_EPOCH + datetime.timedelta(days=days, milliseconds=milliseconds)
\ No newline at end of file
@@ -0,0 +1,243 @@
+# Phuoc's Financial Dashboard - Columnar Workbook Snapshot
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.3
+# Changes:
+# v1.0 - compile workbook sheets to memory-mapped Arrow IPC files
+# v1.1 - chosen string columns can be read dictionary-encoded, as pandas categoricals
+# v1.2 - sheets convert in one split-block to_pandas call; mixed columns decode per type, not per row;
+#        a snapshot holding the only copy of a sheet is never replaced by a parse of the workbook
+# v1.3 - a sole snapshot is only read for its own workbook version, and only a parse of that
+#        version is refused, so an edited workbook is read again like any other
+#
+# Usage: python -m dashboard.snapshot [--workbook FILE] [--sheet NAME ...]
+#
+# A snapshot is read with a single Table.to_pandas(split_blocks=True): each
+# column becomes its own pandas block, so numeric columns without missing
+# values stay views of the memory-mapped file instead of being copied.
+#
+# A "sole" snapshot is the only copy of its sheet's rows, as for synthetic
+# workbooks past Excel's row limit whose sheet is left empty. Like any
+# snapshot it is read only for the workbook version it was written for; a
+# parse of that same version (the empty sheet) never replaces it, while
+# once the workbook changes its parse does.
+
+import argparse
+import datetime
+import json
+import numbers
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # snapshots are an accelerator; pages fall back to the xlsx
+    pa = None
+
+SHEETS = ("data", "spend_data")
+FORMAT = "1"
+SNAPSHOT_DIR = os.environ.get("DASHBOARD_SNAPSHOT_DIR", "")
+
+# Mixed-type object columns (the "data" sheet mixes labels, numbers and dates
+# in one column) are split into one typed Arrow column per Python type.
+_PARTS = (
+    ("bool", lambda v: isinstance(v, bool)),
+    ("int", lambda v: isinstance(v, numbers.Integral)),
+    ("float", lambda v: isinstance(v, numbers.Real)),
+    ("ts", lambda v: isinstance(v, (datetime.datetime, datetime.date))),
+    ("str", lambda v: isinstance(v, str)),
+)
+
+
+def snapshot_path(workbook, sheet_name):
+    workbook = os.path.abspath(workbook)
+    root = SNAPSHOT_DIR or os.path.join(os.path.dirname(workbook), ".snapshot")
+    stem = os.path.splitext(os.path.basename(workbook))[0]
+    return os.path.join(root, stem, f"{sheet_name}.arrow")
+
+
+# ---- ENCODING ----
+def _label(value):
+    if isinstance(value, datetime.datetime):
+        return {"kind": "ts", "value": value.isoformat()}
+    if isinstance(value, numbers.Number):
+        return {"kind": "num", "value": value}
+    return {"kind": "str", "value": str(value)}
+
+
+def _unlabel(label):
+    if label["kind"] == "ts":
+        return pd.Timestamp(label["value"])
+    return label["value"]
+
+
+def _part_of(value):
+    for part, matches in _PARTS:
+        if matches(value):
+            return part
+    raise TypeError(f"cannot snapshot value {value!r}")
+
+
+def _encode_column(series):
+    try:
+        return [("", pa.array(series, from_pandas=True))]
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        pass
+    parts = {}
+    for row, value in enumerate(series.tolist()):
+        if value is None or (isinstance(value, float) and value != value):
+            continue
+        parts.setdefault(_part_of(value), {})[row] = value
+    encoded = []
+    for part, values in parts.items():
+        column = [values.get(row) for row in range(len(series))]
+        encoded.append((part, pa.array(column, from_pandas=True)))
+    return encoded
+
+
+def _decode_mixed(parts, length):
+    # one vectorized fill per Python type, each into the rows that had it
+    values = np.full(length, np.nan, dtype=object)
+    for part, array in parts:
+        rows = np.flatnonzero(array.is_valid().to_numpy(zero_copy_only=False))
+        present = array.drop_null()
+        values[rows] = (present.to_pandas().astype(object).to_numpy() if part == "ts"
+            else present.to_numpy(zero_copy_only=False))
+    return pd.Series(values, dtype=object)
+# ---- ENCODING ----
+
+
+# ---- READ / WRITE ----
+def _open(source):
+    # (reader, metadata) of a snapshot in this FORMAT, or None
+    if not os.path.exists(source):
+        return None
+    try:
+        reader = pa.ipc.open_file(pa.memory_map(source, "r"))
+    except (OSError, pa.ArrowInvalid):
+        return None
+    metadata = reader.schema.metadata or {}
+    if metadata.get(b"format", b"").decode() != FORMAT:
+        return None
+    return reader, metadata
+
+
+def _is_sole(metadata):
+    return metadata.get(b"sole", b"") == b"1"
+
+
+def write_sheet(workbook, sheet_name, version, df, sole=False):
+    """Write df as the snapshot of sheet_name for the given workbook version.
+
+    sole marks df as the only copy of the sheet's rows (see above). Without
+    it a sole snapshot of the same version is left alone and None is
+    returned.
+    """
+    if pa is None:
+        return None
+    target = snapshot_path(workbook, sheet_name)
+    if not sole:
+        existing = _open(target)
+        if existing is not None and _is_sole(existing[1]) and existing[1].get(b"version", b"").decode() == version:
+            return None
+    arrays, names, labels = [], [], []
+    for position, label in enumerate(df.columns):
+        labels.append(_label(label))
+        for part, array in _encode_column(df.iloc[:, position]):
+            names.append(f"c{position}:{part}")
+            arrays.append(array)
+    metadata = {
+        "format": FORMAT,
+        "version": version,
+        "sheet": sheet_name,
+        "rows": str(len(df)),
+        "labels": json.dumps(labels),
+    }
+    if sole:
+        metadata["sole"] = "1"
+    table = pa.Table.from_arrays(arrays, names=names, metadata=metadata)
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp = f"{target}.{os.getpid()}.tmp"
+    with pa.OSFile(temp, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(temp, target)
+    return target
+
+
+def read_sheet(workbook, sheet_name, version, categories=()):
+    """Memory-map the snapshot of sheet_name, or None when it is missing or stale.
+
+    String columns labelled in categories come back as pandas categoricals.
+    """
+    if pa is None:
+        return None
+    opened = _open(snapshot_path(workbook, sheet_name))
+    if opened is None:
+        return None
+    reader, metadata = opened
+    if metadata.get(b"version", b"").decode() != version:
+        return None
+
+    table = reader.read_all()
+    length = int(metadata[b"rows"])
+    labels = [_unlabel(label) for label in json.loads(metadata[b"labels"])]
+    whole, mixed = {}, {}
+    for name, array in zip(table.column_names, table.columns):
+        position, part = name[1:].split(":", 1)
+        if part:
+            mixed.setdefault(int(position), []).append((part, array))
+        elif labels[int(position)] in categories and pa.types.is_string(array.type):
+            # never materializes one Python string per row
+            whole[int(position)] = array.dictionary_encode()
+        else:
+            whole[int(position)] = array
+    del table
+    if whole:
+        df = pa.Table.from_arrays(list(whole.values()), names=[str(position) for position in whole])
+        whole.clear()
+        df = df.to_pandas(split_blocks=True, self_destruct=True)
+    else:
+        df = pd.DataFrame(index=pd.RangeIndex(length))
+    # columns are in position order, so each mixed one goes in at its own position
+    for position in sorted(mixed):
+        df.insert(position, str(position), _decode_mixed(mixed[position], length))
+    df.columns = labels
+    return df
+
+
+def compile_workbook(workbook, sheets=SHEETS):
+    from dashboard.data import data_version
+
+    version = data_version(workbook)
+    written = []
+    for sheet_name in sheets:
+        df = pd.read_excel(io=workbook, sheet_name=sheet_name, skiprows=0)
+        path = write_sheet(workbook, sheet_name, version, df)
+        if path is not None:  # a sole snapshot is kept
+            written.append(path)
+    return written
+# ---- READ / WRITE ----
+
+
+def main(argv=None):
+    from dashboard.data import WORKBOOK
+
+    parser = argparse.ArgumentParser(description="Compile workbook sheets into Arrow snapshots.")
+    parser.add_argument("--workbook", default=WORKBOOK)
+    parser.add_argument("--sheet", action="append", dest="sheets")
+    args = parser.parse_args(argv)
+    if pa is None:
+        print("pyarrow is required to compile snapshots", file=sys.stderr)
+        return 1
+    for path in compile_workbook(args.workbook, args.sheets or SHEETS):
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+# Phuoc's Financial Dashboard - Page Styling
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.0
+# Changes:
+# v1.0 - style.css and the hide-Streamlit rules built into one <style> block once per process
+#
+# Every page used to read style.css on every run and send the hide-style
+# block as a second element at the bottom. The combined markup is built the
+# first time a page asks for it and rebuilt only when style.css changes.
+
+import functools
+import os
+
+STYLE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "style.css")
+HIDE_STREAMLIT_STYLE = """
+#MainMenu {visibility: hidden;}
+footer {visibility: hidden;}
+header {visibility: hidden;}
+"""
+
+
+@functools.lru_cache(maxsize=4)
+def _markup(path, mtime):
+    with open(path) as f:
+        css = f.read()
+    return f"<style>{css}\n{HIDE_STREAMLIT_STYLE}</style>"
+
+
+def page_style(path=STYLE_FILE):
+    """The <style> block for path plus the hide-Streamlit rules."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    return _markup(path, mtime)
+
+
+def apply_style():
+    import streamlit as st
+
+    st.markdown(page_style(), unsafe_allow_html=True)
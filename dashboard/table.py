@@ -0,0 +1,164 @@
+# Phuoc's Financial Dashboard - Paginated Tables
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.7
+# Changes:
+# v1.0 - server-side search, sort and paging; only the visible rows are sent
+# v1.1 - display strings come from pre-formatted columns when given
+# v1.2 - ledger_table pages through the SQLite ledger with LIMIT/OFFSET
+# v1.3 - page fetches and table rendering are timed
+# v1.4 - the row count caption names what the rows are
+# v1.5 - windows match a stable sort: ties keep row order across pages, missing values sort last
+# v1.6 - ledger_table takes its match count from a spend cube of the same ledger state
+# v1.7 - display columns may come from dashboard.formatting.display_column again
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from dashboard.formatting import currency_column
+from dashboard.instrument import plotly_chart, stage
+
+PAGE_SIZES = (25, 50, 100, 250)
+ROW_HEIGHT = 30
+
+
+def _sort_keys(column, ascending=True):
+    """Keys ordering column ascending or descending, with missing values last either way."""
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_datetime64_any_dtype(column):
+        keys = column.to_numpy(dtype=float, na_value=np.nan)
+        missing = np.isnan(keys)
+        keys = keys if ascending else -keys
+        keys[missing] = np.inf
+        return keys
+    if pd.api.types.is_datetime64_any_dtype(column):
+        values = column.to_numpy()
+        keys, missing = values.view("int64").copy(), np.isnat(values)
+    else:
+        keys, _ = pd.factorize(column, sort=True)
+        missing = keys < 0
+    if not ascending:
+        keys = ~keys  # -x - 1: reverses the order without overflowing at the int64 minimum (NaT)
+    keys[missing] = np.iinfo(np.int64).max
+    return keys
+
+
+def window(df, sort_by=None, ascending=True, search="", search_columns=(), offset=0, size=PAGE_SIZES[0]):
+    """Rows [offset, offset + size) of df after searching and sorting, plus the match count.
+
+    Only the requested window is ordered: when it lies near the top of the
+    result, partitioning finds the key of its last row and only rows up to
+    that key are sorted. Ties keep their row order, so pages match one
+    stable sort of the whole result and never repeat or skip a row.
+    """
+    positions = np.arange(len(df))
+    if search:
+        found = np.zeros(len(df), dtype=bool)
+        for name in search_columns:
+            found |= df[name].astype(str).str.contains(search, case=False, regex=False, na=False).to_numpy()
+        positions = np.flatnonzero(found)
+    matches = len(positions)
+    end = min(offset + size, matches)
+    if offset >= end:
+        return df.iloc[[]], matches
+
+    if sort_by is None:
+        return df.iloc[positions[offset:end]], matches
+    keys = _sort_keys(df[sort_by], ascending)[positions]
+    if end < matches // 4:
+        last = np.partition(keys, end - 1)[end - 1]
+        # every row sorting before or tied with the window's last one, in row order
+        top = np.flatnonzero(keys <= last)
+        order = top[np.argsort(keys[top], kind="stable")]
+    else:
+        order = np.argsort(keys, kind="stable")
+    return df.iloc[positions[order[offset:end]]], matches
+
+
+def _reset_page(key):
+    st.session_state[f"{key}_page"] = 1
+
+
+def paginated_table(df, key, columns=("Date", "Account", "Description", "Category", "Amount"),
+                    search_columns=("Account", "Description", "Category"), sort_by="Date", ascending=False,
+                    display=None, noun="transactions"):
+    """Render df as a paged table with search, sort and page-size controls.
+
+    display maps a column name to its pre-formatted strings (e.g.
+    dashboard.formatting.currency_column of the column, or display_column
+    for a whole sheet column), one per row of df and looked up by row label,
+    so df needs a 0..n-1 index.
+    """
+    def fetch(sort_by, ascending, search, offset, size):
+        return window(df, sort_by, ascending, search, search_columns, offset=offset, size=size)
+    _paged(fetch, key, list(columns), sort_by, ascending, display or {}, noun)
+
+
+def ledger_table(ledger, key, columns=("Date", "Account", "Description", "Category", "Amount"),
+                 search_columns=("Account", "Description", "Category"), sort_by="Date", ascending=False,
+                 cube=None, **filters):
+    """paginated_table over ledger transactions matching filters, e.g. Year=[2022].
+
+    Filtering, searching, sorting and paging all run in SQL, so only the
+    visible page is read out of the ledger. With a spend cube summed from
+    the same ledger state, the match count comes from its cells instead of
+    a COUNT over the ledger (while there is no search).
+    """
+    counted = cube is not None and cube.state == (ledger.revision(), ledger.watermark())
+
+    def fetch(sort_by, ascending, search, offset, size):
+        matches = cube.count(**filters) if counted and not search else None
+        return ledger.page(sort_by, ascending, search, search_columns, offset, size, matches, **filters)
+    _paged(fetch, key, list(columns), sort_by, ascending, {}, "transactions")
+
+
+def _paged(fetch, key, columns, sort_by, ascending, display, noun):
+    search_column, sort_column, order_column, size_column = st.columns([3, 2, 1, 1])
+    search = search_column.text_input("Search", key=f"{key}_search", on_change=_reset_page, args=(key,))
+    sort_by = sort_column.selectbox("Sort by", columns, index=columns.index(sort_by),
+        key=f"{key}_sort", on_change=_reset_page, args=(key,))
+    order = order_column.selectbox("Order", ["Descending", "Ascending"], index=0 if not ascending else 1,
+        key=f"{key}_order", on_change=_reset_page, args=(key,))
+    size = size_column.selectbox("Rows", PAGE_SIZES, key=f"{key}_size", on_change=_reset_page, args=(key,))
+
+    page_key = f"{key}_page"
+    page = st.session_state.get(page_key, 1)
+    with stage("load.page"):
+        rows, matches = fetch(sort_by, order == "Ascending", search.strip(), (page - 1) * size, size)
+        pages = max(1, -(-matches // size))
+        if page > pages:
+            st.session_state[page_key] = page = pages
+            rows, matches = fetch(sort_by, order == "Ascending", search.strip(), (page - 1) * size, size)
+
+    values = []
+    for name in columns:
+        column = rows[name]
+        if name in display:
+            column = display[name][rows.index.to_numpy()]
+        elif name == "Amount":
+            column = currency_column(column)
+        elif pd.api.types.is_datetime64_any_dtype(column):
+            column = column.dt.strftime("%Y-%m-%d")
+        values.append(column)
+
+    fig_table = go.Figure(data=go.Table(
+        header = dict(values=columns,
+            font=dict(color='white', size=16),
+            line_color="#222222",
+            fill_color = "#0083B8",
+            align = "left"),
+        cells = dict(values=values,
+            font=dict(color="#eeeeee", size=14),
+            height = ROW_HEIGHT,
+            line_color="#222222",
+            fill_color = "#444444",
+            align = "left")
+            ))
+    fig_table.update_layout(margin=dict(l=0,r=0,t=0,b=0), height=ROW_HEIGHT * (len(rows) + 2))
+    plotly_chart(st, fig_table, use_container_width=True, key=f"{key}_table")
+
+    page_column, count_column = st.columns([1, 3])
+    page_column.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    first = (page - 1) * size + 1 if matches else 0
+    count_column.caption(f"Showing {first:,}-{first + len(rows) - 1 if matches else 0:,} of {matches:,} {noun}")
@@ -0,0 +1,93 @@
+# Phuoc's Financial Dashboard - Typed Transactions
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.0
+# Changes:
+# v1.0 - validated spend_data frame with categorical text, small-int dates and integer cents
+#
+# The raw sheet keeps a Python string per cell of Account, Description,
+# Category and Tags, int64 Year/Month and a float Amount. The typed frame
+# stores the text as categoricals (decoded straight from the dictionary-
+# encoded snapshot when there is one), Year/Month as int16/int8 and the
+# amount as exact int64 cents in "Cents". Rows are in Date order, so a date
+# range is a slice: between() returns a view of the shared frame, not a copy.
+
+import numpy as np
+import pandas as pd
+
+from dashboard.data import cached, read_sheet
+
+SHEET = "spend_data"
+REQUIRED = ("Date", "Account", "Description", "Category", "Amount")
+TEXT_COLUMNS = ("Account", "Description", "Category", "Tags")
+COLUMNS = ["Date", "Month", "Year", "Month-Year", "Account", "Description", "Category", "Tags", "Cents"]
+
+
+def _category(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values
+    return values.astype("category")
+
+
+def _check(invalid, column):
+    if invalid.any():
+        raise ValueError(f"{SHEET}: {int(invalid.sum()):,} rows have an invalid {column}")
+
+
+def typed_transactions(df):
+    """spend_data rows (the sheet or a statement) as the typed frame with COLUMNS.
+
+    Month, Year, Month-Year and Tags are derived or left empty when the rows
+    do not have them. Raises ValueError for a missing column, a date or
+    amount that does not parse, or a month outside 1-12.
+    """
+    missing = [name for name in REQUIRED if name not in df]
+    if missing:
+        raise ValueError(f"{SHEET} is missing columns: {', '.join(missing)}")
+
+    dates = pd.to_datetime(df["Date"], errors="coerce")
+    _check(dates.isna(), "Date")
+    amounts = pd.to_numeric(df["Amount"], errors="coerce")
+    _check(amounts.isna(), "Amount")
+    month = pd.to_numeric(df["Month"], errors="coerce") if "Month" in df else dates.dt.month
+    _check(~month.between(1, 12), "Month")
+    year = pd.to_numeric(df["Year"], errors="coerce") if "Year" in df else dates.dt.year
+    _check(~year.between(1, 9999), "Year")
+    month_year = (pd.to_datetime(df["Month-Year"], errors="coerce") if "Month-Year" in df
+        else dates.dt.to_period("M").dt.to_timestamp())
+
+    frame = pd.DataFrame({
+        "Date": dates.to_numpy(),
+        "Month": month.to_numpy(dtype=np.int8),
+        "Year": year.to_numpy(dtype=np.int16),
+        "Month-Year": month_year.to_numpy(),
+        **{name: _category(df[name] if name in df else pd.Series(None, index=df.index, dtype=object)).array
+            for name in TEXT_COLUMNS},
+        "Cents": np.rint(amounts.to_numpy(dtype=float) * 100).astype(np.int64),
+    })
+    if not frame["Date"].is_monotonic_increasing:
+        frame = frame.sort_values("Date", kind="stable", ignore_index=True)
+    return frame
+
+
+def amounts(frame):
+    """Dollar amounts of a typed frame, as float64."""
+    return frame["Cents"].to_numpy() / 100
+
+
+def between(frame, start=None, end=None):
+    """Rows with start <= Date < end, as a slice (view) of frame."""
+    dates = frame["Date"].to_numpy()
+    lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), "left"))
+    hi = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), "left"))
+    return frame.iloc[lo:hi]
+
+
+def load_transactions(path=None):
+    """The workbook's spend_data as a typed frame, built once per workbook version.
+
+    Only the typed frame is cached; the raw sheet is dropped once converted.
+    """
+    def build(path, version):
+        return typed_transactions(read_sheet(SHEET, path, version, categories=TEXT_COLUMNS))
+    return cached(path, ("transactions",), build)
@@ -0,0 +1,110 @@
+# Phuoc's Financial Dashboard - Workbook Watcher
+# Created: October 18, 2026
+# Last Updated: October 18, 2026
+# Version: 1.0
+# Changes:
+# v1.0 - background thread that rebuilds the caches when the workbook is saved
+#
+# When the workbook changes, the watcher builds everything that was cached
+# for the old version again for the new one (sheets and their snapshots,
+# named ranges, the ledger sync, the spend cube) on its own thread, and only
+# then publishes the new version. Sessions keep reading the previous,
+# consistent version until the new one is warm.
+
+import logging
+import os
+import threading
+import time
+
+from dashboard import data
+
+INTERVAL = float(os.environ.get("DASHBOARD_WATCH_SECONDS", "2"))
+
+_log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_watchers = {}
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Watcher(threading.Thread):
+    def __init__(self, path, interval=INTERVAL):
+        super().__init__(name=f"workbook-watcher:{os.path.basename(path)}", daemon=True)
+        self.path = path
+        self.interval = interval
+        self.version = None
+        self.refreshed_at = None
+        self.refresh_seconds = None
+        self.error = None
+        self._seen = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        candidate = None
+        while not self._stop_event.is_set():
+            stat = _stat(self.path)
+            # Refresh once the file has looked the same for a whole interval,
+            # so a save in progress is not parsed half-written
+            if stat is not None and stat != self._seen and stat == candidate:
+                self.refresh(stat)
+            candidate = stat
+            self._stop_event.wait(self.interval if self._seen else 0.05)
+
+    def refresh(self, stat=None):
+        started = time.perf_counter()
+        try:
+            version = data.file_version(self.path)
+            if version != self.version:
+                data.rebuild(self.path, version)
+                with data.pending_version(self.path, version):
+                    from dashboard.cube import load_spend_cube
+
+                    data.load_sheet("data", self.path)
+                    load_spend_cube(self.path)
+                data.publish(self.path, version)
+                self.version = version
+                self.refreshed_at = time.time()
+                self.refresh_seconds = time.perf_counter() - started
+            self._seen = stat
+            self.error = None
+        except Exception as error:  # keep serving the last good version
+            self.error = f"{type(error).__name__}: {error}"
+            _log.exception("refreshing %s failed", self.path)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def status(self):
+        return {
+            "version": self.version,
+            "refreshed_at": self.refreshed_at,
+            "refresh_seconds": self.refresh_seconds,
+            "snapshot_age": None if self.refreshed_at is None else time.time() - self.refreshed_at,
+            "pending": self._seen is None or self._seen != _stat(self.path),
+            "error": self.error,
+        }
+
+
+def start_watcher(path=None, interval=INTERVAL):
+    """Start (once per workbook) the watcher thread; interval 0 disables it."""
+    if interval <= 0:
+        return None
+    path = os.path.abspath(path or data.WORKBOOK)
+    with _lock:
+        watcher = _watchers.get(path)
+        if watcher is None or not watcher.is_alive():
+            watcher = _watchers[path] = Watcher(path, interval)
+            watcher.start()
+    return watcher
+
+
+def watcher_status(path=None):
+    """Refresh duration and snapshot age of the workbook's watcher, or None if not watched."""
+    watcher = _watchers.get(os.path.abspath(path or data.WORKBOOK))
+    return None if watcher is None else watcher.status()
@@ -1,73 +1,108 @@
 # Phuoc's Financial Dashboard - Spending Details Page
 # Created: July 22, 2022
-# Last Updated: July 26, 2022
-# Version: 1.1
+# Last Updated: October 18, 2026
+# Version: 1.17
 # Changes:
 # v1.0 - added multi-page support
 # v1.1 - moved spending details to tabs instead of tables on the main page
+# v1.2 - read the workbook through the shared dashboard.data cache
+# v1.3 - answer totals, bar charts and treemaps from the spend cube
+# v1.4 - sidebar filters select detail rows through the bitmap filter index
+# v1.5 - paginated transaction tables that only send the visible rows
+# v1.6 - shared formatting; over-budget deltas show in red
+# v1.7 - figures come from the cross-session figure cache
+# v1.8 - transactions are queried from the SQLite ledger with filters pushed down
+# v1.9 - watch the workbook and pre-warm the caches in the background
+# v1.10 - stage timings and chart payloads via dashboard.instrument (?debug=1 panel)
+# v1.11 - reads the workbook of the household profile picked in the sidebar
+# v1.12 - tabs render only the open tab; each tab group reruns on its own as a fragment
+# v1.13 - style.css and hide-style block built once per process
+# v1.14 - budget metrics from the streaming budget tracker; budgets from the optional spend_budget
+#         sheet; month-end/year-end forecast with confidence bands and per-category burn rates
+# v1.15 - dropped the unused pandas import
+# v1.16 - transaction tables count their matches from the spend cube
+# v1.17 - imports grouped and sorted like the other pages
 
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import datetime
 
+import streamlit as st
+
+from dashboard.budget import CONFIDENCE, load_budget_tracker, load_budgets
+from dashboard.charts import bar_chart, treemap
+from dashboard.cube import load_spend_cube
+from dashboard.data import data_version
+from dashboard.figures import cached_figure
+from dashboard.formatting import currency, currency_column, delta, percent, percent_column
+from dashboard.instrument import finish_trace, fragment, plotly_chart, stage, start_trace
+from dashboard.ledger import load_ledger
+from dashboard.profiles import current_profile
+from dashboard.style import apply_style
+from dashboard.table import ledger_table, paginated_table
+from dashboard.watcher import start_watcher
+
 # emojis: https://www.webfx.com/tools/emoji-cheat-sheet/
 st.set_page_config(page_title="Spending Details",
 	page_icon=":dollar:",
 	layout="wide")
 
-with open('style.css') as f:
-    st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+apply_style()
+
+start_trace("Spending Details")
 
 currentDate = datetime.date.today()
 curr_year = currentDate.year
 curr_month = currentDate.month
 
-spend_data = pd.read_excel(io="Phuoc-Financial-Data.xlsx", sheet_name="spend_data", skiprows=0)
+profile = current_profile()
+start_watcher(profile.path)
+with stage("load"):
+    spend_ledger = load_ledger(profile.path)
+    spend_cube = load_spend_cube(profile.path)
+    budget_tracker = load_budget_tracker(profile.path)
+    budgets = load_budgets(profile.path)
+    version = (data_version(profile.path), spend_ledger.watermark())
 
 # YTD Budget
-monthly_budget = 7850
-ytd_budget = monthly_budget*curr_month
-ytd_spend = spend_data.loc[spend_data["Year"]==curr_year]
-mtd_spend = ytd_spend.loc[ytd_spend["Month"]==curr_month]
-mtd_spend_table = mtd_spend.copy()
-mtd_spend_table.loc[:, "Amount"] = mtd_spend_table["Amount"].map("${:,.2f}".format)
-#mtd_spend_table.Date.apply(lambda x: x.date())
-
-historical_spend_table = spend_data.copy()
-historical_spend_table.loc[:, "Amount"] = historical_spend_table["Amount"].map("${:,.2f}".format)
-
-mtd_spend_total = ytd_spend.loc[ytd_spend["Month"]==curr_month]["Amount"].sum()
-mtd_spend_variance = (mtd_spend_total-monthly_budget)*(-1)
-total_ytd_spend = ytd_spend["Amount"].sum()
-ytd_variance = (total_ytd_spend-ytd_budget)*(-1)
-ytd_monthly_average_spend = total_ytd_spend/curr_month
-ytd_monthly_average_spend_variance = (ytd_monthly_average_spend-monthly_budget)*(-1)
+with stage("transform"):
+    monthly_budget = budgets.total
+    ytd_budget = monthly_budget*curr_month
+
+    mtd_spend_total = budget_tracker.spent(curr_year, curr_month)
+    mtd_spend_variance = (mtd_spend_total-monthly_budget)*(-1)
+    total_ytd_spend = budget_tracker.spent(curr_year)
+    ytd_variance = (total_ytd_spend-ytd_budget)*(-1)
+    ytd_monthly_average_spend = total_ytd_spend/curr_month
+    ytd_monthly_average_spend_variance = (ytd_monthly_average_spend-monthly_budget)*(-1)
+
+    # MONTH-END / YEAR-END FORECAST
+    forecast = budget_tracker.forecast(currentDate, budgets)
 
 # ---- SIDEBAR ----
 st.sidebar.subheader("Historical Spend Filters:")
 year = st.sidebar.multiselect(
     "Year:",
-    options=spend_data["Year"].unique(),
-    default=spend_data["Year"].unique()
+    options=spend_cube.values("Year"),
+    default=spend_cube.values("Year")
 )
 
 month = st.sidebar.multiselect(
     "Month:",
-    options=spend_data["Month"].unique(),
-    default=spend_data["Month"].unique(),
+    options=spend_cube.values("Month"),
+    default=spend_cube.values("Month"),
 )
 
 category = st.sidebar.multiselect(
     "Category:",
-    options=spend_data["Category"].unique(),
-    default=spend_data["Category"].unique()
+    options=spend_cube.values("Category"),
+    default=spend_cube.values("Category")
 )
 
-df_selection = spend_data.query(
-    "Year == @year & Month ==@month & Category == @category"
-)
+# Only filters that exclude something are sent to the ledger
+historical_filters = {
+    name: selected
+    for name, selected in (("Year", year), ("Month", month), ("Category", category))
+    if len(selected) < len(spend_cube.values(name))
+}
 # ---- SIDEBAR ----
 
 # ---- MAINPAGE ----
@@ -79,144 +114,132 @@ left_column, middle_column, right_column = st.columns(3)
 with left_column:
     st.subheader("YTD Spend")
     #st.write("Left Subheader")
-    st.metric("", "${:,.2f}".format(total_ytd_spend), "${:,.2f}".format(-ytd_variance))
+    st.metric("", currency(total_ytd_spend), delta(-ytd_variance), delta_color="inverse")
 with middle_column:
     st.subheader("MTD Spend")
-    st.metric("", "${:,.2f}".format(mtd_spend_total), "${:,.2f}".format(-mtd_spend_variance))
+    st.metric("", currency(mtd_spend_total), delta(-mtd_spend_variance), delta_color="inverse")
 with right_column:
     st.subheader("Monthly Average")
-    st.metric("", "${:,.2f}".format(ytd_monthly_average_spend), "${:,.2f}".format(-ytd_monthly_average_spend_variance))
+    st.metric("", currency(ytd_monthly_average_spend), delta(-ytd_monthly_average_spend_variance), delta_color="inverse")
 # METRICS
 
 st.markdown("##")
 
+### BUDGET FORECAST ###
+@fragment("Spending Details: Budget Forecast")
+def budget_forecast():
+    st.subheader("Budget Forecast")
+    projected = forecast.total
+    band = f"{round(CONFIDENCE * 100)}% range"
+    left_column, middle_column, right_column = st.columns(3)
+    with left_column:
+        st.metric("Projected Month-End", currency(projected["Month-End"]),
+            delta(projected["Month-End"] - monthly_budget), delta_color="inverse")
+        st.caption(f"{band}: {currency(projected['Month-End Low'])} to {currency(projected['Month-End High'])}")
+    with middle_column:
+        st.metric("Projected Year-End", currency(projected["Year-End"]),
+            delta(projected["Year-End"] - monthly_budget*12), delta_color="inverse")
+        st.caption(f"{band}: {currency(projected['Year-End Low'])} to {currency(projected['Year-End High'])}")
+    with right_column:
+        st.metric("Budget Burn Rate", percent(round(projected["Burn Rate"]*100, 1)),
+            help="Share of the monthly budget spent per share of the month gone; over 100% runs over before month end.")
+
+    with stage("transform"):
+        categories = forecast.categories.reset_index()
+        categories_display = {name: currency_column(categories[name])
+            for name in ("Spent", "Budget", "Month-End", "Month-End Low", "Month-End High",
+                "YTD", "Year-End", "Year-End Low", "Year-End High")}
+        categories_display["Burn Rate"] = percent_column(categories["Burn Rate"] * 100, 1)
+    paginated_table(categories, "budget_forecast", columns=["Category"] + list(categories_display),
+        search_columns=["Category"], sort_by="Month-End", display=categories_display, noun="categories")
+
+budget_forecast()
+### BUDGET FORECAST ###
+
+st.markdown("##")
+
 ### CURRENT MONTH SPENDING ###
-monthly_tab1, monthly_tab2 = st.tabs(["Current Month Spend", "Current Month Spend Details"])
-
-with monthly_tab1:
-    st.subheader("Current Month Spend")
-    # CURRENT MONTH SPEND BY CATEGORY [TREEMAP CHART]
-    fig_mtd_spend_by_cateogry = px.treemap(mtd_spend, path=["Category"],
-                     values="Amount",title="")
-    fig_mtd_spend_by_cateogry.data[0].textinfo = "label+text+value+percent root"
-
-    fig_mtd_spend_by_cateogry.update_layout(margin=dict(l=0,r=0,t=0,b=0))
-
-    st.plotly_chart(fig_mtd_spend_by_cateogry, use_container_width=True)
-    # CURRENT MONTH SPEND BY CATEGORY [TREEMAP CHART]
-
-with monthly_tab2:
-    st.subheader("Current Month Spend Details")
-    # ---- MTD SPEND TABLE ----
-    fig_monthly_spend_table = go.Figure(data=go.Table(
-        header = dict(values=list(mtd_spend_table[["Date", "Account", "Description", "Category","Amount"]].columns),
-            font=dict(color='white', size=16),
-            line_color="#222222",
-            fill_color = "#0083B8",
-            align = "left"),
-        cells = dict(values=[mtd_spend_table.Date, mtd_spend_table.Account, mtd_spend_table.Description, mtd_spend_table.Category, mtd_spend_table.Amount],
-            font=dict(color="#eeeeee", size=14),
-            height = 30,
-            line_color="#222222",
-            fill_color = "#444444",
-            align = "left")
-            ))
-    fig_monthly_spend_table.update_layout(margin=dict(l=0,r=0,t=0,b=0))
-    # ---- MTD SPEND TABLE ----
-
-    st.plotly_chart(fig_monthly_spend_table, use_container_width=True)
+@fragment("Spending Details: Current Month")
+def current_month_spending():
+    monthly_tab1, monthly_tab2 = st.tabs(["Current Month Spend", "Current Month Spend Details"],
+        key="monthly_tabs", on_change="rerun")
+
+    if monthly_tab1.open:
+        with monthly_tab1:
+            st.subheader("Current Month Spend")
+            # CURRENT MONTH SPEND BY CATEGORY [TREEMAP CHART]
+            fig_mtd_spend_by_cateogry = cached_figure("mtd_spend_by_category",
+                lambda: treemap(spend_cube.by(["Category"], Year=[curr_year], Month=[curr_month]).reset_index(), ["Category"], "Amount"),
+                version, year=curr_year, month=curr_month)
+            plotly_chart(st, fig_mtd_spend_by_cateogry, use_container_width=True, key="mtd_spend_by_category")
+            # CURRENT MONTH SPEND BY CATEGORY [TREEMAP CHART]
+
+    if monthly_tab2.open:
+        with monthly_tab2:
+            st.subheader("Current Month Spend Details")
+            # ---- MTD SPEND TABLE ----
+            ledger_table(spend_ledger, key="mtd_spend", cube=spend_cube, Year=[curr_year], Month=[curr_month])
+            # ---- MTD SPEND TABLE ----
+
+current_month_spending()
 ### CURRENT MONTH SPENDING ###
 
 ### CURRENT YEAR SPENDING ###
-yearly_tab1, yearly_tab2 = st.tabs(["YTD Monthly Spend", "YTD Spend by Category"])
-
-with yearly_tab1:
-    st.subheader("Current Year Spend")
-    # SPEND BY MONTH [BAR CHART]
-    spend_by_month = ytd_spend.groupby(by=["Month"]).sum()[["Amount"]]
-    fig_monthly_spend = px.bar(
-        spend_by_month,
-        x=spend_by_month.index,
-        y="Amount",
-        title="",
-        color_discrete_sequence=["#0083B8"] * len(spend_by_month),
-        template="plotly_white",
-    )
-    fig_monthly_spend.update_layout(
-        xaxis=dict(tickmode="linear"),
-        plot_bgcolor="rgba(0,0,0,0)",
-        yaxis=(dict(showgrid=False)),
-    )
-    fig_monthly_spend.update_layout(margin=dict(l=0,r=0,t=0,b=0))
-    st.plotly_chart(fig_monthly_spend, use_container_width=True)
-
-with yearly_tab2:
-    st.subheader("Current Year Spend by Category")
-    # SPEND BY CATEGORY [TREEMAP CHART]
-    fig_spend_by_cateogry = px.treemap(ytd_spend, path=["Category"],
-                     values="Amount",title="")
-    fig_spend_by_cateogry.data[0].textinfo = "label+text+value+percent root"
-    fig_spend_by_cateogry.update_layout(margin=dict(l=0,r=0,t=0,b=0))
-    st.plotly_chart(fig_spend_by_cateogry, use_container_width=True)
+@fragment("Spending Details: Current Year")
+def current_year_spending():
+    yearly_tab1, yearly_tab2 = st.tabs(["YTD Monthly Spend", "YTD Spend by Category"],
+        key="yearly_tabs", on_change="rerun")
+
+    if yearly_tab1.open:
+        with yearly_tab1:
+            st.subheader("Current Year Spend")
+            # SPEND BY MONTH [BAR CHART]
+            fig_monthly_spend = cached_figure("monthly_spend",
+                lambda: bar_chart(spend_cube.by(["Month"], Year=[curr_year])[["Amount"]]),
+                version, year=curr_year)
+            plotly_chart(st, fig_monthly_spend, use_container_width=True, key="monthly_spend")
+
+    if yearly_tab2.open:
+        with yearly_tab2:
+            st.subheader("Current Year Spend by Category")
+            # SPEND BY CATEGORY [TREEMAP CHART]
+            fig_spend_by_cateogry = cached_figure("ytd_spend_by_category",
+                lambda: treemap(spend_cube.by(["Category"], Year=[curr_year]).reset_index(), ["Category"], "Amount"),
+                version, year=curr_year)
+            plotly_chart(st, fig_spend_by_cateogry, use_container_width=True, key="ytd_spend_by_category")
+
+current_year_spending()
 ### CURRENT YEAR SPENDING ###
 
 ### HISTORICAL SPEND ###
-historical_tab1, historical_tab2 = st.tabs(["Spend by Year", "Detailed Historical Spend"])
-
-with historical_tab1:
-    st.subheader("Spend by Year")
-    # SPEND BY YEAR [BAR CHART]
-    spend_by_year = df_selection.groupby(by=["Year"]).sum()[["Amount"]]
-    fig_yearly_spend = px.bar(
-        spend_by_year,
-        x=spend_by_year.index,
-        y="Amount",
-        title="",
-        color_discrete_sequence=["#0083B8"] * len(spend_by_year),
-        template="plotly_white",
-    )
-    fig_yearly_spend.update_layout(
-        xaxis=dict(tickmode="linear"),
-        plot_bgcolor="rgba(0,0,0,0)",
-        yaxis=(dict(showgrid=False)),
-    )
-    fig_yearly_spend.update_layout(margin=dict(l=0,r=0,t=0,b=0))
-
-    st.plotly_chart(fig_yearly_spend, use_container_width=True)
-
-with historical_tab2:
-    st.subheader("Historical Spend Details")
-    # ---- HISTORICAL SPEND TABLE ----
-    fig_historical_spend_table = go.Figure(data=go.Table(
-        header = dict(values=list(historical_spend_table[["Date", "Account", "Description", "Category","Amount"]].columns),
-            font=dict(color='white', size=16),
-            line_color="#222222",
-            fill_color = "#0083B8",
-            align = "left"),
-        cells = dict(values=[historical_spend_table.Date, historical_spend_table.Account, historical_spend_table.Description, historical_spend_table.Category, historical_spend_table.Amount],
-            font=dict(color="#eeeeee", size=14),
-            height = 30,
-            line_color="#222222",
-            fill_color = "#444444",
-            align = "left")
-            ))
-    fig_historical_spend_table.update_layout(margin=dict(l=0,r=0,t=0,b=0))
-    # ---- HISTORICAL SPEND TABLE ----
-
-    st.plotly_chart(fig_historical_spend_table, use_container_width=True)
+# The sidebar filters live outside the fragment, so changing them reruns the page
+@fragment("Spending Details: Historical")
+def historical_spending():
+    historical_tab1, historical_tab2 = st.tabs(["Spend by Year", "Detailed Historical Spend"],
+        key="historical_tabs", on_change="rerun")
+
+    if historical_tab1.open:
+        with historical_tab1:
+            st.subheader("Spend by Year")
+            # SPEND BY YEAR [BAR CHART]
+            fig_yearly_spend = cached_figure("yearly_spend",
+                lambda: bar_chart(spend_cube.by(["Year"], Year=year, Month=month, Category=category)[["Amount"]]),
+                version, year=year, month=month, category=category)
+            plotly_chart(st, fig_yearly_spend, use_container_width=True, key="yearly_spend")
+
+    if historical_tab2.open:
+        with historical_tab2:
+            st.subheader("Historical Spend Details")
+            # ---- HISTORICAL SPEND TABLE ----
+            ledger_table(spend_ledger, key="historical_spend", cube=spend_cube, **historical_filters)
+            # ---- HISTORICAL SPEND TABLE ----
+
+historical_spending()
+### HISTORICAL SPEND ###
 
 st.markdown("##")
 st.markdown("##")
 st.write("© Copyright 2022 Phuoc Le.  All rights reserved.")
 # ---- MAINPAGE ----
 
-# ---- HIDE STREAMLIT STYLE ----
-hide_st_style = """
-            <style>
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            header {visibility: hidden;}
-            </style>
-            """
-st.markdown(hide_st_style, unsafe_allow_html=True)
-# ---- HIDE STREAMLIT STYLE ----
\ No newline at end of file
+finish_trace()
\ No newline at end of file
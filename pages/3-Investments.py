@@ -1,23 +1,54 @@
 # Phuoc's Financial Dashboard - Investments Page
 # Created: July 22, 2022
-# Last Updated: July 26, 2022
-# Version: 1.1
+# Last Updated: October 18, 2026
+# Version: 1.16
 # Changes:
 # v1.0 - added multi-page support
 # v1.1 - separated asset allocation and sector allocation into tabs
+# v1.2 - read the workbook through the shared dashboard.data cache
+# v1.3 - load only the named ranges this page uses
+# v1.4 - shared currency/percent formatting
+# v1.5 - figures come from the cross-session figure cache
+# v1.6 - watch the workbook and pre-warm the caches in the background
+# v1.7 - stage timings and chart payloads via dashboard.instrument (?debug=1 panel)
+# v1.8 - holdings treemap drills down asset class > sector > account > holding,
+#        largest N per level with the rest folded into "Other"
+# v1.9 - TWR and XIRR by account, broker, holding or asset class from the performance sheet
+# v1.10 - reads the workbook of the household profile picked in the sidebar
+# v1.11 - allocation tabs render only the open tab; holdings and performance rerun on their own as fragments
+# v1.12 - style.css and hide-style block built once per process
+# v1.13 - holdings and portfolio value revalued at live quotes when DASHBOARD_QUOTES is set,
+#         never waiting on them; metrics and holdings look for newer quotes on a timer
+# v1.14 - dropped the unused pandas import
+# v1.15 - a performance sheet with a single valuation date shows that date instead of a period slider
+# v1.16 - imports grouped and sorted like the other pages
 
-import streamlit as st
-import pandas as pd
-import plotly.express as px
 import datetime
 
+import streamlit as st
+
+from dashboard.charts import nodes_treemap, pie_chart, treemap
+from dashboard.data import data_version
+from dashboard.figures import cached_figure
+from dashboard.formatting import currency, currency_column, percent, percent_column
+from dashboard.holdings import LEVELS, TOP_N, holding_symbols, load_hierarchy
+from dashboard.instrument import finish_trace, fragment, plotly_chart, stage, start_trace
+from dashboard.performance import GROUPS, HISTORY_COLUMNS, load_history, performance
+from dashboard.pricing import REFRESH_SECONDS, live_quotes, quote_service
+from dashboard.profiles import current_profile
+from dashboard.schema import load_ranges
+from dashboard.style import apply_style
+from dashboard.table import paginated_table
+from dashboard.watcher import start_watcher
+
 # emojis: https://www.webfx.com/tools/emoji-cheat-sheet/
 st.set_page_config(page_title="Investments",
 	page_icon=":chart_with_upwards_trend:",
 	layout="wide")
 
-with open('style.css') as f:
-    st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+apply_style()
+
+start_trace("Investments")
 
 # Set up some date variables for later use
 currentDate = datetime.date.today()
@@ -25,28 +56,42 @@ curr_year = currentDate.year
 curr_month = currentDate.month
 
 # Read in data from Excel
-data_df = pd.read_excel(io="Phuoc-Financial-Data.xlsx", sheet_name="data", skiprows=0)
+profile = current_profile()
+start_watcher(profile.path)
+with stage("load"):
+    version = data_version(profile.path)
+    data = load_ranges([
+        "total_investments", "ytd_earnings", "ytd_contributions", "ytd_performance", "ytd_dividends",
+        "asset_allocation", "sector_allocation", "brokers", "accounts",
+    ], profile.path)
+    hierarchy = load_hierarchy(profile.path)
+    history = load_history(profile.path)
 
 # METRICS
-total_investments = data_df.iloc[5,1]
-ytd_earnings = data_df.iloc[68,1]
-ytd_contributions = data_df.iloc[65,1]
-ytd_portfolio_performance = round(data_df.iloc[67,1]*100,2)
-ytd_dividends = data_df.iloc[66,1]
-
-# PORTFOLIO ALLOCATIONS & HOLDINGS TREEMAP CHART DATAFRAMES
-asset_allocation = data_df.iloc[54:61]
-asset_allocation.columns = ["Asset", "Amount"]
-sector_allocation = data_df.iloc[69:79]
-sector_allocation.columns = ["Sector", "Amount"]
-holdings = data_df.iloc[79:104]
-holdings.columns = ["Investment", "Amount"]
-
-# BROKERS AND ACCOUNTS DATAFRAMES
-brokers_df = data_df.iloc[44:48]
-brokers_df.columns = ["Broker", "Amount"]
-accounts_df = data_df.iloc[48:54]
-accounts_df.columns = ["Account", "Amount"]
+with stage("transform"):
+    total_investments = data["total_investments"]
+    ytd_earnings = data["ytd_earnings"]
+    ytd_contributions = data["ytd_contributions"]
+    ytd_portfolio_performance = round(data["ytd_performance"]*100,2)
+    ytd_dividends = data["ytd_dividends"]
+
+    # PORTFOLIO ALLOCATIONS TREEMAP CHART DATAFRAMES
+    asset_allocation = data["asset_allocation"]
+    sector_allocation = data["sector_allocation"]
+
+    # BROKERS AND ACCOUNTS DATAFRAMES
+    brokers_df = data["brokers"]
+    accounts_df = data["accounts"]
+
+# LIVE QUOTES
+# Sections showing holding values rerun every REFRESH_SECONDS to pick up the
+# quotes fetched in the background since; without a quote source they don't.
+quotes_refresh = REFRESH_SECONDS if quote_service() is not None else None
+
+def valuation():
+    # cached quotes only (None without a quote source), and the tree valued at them
+    quotes = live_quotes(holding_symbols(profile.path))
+    return quotes, load_hierarchy(profile.path, quotes)
 
 # ---- SIDEBAR ----
 # ---- SIDEBAR ----
@@ -55,93 +100,142 @@ accounts_df.columns = ["Account", "Amount"]
 st.title(":chart_with_upwards_trend: Investments")
 st.markdown("##")
 
-column_1, column_2, column_3, column_4, column_5 = st.columns(5)
-with column_1:
-    st.subheader("Portfolio Value")
-    st.metric("", "${:,.2f}".format(total_investments))
-with column_2:
-    st.subheader("Gain/Loss")
-    st.metric("", "${:,.2f}".format(ytd_earnings))
-with column_3:
-    st.subheader("YTD Performance")
-    st.metric("", "{}%".format(ytd_portfolio_performance))
-with column_4:
-    st.subheader("Contributions")
-    st.metric("", "${:,.2f}".format(ytd_contributions))
-with column_5:
-    st.subheader("Dividends")
-    st.metric("", "${:,.2f}".format(ytd_dividends))
+# METRICS
+@fragment("Investments: Metrics", run_every=quotes_refresh)
+def metrics():
+    with stage("load"):
+        quotes, live_hierarchy = valuation()
+    # holdings repriced since the workbook was saved move the portfolio total with them
+    revaluation = live_hierarchy.total - hierarchy.total
+
+    column_1, column_2, column_3, column_4, column_5 = st.columns(5)
+    with column_1:
+        st.subheader("Portfolio Value")
+        st.metric("", currency(total_investments + revaluation),
+            delta=currency(revaluation) if quotes and quotes.prices else None)
+    with column_2:
+        st.subheader("Gain/Loss")
+        st.metric("", currency(ytd_earnings))
+    with column_3:
+        st.subheader("YTD Performance")
+        st.metric("", percent(ytd_portfolio_performance))
+    with column_4:
+        st.subheader("Contributions")
+        st.metric("", currency(ytd_contributions))
+    with column_5:
+        st.subheader("Dividends")
+        st.metric("", currency(ytd_dividends))
+
+    if quotes is not None and quotes.prices:
+        as_of = datetime.datetime.fromtimestamp(quotes.as_of)
+        st.caption(f"Live prices for {len(quotes.prices)} of {quotes.symbols} holdings as of {as_of:%b %d, %I:%M %p}; "
+            "the change is against the workbook's values.")
+    elif quotes is not None:
+        st.caption("Waiting for live prices; showing the workbook's values.")
+
+metrics()
+# METRICS
 
 st.markdown("##")
 
-allocation_tab1, allocation_tab2 = st.tabs(["Asset Allocation", "Sector Allocation"])
-
-with allocation_tab1:
-    st.subheader("Asset Allocation")
-    # ASSET ALLOCATION [TREEMAP CHART]
-    fig_asset_allocation = px.treemap(asset_allocation, path=["Asset"],
-                     values="Amount",title="")
-    fig_asset_allocation.data[0].textinfo = "label+text+value+percent root"
-
-    fig_asset_allocation.update_layout(margin=dict(l=0,r=0,t=0,b=0))
-
-    st.plotly_chart(fig_asset_allocation, use_container_width=True)
-
-with allocation_tab2:
-    st.subheader("Sector Allocation")
-    # SECTOR ALLOCATION [TREEMAP CHART]
-    fig_sector_allocation = px.treemap(sector_allocation, path=["Sector"],
-                     values="Amount",title="")
-    fig_sector_allocation.data[0].textinfo = "label+text+value+percent root"
-
-    fig_sector_allocation.update_layout(margin=dict(l=0,r=0,t=0,b=0))
-    st.plotly_chart(fig_sector_allocation, use_container_width=True)
+# ALLOCATION TABS
+@fragment("Investments: Allocation")
+def allocation():
+    allocation_tab1, allocation_tab2 = st.tabs(["Asset Allocation", "Sector Allocation"],
+        key="allocation_tabs", on_change="rerun")
+
+    if allocation_tab1.open:
+        with allocation_tab1:
+            st.subheader("Asset Allocation")
+            # ASSET ALLOCATION [TREEMAP CHART]
+            fig_asset_allocation = cached_figure("asset_allocation",
+                lambda: treemap(asset_allocation, ["Asset"], "Amount"), version)
+            plotly_chart(st, fig_asset_allocation, use_container_width=True, key="asset_allocation")
+
+    if allocation_tab2.open:
+        with allocation_tab2:
+            st.subheader("Sector Allocation")
+            # SECTOR ALLOCATION [TREEMAP CHART]
+            fig_sector_allocation = cached_figure("sector_allocation",
+                lambda: treemap(sector_allocation, ["Sector"], "Amount"), version)
+            plotly_chart(st, fig_sector_allocation, use_container_width=True, key="sector_allocation")
+
+allocation()
+# ALLOCATION TABS
 
 # BROKERAGE FIRMS & ACCOUNTS
 # BROKER PIE CHART
-fig_brokers = px.pie(brokers_df,
-    title = "Brokerage Firms",
-    names = "Broker",
-    values = "Amount",
-)
-fig_brokers.update_layout(margin=dict(l=0,r=0,t=25,b=0))
+fig_brokers = cached_figure("brokers",
+    lambda: pie_chart(brokers_df, "Broker", "Amount", "Brokerage Firms"), version)
 
 # ACCOUNT PIE CHART
-fig_accounts = px.pie(accounts_df,
-    title = "Accounts",
-    names = "Account",
-    values = "Amount",
-)
-fig_accounts.update_layout(margin=dict(l=0,r=0,t=25,b=0))
+fig_accounts = cached_figure("accounts",
+    lambda: pie_chart(accounts_df, "Account", "Amount", "Accounts"), version)
 
 st.subheader("Brokerage Firms & Accounts")
 left_column, right_column = st.columns(2)
-left_column.plotly_chart(fig_brokers, use_container_width=True)
-right_column.plotly_chart(fig_accounts, use_container_width=True)
+plotly_chart(left_column, fig_brokers, use_container_width=True, key="brokers")
+plotly_chart(right_column, fig_accounts, use_container_width=True, key="accounts")
 
 # HOLDINGS
-# HOLDINGS [TREEMAP CHART]
-fig_holdings = px.treemap(holdings, path=["Investment"],
-                 values="Amount",title="")
-fig_holdings.data[0].textinfo = "label+text+value+percent root"
-
-fig_holdings.update_layout(margin=dict(l=0,r=0,t=0,b=0))
+@fragment("Investments: Holdings", run_every=quotes_refresh)
+def holdings():
+    st.subheader("Portfolio Holdings")
+    with stage("load"):
+        quotes, live_hierarchy = valuation()
+
+    # Drill down one level at a time; each choice narrows the treemap below it
+    holdings_path = ()
+    for level, column in zip(LEVELS[:-1], st.columns(len(LEVELS) - 1)):
+        options = list(live_hierarchy.children(holdings_path).index)
+        choice = column.selectbox(level, ["All"] + options, key="holdings/" + "/".join(holdings_path + (level,)))
+        if choice == "All":
+            break
+        holdings_path += (choice,)
+
+    # HOLDINGS [TREEMAP CHART]
+    fig_holdings = cached_figure("holdings", lambda: nodes_treemap(live_hierarchy.view(holdings_path, TOP_N)),
+        version, path=holdings_path, top_n=TOP_N, quotes=quotes.generation if quotes and quotes.prices else None)
+    plotly_chart(st, fig_holdings, use_container_width=True, key="holdings")
+
+holdings()
+# HOLDINGS
 
-st.subheader("Portfolio Holdings")
-st.plotly_chart(fig_holdings, use_container_width=True)
+# PERFORMANCE
+@fragment("Investments: Performance")
+def portfolio_performance():
+    st.subheader("Performance")
+    if history is None:
+        st.caption(f"Add a performance sheet ({', '.join(HISTORY_COLUMNS)}) to the workbook "
+            "to see time-weighted and money-weighted returns by account, broker, holding or asset class.")
+    else:
+        first_date = history["Date"].min().to_pydatetime()
+        last_date = history["Date"].max().to_pydatetime()
+        year_start = max(first_date, datetime.datetime(last_date.year, 1, 1))
+        group_column, range_column = st.columns([1, 3])
+        performance_by = group_column.selectbox("Group by", list(GROUPS), key="performance_by")
+        if first_date < last_date:
+            performance_start, performance_end = range_column.slider("Period", min_value=first_date,
+                max_value=last_date, value=(year_start, last_date), format="MMM YYYY", key="performance_period")
+        else:
+            # one valuation date leaves no period to pick
+            performance_start = performance_end = last_date
+            range_column.caption(f"Period: {last_date:%B %Y}")
+
+        with stage("transform"):
+            returns = performance(history, performance_by, performance_start, performance_end).reset_index()
+            returns_display = {name: currency_column(returns[name])
+                for name in ("Start Value", "Flows", "End Value", "Gain")}
+            returns_display.update({name: percent_column(returns[name] * 100) for name in ("TWR", "XIRR")})
+        paginated_table(returns, "performance", columns=[performance_by] + list(returns_display),
+            search_columns=[performance_by], sort_by="End Value", display=returns_display, noun="rows")
+
+portfolio_performance()
+# PERFORMANCE
 
 st.markdown("##")
 st.markdown("##")
 st.write("© Copyright 2022 Phuoc Le.  All rights reserved.")
 # ---- MAINPAGE ----
 
-# ---- HIDE STREAMLIT STYLE ----
-hide_st_style = """
-            <style>
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            header {visibility: hidden;}
-            </style>
-            """
-st.markdown(hide_st_style, unsafe_allow_html=True)
-# ---- HIDE STREAMLIT STYLE ----
+finish_trace()
@@ -1,114 +1,135 @@
 # Phuoc's Financial Dashboard - Retirement Plan Page
 # Created: July 22, 2022
-# Last Updated: July 27, 2022
-# Version: 1.1
+# Last Updated: October 18, 2026
+# Version: 1.14
 # Changes:
 # v1.0 - added multi-page support
 # v1.1 - added Retirement Fund Balance assumptions tab
 # v1.1 - added Retirement Asset Allocation
+# v1.2 - read the workbook through the shared dashboard.data cache
+# v1.3 - load only the named ranges this page uses
+# v1.4 - shared currency/percent formatting
+# v1.5 - figures come from the cross-session figure cache
+# v1.6 - Monte Carlo tab with success probability and percentile bands
+# v1.7 - what-if sliders recompute the projection and metrics in closed form
+# v1.8 - watch the workbook and pre-warm the caches in the background
+# v1.9 - stage timings and chart payloads via dashboard.instrument (?debug=1 panel)
+# v1.10 - reads the workbook of the household profile picked in the sidebar
+# v1.11 - tabs render only the open tab (the Monte Carlo runs only when its tab is open) as a fragment
+# v1.12 - style.css and hide-style block built once per process
+# v1.13 - slider ranges widen to take any workbook value; ages count from the workbook's birth year
+# v1.14 - retirement date reads "Never" when the plan never reaches the fund needed
 
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
-import xlrd
+
+from dashboard.charts import NO_MARGIN, area_chart, band_chart, info_table, pie_chart, treemap
+from dashboard.data import data_version
+from dashboard.figures import cached_figure
+from dashboard.formatting import currency, percent
+from dashboard.instrument import finish_trace, fragment, plotly_chart, stage, start_trace
+from dashboard.montecarlo import Assumptions, cached_simulation
+from dashboard.planner import Baseline, Plan, load_birth_year, project
+from dashboard.profiles import current_profile
+from dashboard.schema import load_ranges
+from dashboard.style import apply_style
+from dashboard.watcher import start_watcher
 
 # emojis: https://www.webfx.com/tools/emoji-cheat-sheet/
 st.set_page_config(page_title="Retirement Plan",
 	page_icon=":sunny:",
 	layout="wide")
 
-with open('style.css') as f:
-    st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+apply_style()
+
+start_trace("Retirement Plan")
 
 # Read in Excel data file
-data_df = pd.read_excel(io="Phuoc-Financial-Data.xlsx", sheet_name="data", skiprows=0)
-
-# Set up metrics
-total_investments = data_df.iloc[5,1]
-networth_change = data_df.iloc[2,1]*(-1)
-retirement_score = "{}%".format(data_df.iloc[15,1])
-retirement_date_serial = data_df.iloc[18,1]
-retirement_value = data_df.iloc[110,1]
-monthly_income = data_df.iloc[14,1]
-
-# Calling the xldate_as_datetime() function to
-# convert the specified excel serial date into
-# datetime.datetime object
-retirement_date = xlrd.xldate_as_datetime(retirement_date_serial, 0)
-retirement_date = retirement_date.strftime("%B %d, %Y")
-
-# Retirement Fund Growth
-retirement_fund = data_df.iloc[range(110, 155, 1),:]
-retirement_fund.rename(columns = {list(retirement_fund)[0]: 'Year'}, inplace = True)
-retirement_fund.rename(columns = {list(retirement_fund)[1]: 'Amount'}, inplace = True)
+profile = current_profile()
+start_watcher(profile.path)
+with stage("load"):
+    version = data_version(profile.path)
+    data = load_ranges([
+        "current_month", "total_investments", "retirement_budget", "retirement_federal_taxes",
+        "retirement_state_taxes", "retirement_start", "retirement_projection", "investment_growth_rate",
+        "inflation", "safe_withdrawal_rate", "social_security_amount", "social_security_year", "annual_spend",
+        "annual_contribution", "retirement_budget_categories", "retirement_allocation",
+    ], profile.path)
+    birth_year = load_birth_year(profile.path)
+
+baseline = Baseline(
+    current_month=pd.Timestamp(data["current_month"]).to_pydatetime(),
+    total_investments=data["total_investments"],
+    retirement_taxes=data["retirement_federal_taxes"] + data["retirement_state_taxes"],
+    retirement_budget=data["retirement_budget"],
+    social_security_amount=data["social_security_amount"],
+    horizon_years=len(data["retirement_projection"]),
+    birth_year=birth_year,
+)
+
+# ---- SIDEBAR ----
+# What-if sliders start at the workbook's assumptions
+def what_if(label, low, high, value, step=None):
+    # Widen the range to take the workbook's value, which Streamlit rejects outside it
+    return st.sidebar.slider(label, min(low, value), max(high, value), value, step)
+
+
+st.sidebar.header("What If:")
+plan = Plan(
+    growth_rate=what_if("Investment Growth Rate (%)", 0.0, 15.0, data["investment_growth_rate"] * 100, 0.25) / 100,
+    inflation=what_if("Inflation (%)", 0.0, 10.0, data["inflation"] * 100, 0.25) / 100,
+    withdrawal_rate=what_if("Safe Withdrawal Rate (%)", 2.0, 8.0, data["safe_withdrawal_rate"] * 100, 0.1) / 100,
+    monthly_contribution=what_if("Monthly Contribution", 0.0, 20000.0, data["annual_contribution"] / 12, 50.0),
+    retirement_age=what_if("Retirement Age", 40, 80, pd.Timestamp(data["retirement_start"]).year - birth_year),
+    social_security_age=what_if("Social Security Age", 62, 70, int(data["social_security_year"]) - birth_year),
+)
+# ---- SIDEBAR ----
+
+with stage("transform"):
+    projection = project(baseline, plan)
+
+    # Set up metrics
+    total_investments = data["total_investments"]
+    retirement_score = percent(projection.score)
+    retirement_value = projection.balances[0]
+    monthly_income = data["retirement_budget"]
+    retirement_date = (projection.retirement_date.strftime("%B %d, %Y")
+        if projection.retirement_date is not None else "Never")
+
+    # Retirement Fund Growth
+    retirement_fund = pd.DataFrame({"Year": projection.years, "Amount": projection.balances})
 
 # Retirement Fund Assumptions
-investment_growth = data_df.iloc[7,1] * 100
-inflation = data_df.iloc[107,1] * 100
-safe_withdrawal_rate = data_df.iloc[6,1] * 100
-social_security_income = data_df.iloc[109,1]
-social_security_age = data_df.iloc[108,1] - 1975
-
-gross_annual_income = data_df.iloc[106,1]
-net_monthly_income = data_df.iloc[14,1]
+investment_growth = plan.growth_rate * 100
+inflation = plan.inflation * 100
+safe_withdrawal_rate = plan.withdrawal_rate * 100
+social_security_income = data["social_security_amount"]
+social_security_age = plan.social_security_age
+
+gross_annual_income = data["annual_spend"]
+net_monthly_income = data["retirement_budget"]
 net_annual_income = net_monthly_income * 12
 income_taxes = gross_annual_income - net_annual_income
 
 assumptions1 = {
   "assumptions": ["Investment Growth Rate:", "Inflation:", "Safe Withdrawal Rate:", "Social Security Income:", "Social Security Age:"],
-  "amount": ["{}%".format(investment_growth), "{}%".format(inflation), "{}%".format(safe_withdrawal_rate), "${:,.2f}".format(social_security_income), social_security_age]
+  "amount": [percent(investment_growth, 2), percent(inflation, 2), percent(safe_withdrawal_rate, 2), currency(social_security_income), social_security_age]
 }
 
-assumptions1_df = pd.DataFrame(assumptions1)
-
-fig_assumptions1 = go.Figure(data=go.Table(
-    cells = dict(values=[assumptions1_df.assumptions, assumptions1_df.amount],
-        font=dict(color="#eeeeee", size=18),
-        height=30,
-        line_color="#222222",
-        fill_color = "#444444",
-        align = "left")
-        ))
-fig_assumptions1.layout['template']['data']['table'][0]['header']['fill']['color']='rgba(0,0,0,0)'
-fig_assumptions1.layout['template']['data']['table'][0]['header']['line']['color']='rgba(0,0,0,0)'
-fig_assumptions1.update_layout(margin=dict(l=0,r=0,t=0,b=0))
-
 assumptions2 = {
   "assumptions": ["Gross Annual Income:", "Federal & State Income Taxes:", "Net Annual Income:", "Net Monthly Income:"],
-  "amount": ["${:,.2f}".format(gross_annual_income), "${:,.2f}".format(income_taxes), "${:,.2f}".format(net_annual_income), "${:,.2f}".format(net_monthly_income)]
+  "amount": [currency(gross_annual_income), currency(income_taxes), currency(net_annual_income), currency(net_monthly_income)]
 }
-
-assumptions2_df = pd.DataFrame(assumptions2)
-
-fig_assumptions2 = go.Figure(data=go.Table(
-    cells = dict(values=[assumptions2_df.assumptions, assumptions2_df.amount],
-        font=dict(color="#eeeeee", size=18),
-        height=30,
-        line_color="#222222",
-        fill_color = "#444444",
-        align = "left")
-        ))
-fig_assumptions2.layout['template']['data']['table'][0]['header']['fill']['color']='rgba(0,0,0,0)'
-fig_assumptions2.layout['template']['data']['table'][0]['header']['line']['color']='rgba(0,0,0,0)'
-fig_assumptions2.update_layout(margin=dict(l=0,r=0,t=0,b=0))
 # Retirement Fund Assumptions
 
 # Retirement Budget
-retirement_budget = data_df.iloc[range(155, 164, 1),:]
-retirement_budget.rename(columns = {list(retirement_budget)[0]: 'Category'}, inplace = True)
-retirement_budget.rename(columns = {list(retirement_budget)[1]: 'Amount'}, inplace = True)
+retirement_budget = data["retirement_budget_categories"]
 # Retirement Budget
 
 # Retirement Portfolio Allocation
-retirement_allocation = data_df.iloc[range(164, 169, 1),:]
-retirement_allocation.rename(columns = {list(retirement_allocation)[0]: 'Asset Class'}, inplace = True)
-retirement_allocation.rename(columns = {list(retirement_allocation)[1]: 'Percentage'}, inplace = True)
+retirement_allocation = data["retirement_allocation"]
 # Retirement Portfolio Allocation
 
-# ---- SIDEBAR ----
-# ---- SIDEBAR ----
-
 # ---- MAINPAGE ----
 st.title(":sunny: Retirement Plan")
 st.markdown("##")
@@ -117,87 +138,110 @@ column_1, column_2, column_3, column_4, column_5 = st.columns(5)
 with column_1:
     st.subheader("Current Value")
     #st.write("Left Subheader")
-    st.metric("", "${:,.2f}".format(total_investments))
+    st.metric("", currency(total_investments))
 with column_2:
     st.subheader("Retirement Value")
-    st.metric("", "${:,.2f}".format(retirement_value))
+    st.metric("", currency(retirement_value))
 with column_3:
     st.subheader("Progress")
     st.metric("", retirement_score)
 with column_4:
     st.subheader("Monthly Income")
-    st.metric("", "${:,.2f}".format(monthly_income))
+    st.metric("", currency(monthly_income))
 with column_5:
     st.subheader("Retirement Date")
     st.metric("", retirement_date)
 
 st.markdown("##")
 
-retirement_fund_tab1, retirement_fund_tab2 = st.tabs(["Retirement Fund Balance", "Assumptions"])
-
-with retirement_fund_tab1:
-    # RETIREMENT FUND CHART
-    st.subheader("Retirement Balance - 45 Years")
-
-    fig_retirement_fund = px.area(
-        retirement_fund["Amount"],
-        x=retirement_fund.Year,
-        y="Amount",
-        title="",
-        color_discrete_sequence=["#0083B8"] * len(retirement_fund),
-        template="plotly_white",
-    )
-    fig_retirement_fund.update_layout(
-        xaxis=dict(tickmode="linear"),
-        xaxis_title="Year",
-        plot_bgcolor="rgba(0,0,0,0)",
-        yaxis=(dict(showgrid=False)),
-    )
-    fig_retirement_fund.update_layout(margin=dict(l=0,r=0,t=0,b=0))
-
-    st.plotly_chart(fig_retirement_fund, use_container_width=True)
-    # RETIREMENT FUND CHART
-
-with retirement_fund_tab2:
-    column1, column2 = st.columns(2)
-    column1.plotly_chart(fig_assumptions1, use_container_width=True)
-    column2.plotly_chart(fig_assumptions2, use_container_width=True)
+# RETIREMENT FUND TABS
+# The what-if sliders live outside the fragment, so changing them reruns the page
+@fragment("Retirement Plan: Retirement Fund")
+def retirement_fund_tabs():
+    retirement_fund_tab1, retirement_fund_tab2, retirement_fund_tab3 = st.tabs(
+        ["Retirement Fund Balance", "Assumptions", "Monte Carlo"], key="retirement_fund_tabs", on_change="rerun")
+
+    if retirement_fund_tab1.open:
+        with retirement_fund_tab1:
+            # RETIREMENT FUND CHART
+            st.subheader("Retirement Balance - 45 Years")
+
+            fig_retirement_fund = cached_figure("retirement_fund",
+                lambda: area_chart(retirement_fund, "Year", "Amount", "Year").update_layout(margin=NO_MARGIN),
+                version, **plan._asdict())
+            plotly_chart(st, fig_retirement_fund, use_container_width=True, key="retirement_fund")
+            # RETIREMENT FUND CHART
+
+    if retirement_fund_tab2.open:
+        with retirement_fund_tab2:
+            fig_assumptions1 = cached_figure("assumptions1",
+                lambda: info_table(assumptions1["assumptions"], assumptions1["amount"]), version, **plan._asdict())
+            fig_assumptions2 = cached_figure("assumptions2",
+                lambda: info_table(assumptions2["assumptions"], assumptions2["amount"]), version)
+
+            column1, column2 = st.columns(2)
+            plotly_chart(column1, fig_assumptions1, use_container_width=True, key="assumptions1")
+            plotly_chart(column2, fig_assumptions2, use_container_width=True, key="assumptions2")
+
+    if retirement_fund_tab3.open:
+        with retirement_fund_tab3:
+            # MONTE CARLO (only simulated while its tab is open)
+            with stage("simulate"):
+                simulation_assumptions = Assumptions(
+                    start_date=baseline.current_month.date(),
+                    start_balance=total_investments,
+                    annual_contribution=plan.monthly_contribution * 12,
+                    annual_spend=projection.annual_spend,
+                    fund_needed=projection.fund_needed,
+                    growth_rate=plan.growth_rate,
+                    inflation=plan.inflation,
+                    social_security_amount=social_security_income,
+                    social_security_year=birth_year + plan.social_security_age,
+                    allocation=tuple(map(tuple, retirement_allocation[["Asset Class", "Percentage"]].itertuples(index=False))),
+                    horizon_years=len(retirement_fund),
+                )
+                simulation = cached_simulation(simulation_assumptions)
+
+            st.subheader(f"Simulated Balance - {simulation.paths:,} Market Paths")
+            retirement_dates = simulation.retirement_dates
+            column1, column2, column3 = st.columns(3)
+            column1.metric("Chance Funds Last", percent(round(simulation.success_probability * 100, 1)))
+            column2.metric("Chance to Retire", percent(round(simulation.retire_probability * 100, 1)))
+            if retirement_dates:
+                column3.metric("Median Retirement Date", retirement_dates[50].strftime("%B %Y"),
+                    f"{retirement_dates[10]:%b %Y} - {retirement_dates[90]:%b %Y}", delta_color="off")
+
+            fig_simulation = cached_figure("monte_carlo",
+                lambda: band_chart(simulation.years, simulation.bands, "Year"),
+                version, **simulation_assumptions._asdict())
+            plotly_chart(st, fig_simulation, use_container_width=True, key="monte_carlo")
+            st.caption("Shaded bands cover the 5th-95th and 25th-75th percentile balances.")
+            # MONTE CARLO
+
+retirement_fund_tabs()
+# RETIREMENT FUND TABS
 
 st.markdown("##")
 
 # BUDGET
-fig_budget = px.pie(retirement_budget,
-    title = "Retirement Budget",
-    names = "Category",
-    values = "Amount",
-)
-fig_budget.update_layout(margin=dict(l=0,r=0,t=25,b=0))
+fig_budget = cached_figure("retirement_budget",
+    lambda: pie_chart(retirement_budget, "Category", "Amount", "Retirement Budget"), version)
 # BUDGET
 
 # RETIREMENT PORTFOLIO ALLOCATION
-fig_allocation = px.treemap(retirement_allocation, path=["Asset Class"],
-                 values="Percentage",title="Retirement Asset Allocation")
-fig_allocation.data[0].textinfo = "label+text+percent root"
-
-fig_allocation.update_layout(margin=dict(l=10,r=0,t=25,b=0))
+fig_allocation = cached_figure("retirement_allocation",
+    lambda: treemap(retirement_allocation, ["Asset Class"], "Percentage", title="Retirement Asset Allocation",
+        textinfo="label+text+percent root", margin=dict(l=10,r=0,t=25,b=0)),
+    version)
 # RETIREMENT PORTFOLIO ALLOCATION
 
 left_column, right_column = st.columns(2)
-left_column.plotly_chart(fig_budget, use_container_width=True)
-right_column.plotly_chart(fig_allocation, use_container_width=True)
+plotly_chart(left_column, fig_budget, use_container_width=True, key="retirement_budget")
+plotly_chart(right_column, fig_allocation, use_container_width=True, key="retirement_allocation")
 
 st.markdown("##")
 st.markdown("##")
 st.write("© Copyright 2022 Phuoc Le.  All rights reserved.")
 # ---- MAINPAGE ----
 
-# ---- HIDE STREAMLIT STYLE ----
-hide_st_style = """
-            <style>
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            header {visibility: hidden;}
-            </style>
-            """
-st.markdown(hide_st_style, unsafe_allow_html=True)
-# ---- HIDE STREAMLIT STYLE ----
\ No newline at end of file
+finish_trace()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import datetime
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import budget, cube, data
+from dashboard.budget import Budgets, BudgetTracker, load_budget_tracker
+from dashboard.cube import SpendCube
+from dashboard.ledger import Ledger
+
+
+def _transactions(months, category, amounts, day=1):
+    return pd.DataFrame({
+        "Date": [datetime.datetime(2022, month, day) for month in months],
+        "Year": 2022,
+        "Month": months,
+        "Account": "Checking",
+        "Description": [f"{category} {i}" for i in range(len(months))],
+        "Category": category,
+        "Amount": amounts,
+    })
+
+
+def test_adding_one_at_a_time_matches_a_batch():
+    rng = np.random.default_rng(0)
+    rows = pd.DataFrame({
+        "Year": rng.integers(2018, 2023, 500),
+        "Month": rng.integers(1, 13, 500),
+        "Category": rng.choice(["Food", "Rent", None], 500),
+        "Amount": rng.normal(100, 30, 500).round(2),
+    })
+    batch, single = BudgetTracker(), BudgetTracker()
+    batch.extend(rows)
+    for row in rows.itertuples(index=False):
+        single.add(row.Year, row.Month, row.Category, row.Amount)
+    assert single.count == batch.count == 500
+    assert sorted(single.categories) == sorted(batch.categories) == ["Food", "Rent", "Uncategorized"]
+    for year in range(2018, 2023):
+        assert single.spent(year) == pytest.approx(batch.spent(year))
+        assert single.spent(year, 3, "Food") == pytest.approx(rows.loc[(rows["Year"] == year) & (rows["Month"] == 3)
+            & (rows["Category"] == "Food"), "Amount"].sum())
+
+
+def test_forecast_from_trailing_months():
+    tracker = BudgetTracker()
+    tracker.extend(_transactions([1, 2, 3, 4, 5, 6], "Rent", [300] * 5 + [100]))
+    tracker.extend(_transactions([1, 2, 3, 4, 5], "Food", [100, 200, 300, 400, 500]))
+    budgets = Budgets(600.0, pd.Series({"Rent": 400.0, "Food": 200.0}))
+    # half of June gone, six months after it
+    categories, total = tracker.forecast(datetime.date(2022, 6, 15), budgets, confidence=0.8)
+
+    rent = categories.loc["Rent"]
+    assert (rent["Spent"], rent["Month-End"], rent["YTD"], rent["Year-End"]) == (100, 250, 1600, 3550)
+    assert rent["Month-End Low"] == rent["Month-End High"] == 250
+    assert rent["Burn Rate"] == pytest.approx(100 / 400 / 0.5)
+
+    spread = NormalDist().inv_cdf(0.9) * np.std([100, 200, 300, 400, 500], ddof=1) * np.sqrt(0.5)
+    food = categories.loc["Food"]
+    assert food["Month-End"] == 150
+    assert food["Month-End High"] == pytest.approx(150 + spread)
+    assert food["Month-End Low"] == pytest.approx(max(150 - spread, 0))
+    assert total["Month-End"] == 400
+    assert total["Month-End High"] - total["Month-End"] == pytest.approx(spread)
+    assert list(categories.index) == ["Rent", "Food"]
+
+
+def test_tracker_follows_the_ledger_by_its_appended_rows(tmp_path, monkeypatch):
+    workbook = str(tmp_path / "book.xlsx")
+    ledger = Ledger(str(tmp_path / "book.ledger.sqlite"))
+    views = {}
+    monkeypatch.setattr(budget, "load_ledger", lambda path: views["current"])
+    monkeypatch.setattr(cube, "load_ledger", lambda path: views["current"])
+    data.clear_cache()
+    try:
+        ledger.append(_transactions([1, 2], "Rent", [300.0, 300.0]), workbook, "v1")
+        views["current"] = published = ledger.pinned()
+        first = load_budget_tracker(workbook)
+        assert load_budget_tracker(workbook) is first and first.spent(2022) == 600
+
+        ledger.append(_transactions([1, 2, 3], "Rent", [300.0, 300.0, 300.0]), workbook, "v2")
+        added, real_add = [], BudgetTracker.add
+        monkeypatch.setattr(BudgetTracker, "extend", lambda self, rows: pytest.fail("rebuilt"))
+        monkeypatch.setattr(BudgetTracker, "add", lambda self, *row: (added.append(row), real_add(self, *row)))
+        views["current"] = ledger.pinned()
+        second = load_budget_tracker(workbook)
+        assert added == [(2022, 3, "Rent", 300.0)]
+        assert second.spent(2022) == 900 and first.spent(2022) == 600
+
+        # sessions still on the published version keep its tracker
+        views["current"] = published
+        assert load_budget_tracker(workbook) is first
+    finally:
+        data.clear_cache()
+
+
+
+def test_cube_append_sums_like_a_rebuild():
+    rng = np.random.default_rng(1)
+    rows = pd.DataFrame({
+        "Year": rng.integers(2020, 2023, 3000),
+        "Month": rng.integers(1, 13, 3000),
+        "Category": rng.choice(["Food", "Rent", "Fun"], 3000),
+        "Account": rng.choice(["Checking", "Card"], 3000),
+        "Amount": rng.normal(50, 10, 3000),
+    })
+    folded = SpendCube.from_transactions(rows[:100])
+    for start in range(100, 3000, 100):
+        folded = folded.append(rows[start:start + 100])
+    rebuilt = SpendCube.from_transactions(rows)
+    assert len(folded.cells) < 2 * len(rebuilt.cells) + 100
+    assert folded.total(Year=[2021], Category=["Food"]) == pytest.approx(rebuilt.total(Year=[2021], Category=["Food"]))
+    pd.testing.assert_frame_equal(folded.by(["Year", "Month"]), rebuilt.by(["Year", "Month"]))
+    assert sorted(folded.values("Category")) == ["Food", "Fun", "Rent"]
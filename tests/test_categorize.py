@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.categorize import NO_MATCH, Automaton, Categorizer, rules_from_frame
+
+
+def _rules(*rows):
+    return rules_from_frame(pd.DataFrame(rows, columns=["Category", "Pattern", "Kind", "Field"]))
+
+
+def test_automaton_finds_lowest_rule_like_a_substring_scan():
+    rng = np.random.default_rng(0)
+    patterns = ["he", "she", "his", "hers", "e", "ushe", "rs", "abcab", "bca", "cab"]
+    texts = ["".join(rng.choice(list("abcehirsu"), rng.integers(0, 12))) for _ in range(2000)]
+    texts += ["", "ushers", "abcabcab", "zzz"]
+    expected = [min((rule for rule, pattern in enumerate(patterns) if pattern in text), default=NO_MATCH)
+        for text in texts]
+    assert Automaton([(pattern, rule) for rule, pattern in enumerate(patterns)]).best(texts).tolist() == expected
+
+
+def test_earlier_rules_win_across_kinds_and_fields():
+    categorizer = Categorizer(_rules(
+        ("Travel", "amazon.com", "alias", "Description"),
+        ("Shopping", "amzn", "keyword", "Description"),
+        ("Business", "corporate", "keyword", "Account"),
+        ("Coffee", r"^star\s*bucks", "regex", "Description"),
+    ))
+    categories = categorizer.categorize(
+        pd.Series(["AMAZON COM*2K4", "Amzn Mktp", "STARBUCKS #12", "Amzn Mktp", "Rent"]),
+        pd.Series(["Checking", "Checking", "Checking", "Corporate Card", "Checking"]))
+    assert categories.tolist() == ["Travel", "Shopping", "Coffee", "Shopping", None]
+
+
+def test_regex_rules_with_flags_and_backreferences():
+    categorizer = Categorizer(_rules(
+        ("Repeated", r"(\w+) \1", "regex", "Description"),
+        ("Amazon", r"(?i)^amzn", "regex", "Description"),
+        ("Verbose", "(?x) pay \\s pal  # comment", "regex", "Description"),
+        ("Named", r"(?P<n>uber) (?P=n)", "regex", "Description"),
+        ("Doubled", r"(ab)\1", "regex", "Description"),
+    ))
+    categories = categorizer.categorize(pd.Series(["amzn mktp", "PAY PAL", "uber uber", "xabab", "go go", "rent"]))
+    assert categories.tolist() == ["Amazon", "Verbose", "Repeated", "Doubled", "Repeated", None]
+
+
+def test_bad_regex_is_rejected():
+    with pytest.raises(ValueError, match="rule 1: bad regex"):
+        _rules(("Broken", "(unclosed", "regex", "Description"))
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from dashboard import data
+
+
+def test_remembered_state_is_evicted_under_the_profile_limit(tmp_path):
+    data.clear_cache()
+    first, second = str(tmp_path / "first.xlsx"), str(tmp_path / "second.xlsx")
+    try:
+        data.set_max_bytes(1024 * 1024, profile_bytes=60_000)
+        data.remember(first, ("state",), np.zeros(5_000))
+        data.remember(second, ("state",), np.zeros(5_000))
+        assert data.cache_stats(first)["bytes"] == 40_000
+        assert data.recall(first, ("state",)) is not None
+
+        # the first workbook's second value pushes out its first, not the other workbook's
+        data.remember(first, ("other",), np.zeros(5_000))
+        assert data.recall(first, ("state",)) is None
+        assert data.recall(second, ("state",)) is not None
+        assert data.cache_stats(first)["evictions"] == 1
+
+        data.set_max_bytes(50_000)
+        assert data.cache_stats()["bytes"] <= 50_000
+    finally:
+        data.set_max_bytes(data.MAX_CACHE_MB * 1024 * 1024, data.MAX_PROFILE_CACHE_MB * 1024 * 1024)
+        data.clear_cache()
+
+
+def test_failed_builds_leave_no_load_lock_behind(tmp_path):
+    workbook = tmp_path / "book.xlsx"
+    workbook.write_bytes(b"book")
+    calls = []
+
+    def build(path, version):
+        calls.append(version)
+        if len(calls) == 1:
+            raise ValueError("sheet is missing")
+        return np.arange(3)
+
+    data.clear_cache()
+    try:
+        with pytest.raises(ValueError):
+            data.cached(str(workbook), ("failing",), build)
+        assert not data._load_locks
+        first = data.cached(str(workbook), ("failing",), build)
+        assert data.cached(str(workbook), ("failing",), build) is first
+        assert len(calls) == 2 and not data._load_locks
+    finally:
+        data.clear_cache()
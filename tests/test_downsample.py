@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.downsample import POINTS, Pyramid, lttb, minmax
+
+
+def walk(n, seed=0):
+    return np.cumsum(np.random.default_rng(seed).normal(size=n))
+
+
+def test_minmax_keeps_every_bucket_extreme_and_both_ends():
+    x, y = np.arange(10_003), walk(10_003)
+    kx, ky = minmax(x, y, 100)
+    assert kx[0] == 0 and kx[-1] == len(x) - 1
+    assert (np.diff(kx) > 0).all()
+    assert ky.min() == y.min() and ky.max() == y.max()
+    assert len(kx) <= 2 * 100 + 4
+
+
+def test_lttb_keeps_ends_and_spikes_within_budget():
+    x, y = np.arange(100_000), np.zeros(100_000)
+    y[31_337] = 50.0
+    kx, ky = lttb(x, y, 500)
+    assert len(kx) == 500
+    assert kx[0] == 0 and kx[-1] == len(x) - 1
+    assert 31_337 in kx and ky.max() == 50.0
+    short = np.arange(10)
+    assert lttb(short, short, 500)[0] is short
+
+
+def test_pyramid_windows_stay_in_range_and_budget():
+    dates = pd.date_range("2000-01-01", periods=200_000, freq="H").to_numpy()
+    values = walk(len(dates))
+    values[5] = np.nan
+    shuffled = np.random.default_rng(1).permutation(len(dates))
+    pyramid = Pyramid(dates[shuffled], values[shuffled])
+    assert len(pyramid.levels) > 2
+    assert len(pyramid.levels[0][0]) == len(dates) - 1
+    assert pyramid.bounds == (dates[0], dates[-1])
+
+    x, y = pyramid.window()
+    assert len(x) == POINTS and x.dtype == dates.dtype
+    assert np.isin(y, values).all()
+
+    start, end = dates[1000], dates[1500]
+    x, y = pyramid.window(start, end)
+    assert x[0] == start and x[-1] == end
+    assert np.array_equal(y, values[1000:1501])
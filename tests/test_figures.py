@@ -0,0 +1,30 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from dashboard import figures
+
+
+def test_figures_are_reused_per_version_and_evicted_by_size():
+    builds = []
+
+    def build(points):
+        def make():
+            builds.append(points)
+            return go.Figure(go.Scatter(x=np.arange(points), y=np.zeros(points)))
+        return make
+
+    figures.clear_figures()
+    try:
+        first = figures.cached_figure("line", build(1000), 1, window=3)
+        assert figures.cached_figure("line", build(1000), 1, window=3) is first
+        assert figures.cached_figure("line", build(1000), 2, window=3) is not first
+        assert builds == [1000, 1000]
+        assert figures.figure_stats()["bytes"] >= 2 * 2 * 1000 * 8
+
+        figures.set_max_bytes(figures.figure_stats()["bytes"])
+        figures.cached_figure("line", build(1000), 3, window=3)
+        assert figures.figure_stats()["entries"] == 2
+        assert figures.cached_figure("line", build(1000), 1, window=3) is not first
+    finally:
+        figures.set_max_bytes(figures.MAX_FIGURE_MB * 1024 * 1024)
+        figures.clear_figures()
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from dashboard import data
+from dashboard.formatting import currency, currency_column, display_column, percent_column
+
+
+def test_columns_round_like_str_format():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        np.arange(-5000, 5000) / 1000,  # every half cent: 0.125, 2.675, -0.005, ...
+        rng.normal(0, 1e6, 5000).round(3),
+        rng.normal(0, 100, 5000),
+        [0.0, -0.0, -0.004, 1e14 + 0.125],
+    ])
+    expected = [f"{'-' if round(value, 2) < 0 else ''}${abs(value):,.2f}" for value in values.tolist()]
+    assert currency_column(values).tolist() == expected
+    assert [currency(value) for value in values] == expected
+    assert percent_column(values).tolist() == [f"{value:.2f}%".replace("-0.00", "0.00") for value in values.tolist()]
+
+
+def test_display_column_is_formatted_once_per_version(tmp_path):
+    workbook = str(tmp_path / "book.xlsx")
+    pd.DataFrame({"Amount": [1234.5, None, -0.25]}).to_excel(workbook, sheet_name="spend_data", index=False)
+    data.clear_cache()
+    try:
+        first = display_column("spend_data", "Amount", path=workbook)
+        assert first.tolist() == ["$1,234.50", "", "-$0.25"]
+        assert display_column("spend_data", "Amount", path=workbook) is first
+        assert not first.flags.writeable
+
+        pd.DataFrame({"Amount": [7.0]}).to_excel(workbook, sheet_name="spend_data", index=False)
+        assert display_column("spend_data", "Amount", path=workbook).tolist() == ["$7.00"]
+        assert display_column("spend_data", "Amount", "percent", workbook).tolist() == ["7.00%"]
+    finally:
+        data.clear_cache()
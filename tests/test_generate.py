@@ -0,0 +1,38 @@
+import zipfile
+
+import pandas as pd
+
+from bench import generate
+from dashboard import data
+
+
+def test_transactions_are_seeded_sorted_and_within_the_window():
+    first = generate.transactions(500, seed=3, today="2026-10-01")
+    assert first.equals(generate.transactions(500, seed=3, today="2026-10-01"))
+    assert list(first.columns) == generate.COLUMNS
+    assert first["Date"].is_monotonic_increasing
+    assert first["Date"].min() >= pd.Timestamp("2018-10-01")
+    assert first["Date"].max() <= pd.Timestamp("2026-10-01")
+    assert (first["Month"] == first["Date"].dt.month).all()
+
+
+def test_workbook_reads_back_with_dimensions(tmp_path, monkeypatch):
+    output = generate.generate(300, str(tmp_path / "small.xlsx"), holdings=4)
+    with zipfile.ZipFile(output) as workbook:
+        sheets = [name for name in workbook.namelist() if name.startswith("xl/worksheets/sheet")]
+        assert all(b"<dimension ref=" in workbook.read(name)[:1 << 16] for name in sheets)
+
+    # past Excel's limit the transactions live only in the sheet's snapshot
+    monkeypatch.setattr(generate, "EXCEL_MAX_ROWS", 100)
+    large = generate.generate(300, str(tmp_path / "large.xlsx"), holdings=4)
+    data.clear_cache()
+    try:
+        for path in (output, large):
+            spend = data.load_sheet("spend_data", path)
+            assert len(spend) == 300
+            history = data.load_sheet("performance", path)
+            assert history["Symbol"].nunique() == 4
+            assert len(history) == 4 * generate.YEARS * 12
+        assert pd.read_excel(large, sheet_name="spend_data").empty
+    finally:
+        data.clear_cache()
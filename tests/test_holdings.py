@@ -0,0 +1,42 @@
+import pandas as pd
+
+from dashboard.holdings import ROOT, Hierarchy, revalue
+
+
+def investments(count):
+    return pd.DataFrame({
+        "Industry": ["Stocks"] * count + ["Cash"],
+        "Sector": ["Tech"] * count + [None],
+        "Account": ["Brokerage"] * count + ["Bank"],
+        "Symbol": [f"S{index:03d}" for index in range(count)] + ["USD"],
+        "Value": [float(index + 1) for index in range(count)] + [500.0],
+        "Quantity": [1.0] * count + [None],
+    })
+
+
+def test_sums_roll_up_and_children_come_largest_first():
+    tree = Hierarchy(investments(40))
+    assert tree.total == sum(range(1, 41)) + 500
+    assert tree.children().to_dict() == {"Stocks": 820.0, "Cash": 500.0}
+    assert list(tree.children().index) == ["Stocks", "Cash"]
+    assert tree.value(("Cash", "Unknown", "Bank", "USD")) == 500
+    holdings = tree.children(("Stocks", "Tech", "Brokerage"))
+    assert list(holdings.index[:2]) == ["S039", "S038"]
+    assert tree.children(("Missing",)).empty
+
+
+def test_view_folds_past_top_n_into_other():
+    tree = Hierarchy(investments(40))
+    view = tree.view(("Stocks", "Tech", "Brokerage"), top_n=10, depth=1)
+    assert view["id"].iloc[0] == f"{ROOT}/Stocks/Tech/Brokerage"
+    assert len(view) == 1 + 10 + 1
+    other = view.iloc[-1]
+    assert other["label"] == "Other (30)" and other["value"] == sum(range(1, 31))
+    assert view["value"].iloc[1:].sum() == view["value"].iloc[0]
+    # a lone extra child is drawn, not folded
+    assert "Other (1)" not in set(Hierarchy(investments(11)).view(("Stocks", "Tech", "Brokerage"), top_n=10)["label"])
+
+
+def test_revalue_uses_quotes_only_where_quantity_and_price_exist():
+    frame = revalue(investments(3), {"S000": 10.0, "USD": 2.0})
+    assert frame["Value"].tolist() == [10.0, 2.0, 3.0, 500.0]
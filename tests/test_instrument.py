@@ -0,0 +1,48 @@
+import json
+
+import plotly.graph_objects as go
+
+from dashboard import instrument
+
+
+class Container:
+    def __init__(self):
+        self.charts = []
+
+    def plotly_chart(self, fig, **kwargs):
+        self.charts.append((fig, kwargs))
+        return len(self.charts)
+
+
+def test_stages_are_no_ops_until_a_trace_starts():
+    instrument._current.set(None)
+    with instrument.stage("load"):
+        pass
+    container = Container()
+    assert instrument.plotly_chart(container, go.Figure(), key="empty") == 1
+    assert instrument.finish_trace() is None
+
+
+def test_traced_run_sums_stages_and_exports_one_line(tmp_path, monkeypatch):
+    trace_file = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(instrument, "ENABLED", True)
+    monkeypatch.setattr(instrument, "TRACE_FILE", str(trace_file))
+    trace = instrument.start_trace("Spending")
+    assert trace is not None and not trace.panel
+    for _ in range(3):
+        with instrument.stage("load"):
+            with instrument.stage("load.read_excel"):
+                pass
+    container = Container()
+    fig = go.Figure(go.Scatter(x=[1, 2, 3], y=[4, 5, 6]))
+    instrument.plotly_chart(container, fig, key="trend", use_container_width=True)
+    assert container.charts == [(fig, {"key": "trend", "use_container_width": True})]
+
+    record = instrument.finish_trace()
+    assert instrument.finish_trace() is None
+    assert set(record["stages"]) == {"load", "load.read_excel", "render"}
+    assert record["stages"]["load"] >= record["stages"]["load.read_excel"]
+    assert record["charts"][0]["key"] == "trend"
+    assert record["charts"][0]["bytes"] > 0
+    [line] = trace_file.read_text().splitlines()
+    assert json.loads(line)["page"] == "Spending"
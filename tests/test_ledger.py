@@ -0,0 +1,140 @@
+import sqlite3
+
+import pandas as pd
+
+from dashboard.categorize import Categorizer, rules_from_frame
+from dashboard.ledger import Ledger
+
+
+def _statement(*amounts):
+    return pd.DataFrame({
+        "Date": pd.to_datetime(["2022-07-01"] * len(amounts)),
+        "Account": "Checking",
+        "Description": [f"Row {amount}" for amount in amounts],
+        "Category": "Groceries",
+        "Amount": list(amounts),
+    })
+
+
+def test_pinned_view_ignores_later_imports(tmp_path):
+    ledger = Ledger(str(tmp_path / "book.ledger.sqlite"))
+    ledger.append(_statement(1.0, 2.0), "book.xlsx", "v1")
+    published = ledger.pinned()
+
+    # the next version is imported before it is published
+    ledger.append(_statement(1.0, 2.0, 3.0), "book.xlsx", "v2")
+    pending = ledger.pinned()
+
+    assert published.count() == 2 and pending.count() == 3
+    assert published.watermark() < pending.watermark()
+    rows, watermark = published.rows_after(0)
+    assert rows["Amount"].tolist() == [1.0, 2.0] and watermark == published.watermark()
+    assert published.page(sort_by="Amount")[0]["Amount"].tolist() == [2.0, 1.0]
+    assert published.revision() == pending.revision()
+
+    # a change in place bumps the revision, but not the pinned one
+    ledger.append(_statement(1.0, 3.0), "book.xlsx", "v3")
+    assert ledger.revision() > published.revision() == pending.revision()
+
+
+def test_row_shared_by_two_sources_outlives_either(tmp_path):
+    ledger = Ledger(str(tmp_path / "book.ledger.sqlite"))
+    ledger.append(_statement(1.0, 2.0), "book.xlsx", "v1")
+    ledger.append(_statement(2.0, 3.0), "bank.csv", "a")
+    assert ledger.count() == 3
+
+    # the workbook drops the row the statement also has
+    ledger.append(_statement(1.0), "book.xlsx", "v2")
+    assert sorted(ledger.page(size=10)[0]["Amount"]) == [1.0, 2.0, 3.0]
+
+    # once neither has it, it goes
+    ledger.append(_statement(3.0), "bank.csv", "b")
+    assert sorted(ledger.page(size=10)[0]["Amount"]) == [1.0, 3.0]
+    assert ledger.append(_statement(2.0, 3.0), "bank.csv", "a") == 1
+
+
+def test_filtered_pages_walk_an_index_newest_first(tmp_path):
+    ledger = Ledger(str(tmp_path / "book.ledger.sqlite"))
+    ledger.append(_statement(*range(1, 41)), "book.xlsx", "v1")
+    view = ledger.pinned()
+    with sqlite3.connect(ledger.path) as connection:
+        for filters in ({}, {"Month": [7]}, {"Category": ["Groceries"]}):
+            where, params = view._where(filters)
+            plan = " ".join(row[3] for row in connection.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM transactions{where} ORDER BY date DESC, id LIMIT 25", params))
+            assert "USING" in plan and "TEMP B-TREE" not in plan, plan
+
+    rows, matches = view.page(Month=[7], size=5)
+    assert matches == 40 and len(rows) == 5
+    assert view.page(Month=[7], size=5, matches=12)[1] == 12
+    # a remembered count is still the pinned view's own
+    ledger.append(_statement(*range(1, 42)), "book.xlsx", "v2")
+    assert view.count(Month=[7]) == 40 and ledger.count(Month=[7]) == 41
+
+
+def test_pinned_view_keeps_rows_the_next_import_deletes_or_changes(tmp_path):
+    ledger = Ledger(str(tmp_path / "book.ledger.sqlite"))
+    ledger.append(_statement(1.0, 2.0, 3.0), "book.xlsx", "v1")
+    published = ledger.pinned()
+
+    edited = _statement(1.0, 3.0)
+    edited["Category"] = ["Dining", "Groceries"]
+    ledger.append(edited, "book.xlsx", "v2")
+    assert sorted(ledger.page(size=10)[0]["Amount"]) == [1.0, 3.0]
+
+    rows, matches = published.page(sort_by="Amount", ascending=True, size=10)
+    assert matches == 3 and rows["Amount"].tolist() == [1.0, 2.0, 3.0]
+    assert rows["Category"].tolist() == ["Groceries"] * 3
+    assert published.rows_after(0)[0]["Amount"].tolist() == [1.0, 2.0, 3.0]
+    assert published.count(Category=["Dining"]) == 0 and ledger.count(Category=["Dining"]) == 1
+
+
+def test_import_files_reads_changed_statements_only(tmp_path):
+    statements = tmp_path / "statements"
+    (statements / "2022").mkdir(parents=True)
+    card = statements / "2022" / "card.csv"
+    card.write_text("date,description,CATEGORY,amount\n2022-07-01,Cafe,Food,-4.35\n2022-07-02,Grocer,Food,-60\n")
+    _statement(10.0, 20.0).to_excel(statements / "checking.xlsx", sheet_name="spend_data", index=False)
+    (statements / "~$checking.xlsx").write_bytes(b"lock")
+    (statements / "notes.txt").write_text("not a statement")
+    ledger = Ledger(str(tmp_path / "book.ledger.sqlite"))
+
+    added = ledger.import_files([str(statements)], workers=2)
+    assert added == {str(card): 2, str(statements / "checking.xlsx"): 2}
+    rows = ledger.page(sort_by="Amount", ascending=True)[0]
+    assert rows["Account"].tolist() == ["card", "card", "Checking", "Checking"]
+    assert rows["Amount"].tolist() == [-60.0, -4.35, 10.0, 20.0]
+
+    revision = ledger.revision()
+    assert set(ledger.import_files([str(statements)]).values()) == {0}
+    assert ledger.revision() == revision
+
+    card.write_text("date,description,category,amount\n2022-07-01,Cafe,Food,-4.35\n")
+    assert ledger.import_file(str(card)) == 0
+    assert ledger.count() == 3
+
+
+def test_recategorize_keeps_hand_entered_categories(tmp_path):
+    def categorizer(*rows):
+        return Categorizer(rules_from_frame(pd.DataFrame(rows, columns=["Category", "Pattern", "Kind", "Field"])))
+
+    statement = _statement(1.0, 2.0, 3.0)
+    statement["Description"] = ["Cafe 1", "Cafe 2", "Hardware"]
+    statement["Category"] = ["Uncategorized", "Treats", "Uncategorized"]
+    ledger = Ledger(str(tmp_path / "book.ledger.sqlite"))
+    ledger.append(statement, "book.xlsx", "v1")
+
+    def categories():
+        return ledger.page(sort_by="Amount", ascending=True)[0]["Category"].tolist()
+
+    cafes = categorizer(("Coffee", "cafe", "keyword", "Description"))
+    assert ledger.recategorize(cafes) == 1
+    assert categories() == ["Coffee", "Treats", "Uncategorized"]
+    revision = ledger.revision()
+    assert ledger.recategorize(cafes) == 0 and ledger.revision() == revision
+
+    # a rule dropped sends its rows back; everything overrides hand entries too
+    assert ledger.recategorize(categorizer(("Home", "hardware", "keyword", "Description"))) == 2
+    assert categories() == ["Uncategorized", "Treats", "Home"]
+    assert ledger.recategorize(cafes, everything=True) == 3
+    assert categories() == ["Coffee", "Coffee", "Uncategorized"]
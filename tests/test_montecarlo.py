@@ -0,0 +1,51 @@
+import datetime
+import math
+
+import numpy as np
+import pytest
+
+from dashboard.montecarlo import ASSET_CLASSES, Assumptions, portfolio_volatility, simulate
+
+ASSUMPTIONS = Assumptions(
+    start_date=datetime.datetime(2026, 10, 1), start_balance=1_000_000, annual_contribution=24_000,
+    annual_spend=80_000, fund_needed=2_000_000, growth_rate=0.07, inflation=0.03,
+    social_security_amount=30_000, social_security_year=2042,
+    allocation=(("US Stocks", 0.6), ("Long Term US Treasuries", 0.4)), horizon_years=40,
+)
+
+
+def test_volatility_of_a_single_class_is_its_own():
+    assert portfolio_volatility((("US Stocks", 1.0),)) == pytest.approx(ASSET_CLASSES["US Stocks"][1])
+    mixed = portfolio_volatility(ASSUMPTIONS.allocation)
+    # 60/40 at 16% and 12% with 0.3 correlation diversifies below either class
+    assert mixed == pytest.approx(math.sqrt(0.36 * 0.16 ** 2 + 0.16 * 0.12 ** 2 + 2 * 0.24 * 0.3 * 0.16 * 0.12))
+
+
+def test_same_seed_same_paths_across_workers():
+    one = simulate(ASSUMPTIONS, paths=2_000, seed=7, chunk_paths=500)
+    two = simulate(ASSUMPTIONS, paths=2_000, seed=7, chunk_paths=500, workers=2)
+    for percentile in one.bands:
+        np.testing.assert_array_equal(one.bands[percentile], two.bands[percentile])
+    assert one.success_probability == two.success_probability
+    assert one.retirement_dates == two.retirement_dates
+
+
+def test_growth_averages_to_the_plan_rate():
+    hold = ASSUMPTIONS._replace(annual_contribution=0, fund_needed=math.inf, horizon_years=10)
+    result = simulate(hold, paths=50_000, seed=1)
+    assert result.retire_probability == 0 and result.retirement_dates == {}
+    assert result.success_probability == 1
+    bands = np.array([result.bands[percentile] for percentile in sorted(result.bands)])
+    assert (np.diff(bands, axis=0) >= 0).all()
+    # lognormal paths: the median sits below the mean, which compounds at the plan rate
+    assert result.bands[50][-1] < 1_000_000 * 1.07 ** 10
+
+
+def test_funded_plan_retires_at_start_and_overspending_depletes():
+    funded = simulate(ASSUMPTIONS._replace(start_balance=3_000_000), paths=1_000, seed=2)
+    assert funded.retire_probability == 1
+    assert funded.retirement_dates[50] == ASSUMPTIONS.start_date
+    broke = simulate(ASSUMPTIONS._replace(start_balance=2_000_000, annual_spend=400_000,
+        social_security_amount=0), paths=1_000, seed=2)
+    assert broke.success_probability == 0
+    assert (broke.bands[95][-1] == 0)
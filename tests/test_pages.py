@@ -0,0 +1,37 @@
+import os
+
+import openpyxl
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from dashboard import data
+from dashboard.schema import load_ranges
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(ROOT, "Phuoc-Financial-Data.xlsx")
+
+
+def test_pages_with_a_single_month_of_history(tmp_path, monkeypatch):
+    # the template as values, net worth from the current month on and one performance valuation
+    current = pd.Timestamp(load_ranges(["current_month"], TEMPLATE)["current_month"]).to_pydatetime()
+    workbook = openpyxl.load_workbook(TEMPLATE, data_only=True)
+    net_worth = workbook["net-worth"]
+    date = [cell.value for cell in net_worth[1]].index("Date")
+    rows = [row for row in net_worth.iter_rows(min_row=2, values_only=True)
+        if row[date] is not None and row[date] >= current]
+    net_worth.delete_rows(2, net_worth.max_row)
+    for row in rows:
+        net_worth.append(row)
+    performance = workbook.create_sheet("performance")
+    performance.append(["Date", "Account", "Broker", "Symbol", "Asset Class", "Value", "Flow"])
+    performance.append([current, "Brokerage", "Fidelity", "VTI", "US Stocks", 1000.0, 0.0])
+    path = str(tmp_path / "Phuoc-Financial-Data.xlsx")
+    workbook.save(path)
+    monkeypatch.setattr(data, "WORKBOOK", path)
+
+    main = AppTest.from_file(os.path.join(ROOT, "Financial_Dashboard.py"), default_timeout=120).run()
+    assert not main.exception
+    assert f"Net Worth - {current:%B %Y}" in [subheader.value for subheader in main.subheader]
+    investments = AppTest.from_file(os.path.join(ROOT, "pages", "3-Investments.py"), default_timeout=120).run()
+    assert not investments.exception
+    assert f"Period: {current:%B %Y}" in [caption.value for caption in investments.caption]
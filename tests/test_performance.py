@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.performance import performance
+
+
+def _history(values, flows):
+    dates = pd.to_datetime(["2021-01-01", "2021-07-01", "2022-01-01"])
+    return pd.DataFrame({
+        "Date": np.tile(dates, 2),
+        "Account": ["A"] * 3 + ["B"] * 3,
+        "Broker": "Broker",
+        "Symbol": "Symbol",
+        "Asset Class": "Equity",
+        "Value": values,
+        "Flow": flows,
+    })
+
+
+def test_whole_number_values_and_flows():
+    # whole-dollar sheets load as int64 columns
+    ints = _history([1000, 1200, 1500, 500, 400, 700], [0, 100, 0, 0, 0, 200])
+    assert ints["Value"].dtype == np.int64 and ints["Flow"].dtype == np.int64
+    floats = ints.astype({"Value": float, "Flow": float})
+
+    result = performance(ints)
+    pd.testing.assert_frame_equal(result, performance(floats))
+    assert result.loc["A", "Gain"] == 1500 - 1000 - 100
+    assert np.isclose(result.loc["A", "TWR"], (1100 / 1000) * (1500 / 1200) - 1)
+    assert np.isfinite(result["XIRR"]).all()
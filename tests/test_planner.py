@@ -0,0 +1,38 @@
+import datetime
+import math
+
+import pytest
+
+from dashboard.planner import Baseline, Plan, future_value, months_to_retire, project
+
+BASELINE = Baseline(
+    current_month=datetime.datetime(2026, 10, 1), total_investments=1_000_000, retirement_taxes=0,
+    retirement_budget=5_000, social_security_amount=30_000, horizon_years=45, birth_year=1975,
+)
+
+
+def plan(**changes):
+    return Plan(growth_rate=0.07, inflation=0.03, withdrawal_rate=0.04, monthly_contribution=2_000,
+        retirement_age=60, social_security_age=67)._replace(**changes)
+
+
+def test_months_to_retire_matches_nper():
+    months = months_to_retire(0.07, 24_000, 1_000_000, 2_025_000)
+    assert future_value(0.07, months / 12, 24_000, 1_000_000) == pytest.approx(2_025_000)
+    assert months_to_retire(0, 24_000, 1_000_000, 1_120_000) == pytest.approx(60)
+
+
+def test_unreachable_target_never_retires():
+    assert months_to_retire(0, 0, 1_000_000, 2_025_000) == math.inf
+    assert months_to_retire(0.07, 0, 0, 2_025_000) == math.inf
+    assert months_to_retire(0, 0, 3_000_000, 2_025_000) == 0
+    projection = project(BASELINE, plan(growth_rate=0, monthly_contribution=0))
+    assert projection.retirement_date is None
+
+
+def test_retirement_date_past_calendar_is_none():
+    baseline = BASELINE._replace(total_investments=0, retirement_budget=10_000)
+    projection = project(baseline, plan(growth_rate=0, monthly_contribution=50, withdrawal_rate=0.02))
+    assert math.isfinite(projection.months_to_retire)
+    assert projection.retirement_date is None
+    assert project(BASELINE, plan()).retirement_date.year == 2035
@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+from dashboard import pricing
+from dashboard.pricing import FileQuotes, QuoteService
+
+
+class Provider:
+    def __init__(self, prices, fail=False):
+        self.prices = prices
+        self.fail = fail
+        self.batches = []
+
+    async def fetch(self, symbols):
+        self.batches.append(list(symbols))
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise OSError("quote server down")
+        return {symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices}
+
+
+def settle(service, batches):
+    deadline = time.time() + 5
+    while service.stats()["batches"] < batches and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_sessions_asking_together_share_batches():
+    provider = Provider({f"S{index}": float(index) for index in range(120)})
+    service = QuoteService(provider, batch_size=50)
+    try:
+        symbols = [f"S{index}" for index in range(120)] + ["CASH"]
+        for _ in range(10):
+            assert service.get(symbols).prices == {}
+        settle(service, 3)
+        assert sorted(len(batch) for batch in provider.batches) == [21, 50, 50]
+        assert service.stats()["coalesced"] == 9 * len(symbols)
+
+        quotes = service.get(symbols)
+        assert len(quotes.prices) == 120
+        generation = quotes.generation
+        # the unknown symbol waits a TTL before it is asked for again
+        assert len(provider.batches) == 3
+
+        provider.prices["S1"] = 2.5
+        assert service.refresh(["S1", "S2"]).prices == {"S1": 2.5, "S2": 2.0}
+        assert service.generation == generation + 1
+        service.refresh(["S2"])
+        assert service.generation == generation + 1
+    finally:
+        service.close()
+
+
+def test_failed_batches_back_off_and_keep_stale_prices():
+    provider = Provider({"VTI": 250.0})
+    service = QuoteService(provider, ttl=0)
+    try:
+        service.refresh(["VTI"])
+        provider.fail = True
+        service.get(["VTI"])
+        settle(service, 2)
+        assert service.stats()["errors"] == 1
+        # stale but kept, and not asked for again inside the back-off
+        assert service.get(["VTI"]).prices == {"VTI": 250.0}
+        time.sleep(0.05)
+        assert len(provider.batches) == 2
+    finally:
+        service.close()
+
+
+def test_quotes_file_is_reread_when_it_changes(tmp_path):
+    path = tmp_path / "quotes.csv"
+    path.write_text("Symbol,Price\nVTI,250\nBND,\n")
+    provider = FileQuotes(str(path))
+    assert asyncio.run(provider.fetch(["VTI", "BND"])) == {"VTI": 250.0}
+    path.write_text("Symbol,Price\nVTI,251.5\nBND,72\n")
+    assert asyncio.run(provider.fetch(["VTI", "BND"])) == {"VTI": 251.5, "BND": 72.0}
+    assert isinstance(pricing.quote_provider("http://127.0.0.1:8765/quotes"), pricing.HttpQuotes)
@@ -0,0 +1,48 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from dashboard import snapshot
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", str(tmp_path))
+
+
+def test_mixed_columns_round_trip(tmp_path):
+    workbook = str(tmp_path / "book.xlsx")
+    df = pd.DataFrame({
+        "Label": ["Net Worth:", "Date:", None, "Count:", "Flag:"],
+        "Value": [1234.5, datetime.datetime(2022, 7, 1), float("nan"), 7, True],
+        "Amount": [1.0, 2.0, 3.0, 4.0, 5.0],
+        "Category": ["a", "b", "a", None, "b"],
+    })
+    snapshot.write_sheet(workbook, "data", "v1", df)
+
+    read = snapshot.read_sheet(workbook, "data", "v1", categories=("Category",))
+    assert list(read.columns) == list(df.columns)
+    assert read["Value"].tolist()[:2] == [1234.5, pd.Timestamp(2022, 7, 1)]
+    assert pd.isna(read["Value"][2]) and type(read["Value"][3]) is int and read["Value"][4] is True
+    assert read["Category"].dtype == "category"
+    pd.testing.assert_series_equal(read["Amount"], df["Amount"])
+    assert snapshot.read_sheet(workbook, "data", "v2") is None
+
+
+def test_sole_snapshot_is_kept_for_its_version(tmp_path):
+    workbook = str(tmp_path / "book.xlsx")
+    rows = pd.DataFrame({"Amount": [1.0, 2.0, 3.0]})
+    snapshot.write_sheet(workbook, "spend_data", "v1", rows, sole=True)
+
+    # a parse of the same workbook (its sheet left empty) does not replace it
+    assert snapshot.write_sheet(workbook, "spend_data", "v1", rows.iloc[:0]) is None
+    pd.testing.assert_frame_equal(snapshot.read_sheet(workbook, "spend_data", "v1"), rows)
+
+    # an edited workbook is read from the workbook, and its parse replaces the snapshot
+    assert snapshot.read_sheet(workbook, "spend_data", "v2") is None
+    edited = pd.DataFrame({"Amount": [4.0]})
+    assert snapshot.write_sheet(workbook, "spend_data", "v2", edited) is not None
+    pd.testing.assert_frame_equal(snapshot.read_sheet(workbook, "spend_data", "v2"), edited)
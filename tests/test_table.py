@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.table import window
+
+
+@pytest.mark.parametrize("column", ["Category", "Date", "Amount"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_pages_match_one_stable_sort(column, ascending):
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame({
+        "Category": rng.choice(list("abcde"), n),
+        "Date": pd.to_datetime("2020-01-01") + pd.to_timedelta(rng.integers(0, 30, n), "D"),
+        "Amount": rng.integers(0, 5, n).astype(float),
+    })
+    df.loc[::7, "Date"] = pd.NaT
+    df.loc[::11, "Amount"] = np.nan
+    df.loc[::13, "Category"] = None
+
+    pages = pd.concat([window(df, column, ascending, offset=offset, size=25)[0] for offset in range(0, n, 25)])
+    expected = df.sort_values(column, ascending=ascending, kind="stable", na_position="last")
+    assert list(pages.index) == list(expected.index)
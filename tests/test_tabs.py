@@ -0,0 +1,20 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+from dashboard import montecarlo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_monte_carlo_runs_only_once_its_tab_is_open():
+    montecarlo.cached_simulation.cache_clear()
+    app = AppTest.from_file(os.path.join(ROOT, "pages", "4-Retirement_Plan.py"), default_timeout=120).run()
+    assert not app.exception
+    assert [tab.label for tab in app.tabs] == ["Retirement Fund Balance", "Assumptions", "Monte Carlo"]
+    assert montecarlo.cached_simulation.cache_info().currsize == 0
+
+    app.session_state["retirement_fund_tabs"] = "Monte Carlo"
+    app.run()
+    assert not app.exception
+    assert montecarlo.cached_simulation.cache_info().currsize == 1
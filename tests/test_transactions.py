@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.transactions import COLUMNS, amounts, between, typed_transactions
+
+
+def statement():
+    return pd.DataFrame({
+        "Date": ["2026-03-02", "2026-01-15", "2026-02-01", "2026-01-15"],
+        "Account": ["Card", "Card", "Bank", "Card"],
+        "Description": ["Grocer", "Cafe", "Rent", "Cafe"],
+        "Category": ["Food", "Food", "Housing", "Food"],
+        "Amount": [-0.29, "-4.35", -1500, 0.1 + 0.2],
+    })
+
+
+def test_rows_are_typed_sorted_and_exact_to_the_cent():
+    frame = typed_transactions(statement())
+    assert list(frame.columns) == COLUMNS
+    assert frame["Date"].is_monotonic_increasing
+    assert frame["Description"].tolist() == ["Cafe", "Cafe", "Rent", "Grocer"]
+    assert frame["Cents"].tolist() == [-435, 30, -150000, -29]
+    assert amounts(frame).tolist() == [-4.35, 0.3, -1500.0, -0.29]
+    assert frame["Month"].dtype == np.int8 and frame["Year"].dtype == np.int16
+    assert isinstance(frame["Category"].dtype, pd.CategoricalDtype)
+    assert frame["Month-Year"].tolist() == [pd.Timestamp(day) for day in
+        ("2026-01-01", "2026-01-01", "2026-02-01", "2026-03-01")]
+    assert frame["Tags"].isna().all()
+
+
+def test_between_is_a_view_of_the_date_range():
+    frame = typed_transactions(statement())
+    february = between(frame, "2026-02-01", "2026-03-01")
+    assert february["Description"].tolist() == ["Rent"]
+    assert np.shares_memory(february["Cents"].to_numpy(), frame["Cents"].to_numpy())
+    assert len(between(frame, end="2026-01-15")) == 0
+    assert len(between(frame)) == 4
+
+
+@pytest.mark.parametrize("column, value, message", [
+    ("Date", "not a date", "invalid Date"),
+    ("Amount", "twelve", "invalid Amount"),
+    ("Month", 13, "invalid Month"),
+])
+def test_bad_rows_are_rejected(column, value, message):
+    df = statement()
+    if column == "Month":
+        df["Month"] = pd.to_datetime(df["Date"]).dt.month
+    df.loc[1, column] = value
+    with pytest.raises(ValueError, match=message):
+        typed_transactions(df)
+    with pytest.raises(ValueError, match="missing columns: Amount"):
+        typed_transactions(statement().drop(columns="Amount"))